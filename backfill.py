@@ -0,0 +1,96 @@
+import argparse
+import datetime
+import logging
+import time
+
+import boxscore_store
+import game_log
+import mlb_api
+import mlb_data
+from schedule_index import ScheduleIndex
+
+# Resumable bulk ingestion of whole regular seasons into the local stores:
+#   python backfill.py --seasons 2021 2022 2023 2024 --rate 8
+#   python train_model.py --game-log 2021 2022 2023 2024
+# Per season: one league schedule request, then every Final boxscore the SQLite store doesn't have
+# yet, fetched concurrently under one shared rate limit and saved batch by batch. Progress is
+# checkpointed in the store after every batch, and each season is written to the columnar game log
+# (game_log.py). A finished past season is skipped on later runs; an interrupted run resumes from
+# the store, so completed games are never downloaded again. Boxscores bypass the shared HTTP
+# cache (http_cache.py); the store already keeps what matters from them.
+
+BATCH_SIZE = 200  # games per fetch/save/checkpoint round
+RATE = 10.0  # requests per second across all workers
+WORKERS = 8
+
+log = logging.getLogger("mlb.backfill")
+
+
+def season_schedule(season, limiter=None):
+    url = mlb_data.league_schedule_url(season, end_date=min(mlb_data.today(), datetime.date(season, 12, 31)))
+    return ScheduleIndex.from_schedule(mlb_api.get_json(url, limiter=limiter))
+
+
+def backfill_season(season, store, limiter, workers=WORKERS, batch_size=BATCH_SIZE, log_dir=None, force=False):
+    progress = store.backfill_progress(season)
+    if progress and progress["completed_at"] and not force:
+        log.info("%s: complete (%s games), skipping", season, progress["final_games"])
+        return progress
+
+    index = season_schedule(season, limiter)
+    finals = [g["game_pk"] for g in index.games if g["state"] == "Final"]
+    missing = store.missing_game_pks(finals)
+    stored = len(finals) - len(missing)
+    store.save_backfill_progress(season, len(finals), stored)
+    log.info("%s: %s final games, %s already stored", season, len(finals), stored)
+
+    started = time.perf_counter()
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        mlb_data.sync_boxscores(store, batch, max_workers=workers, limiter=limiter, cache=False)
+        stored = len(finals) - len(store.missing_game_pks(finals))
+        store.save_backfill_progress(season, len(finals), stored)
+        rate = (start + len(batch)) / (time.perf_counter() - started)
+        log.info("%s: %s/%s stored (%.1f games/s)", season, stored, len(finals), rate)
+
+    game_log.build_season(season, store=store, log_dir=log_dir, schedule_index=index, max_workers=workers, limiter=limiter, cache=False)
+    # The current season keeps growing, so only past seasons are ever marked complete
+    complete = stored == len(finals) and season < mlb_data.today().year
+    store.save_backfill_progress(season, len(finals), stored, completed=complete)
+    if stored < len(finals):
+        log.warning("%s: %s boxscores failed; rerun to retry them", season, len(finals) - stored)
+    return store.backfill_progress(season)
+
+
+def backfill(seasons, store=None, rate=RATE, workers=WORKERS, batch_size=BATCH_SIZE, log_dir=None, force=False):
+    store = store or boxscore_store.get_store()
+    limiter = mlb_api.RateLimiter(rate)
+    return {
+        season: backfill_season(season, store, limiter, workers, batch_size, log_dir, force)
+        for season in seasons
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill whole MLB seasons into the local stores")
+    parser.add_argument("--seasons", type=int, nargs="+", required=True)
+    parser.add_argument("--rate", type=float, default=RATE, help="max requests per second")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--store", default=boxscore_store.STORE_PATH)
+    parser.add_argument("--log-dir", default=game_log.LOG_DIR)
+    parser.add_argument("--force", action="store_true", help="recheck seasons already marked complete")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    results = backfill(
+        args.seasons, boxscore_store.BoxscoreStore(args.store), args.rate, args.workers,
+        args.batch_size, args.log_dir, args.force,
+    )
+    for season, progress in results.items():
+        state = "complete" if progress["completed_at"] else "partial"
+        print(f"{season}: {progress['stored_games']}/{progress['final_games']} games ({state})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import game_log
+import model_registry
+import train_model
+from predictor import FEATURE_COLUMNS, class_probabilities, home_share, home_win_features, predict_home_away
+
+# Walk-forward backtest of the game winner model:
+#   python backtest.py --game-log 2023 2024 --fold-days 14 --workers 4
+#   python backtest.py --games games.csv --reuse-model xgb_model_updated.pkl --team-map team_map_updated.pkl
+# History is cut into consecutive date windows. For each window (fold) a model is trained on every
+# game before the window starts, or one saved model is reused for all of them, and scored on the
+# window's games. Features are the same point-in-time inputs train_model.py builds, so no fold
+# sees anything from on or after its games' dates.
+# The prepared feature matrix is cached as .npy files keyed by the source data, window and team
+# ids; reruns with other hyperparameters skip loading and feature building, and fold workers
+# memory-map the arrays instead of each receiving a pickled copy.
+
+CACHE_DIR = os.environ.get("MLB_BACKTEST_CACHE", "backtest_cache")
+FOLD_DAYS = 14
+MIN_TRAIN_GAMES = 1000
+CALIBRATION_BINS = 10
+ARRAYS = ["X", "winner_id", "home_won", "day"]
+
+
+# === Feature matrix cache ===
+def source_key(games=None, seasons=None, log_dir=None):
+    # Identity of the input data: file path, size and mtime, so an updated file is a new key
+    if seasons:
+        paths = [game_log.season_path(season, log_dir) for season in seasons]
+    else:
+        paths = [games]
+    return [(os.path.abspath(p), os.path.getsize(p), os.path.getmtime(p)) for p in paths]
+
+
+def cache_path(key, cache_dir=None):
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir or CACHE_DIR, digest)
+
+
+def prepare_features(games=None, seasons=None, log_dir=None, window=train_model.WINDOW,
+                     team_map=None, chunksize=200_000, cache_dir=None):
+    # Returns the directory holding X.npy, winner_id.npy, home_won.npy, day.npy and meta.json
+    key = {
+        "source": source_key(games, seasons, log_dir),
+        "window": window,
+        "team_map": sorted(team_map.items()) if team_map else None,
+        "features": FEATURE_COLUMNS,
+    }
+    path = cache_path(key, cache_dir)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return path
+
+    if seasons:
+        df = game_log.games_frame(seasons, window=window, log_dir=log_dir)
+        df = train_model.fill_feature_fallbacks(train_model.label_winners(df))
+    else:
+        df = train_model.load_games(games, chunksize)
+        if "date" not in df.columns:
+            raise ValueError("walk-forward backtesting needs a date column in the game log")
+        df = train_model.add_rolling_features(train_model.label_winners(df), window)
+    team_map = team_map or train_model.build_team_maps(df)[0]
+    df = train_model.add_team_ids(df, team_map)
+    df = df.dropna(subset=["home_id", "away_id", "winner_id"]).sort_values("date", kind="stable")
+
+    arrays = {
+        "X": df[FEATURE_COLUMNS].to_numpy(np.float32),
+        "winner_id": df["winner_id"].to_numpy(np.int64),
+        "home_won": (df["winner_id"] == df["home_id"]).to_numpy(np.int8),
+        "day": df["date"].to_numpy("datetime64[D]").astype(np.int64),
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump({"key": key, "rows": len(df), "built_at": time.time()}, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_features(path):
+    return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+
+
+# === Folds ===
+def make_folds(days, fold_days=FOLD_DAYS, min_train_games=MIN_TRAIN_GAMES):
+    # (train_end, test_end) row offsets into the date-sorted matrix, one per window of fold_days
+    days = np.asarray(days)
+    if len(days) <= min_train_games:
+        return []
+    first_day = days[min_train_games]
+    folds = []
+    for start_day in range(first_day, days[-1] + 1, fold_days):
+        train_end = int(np.searchsorted(days, start_day, side="left"))
+        test_end = int(np.searchsorted(days, start_day + fold_days, side="left"))
+        if test_end > train_end:
+            folds.append((train_end, test_end))
+    return folds
+
+
+_reused = {}
+
+
+def run_fold(path, fold, params, model_path=None, objective="home-win"):
+    train_end, test_end = fold
+    data = load_features(path)
+    X_test = pd.DataFrame(np.asarray(data["X"][train_end:test_end]), columns=FEATURE_COLUMNS)
+    started = time.perf_counter()
+    if model_path:
+        if model_path not in _reused:
+            _reused[model_path] = model_registry.load_model(model_path)
+        clf = _reused[model_path]
+    else:
+        X_train = pd.DataFrame(np.asarray(data["X"][:train_end]), columns=FEATURE_COLUMNS)
+        clf = train_model.make_model(objective, **params)
+        if objective == "home-win":
+            clf.fit(home_win_features(X_train), np.asarray(data["home_won"][:train_end]))
+        else:
+            # Early folds may not have seen every team win; fit on consecutive labels and map back
+            classes, y_encoded = np.unique(np.asarray(data["winner_id"][:train_end]), return_inverse=True)
+            clf.fit(X_train, y_encoded)
+    fit_seconds = time.perf_counter() - started
+
+    if model_path or objective == "home-win":
+        home_probs, away_probs = predict_home_away(clf, X_test)
+    else:
+        probs = clf.predict_proba(X_test)
+        home_probs = class_probabilities(probs, classes, X_test["home_id"].to_numpy())
+        away_probs = class_probabilities(probs, classes, X_test["away_id"].to_numpy())
+    return {
+        "train_games": train_end,
+        "start_day": int(data["day"][train_end]),
+        "end_day": int(data["day"][test_end - 1]),
+        "p_home": home_share(home_probs, away_probs),
+        "home_won": np.asarray(data["home_won"][train_end:test_end]),
+        "fit_seconds": fit_seconds,
+    }
+
+
+# === Metrics ===
+def score(p_home, home_won):
+    p = np.clip(p_home, 1e-6, 1 - 1e-6)
+    return {
+        "games": len(p),
+        "accuracy": float(np.mean((p_home >= 0.5) == (home_won == 1))),
+        "log_loss": float(-np.mean(home_won * np.log(p) + (1 - home_won) * np.log(1 - p))),
+        "brier": float(np.mean((p_home - home_won) ** 2)),
+    }
+
+
+def calibration_table(p_home, home_won, bins=CALIBRATION_BINS):
+    edges = np.linspace(0, 1, bins + 1)
+    which = np.clip(np.digitize(p_home, edges) - 1, 0, bins - 1)
+    counts = np.bincount(which, minlength=bins)
+    predicted = np.bincount(which, weights=p_home, minlength=bins)
+    observed = np.bincount(which, weights=home_won, minlength=bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        table = pd.DataFrame({
+            "bin": [f"{lo:.1f}-{hi:.1f}" for lo, hi in zip(edges[:-1], edges[1:])],
+            "games": counts,
+            "predicted": predicted / counts,
+            "observed": observed / counts,
+        })
+    ece = float(np.nansum(np.abs(table["predicted"] - table["observed"]) * counts) / max(counts.sum(), 1))
+    return table, ece
+
+
+def backtest(path, folds, params, model_path=None, workers=1, objective="home-win"):
+    args = [(path, fold, params, model_path, objective) for fold in folds]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_fold, *zip(*args)))
+    else:
+        results = [run_fold(*a) for a in args]
+
+    fold_rows = []
+    for result in results:
+        row = score(result["p_home"], result["home_won"])
+        row.update({
+            "start": str(np.datetime64(result["start_day"], "D")),
+            "end": str(np.datetime64(result["end_day"], "D")),
+            "train_games": result["train_games"],
+            "fit_seconds": round(result["fit_seconds"], 2),
+        })
+        fold_rows.append(row)
+    p_home = np.concatenate([r["p_home"] for r in results]) if results else np.empty(0)
+    home_won = np.concatenate([r["home_won"] for r in results]) if results else np.empty(0)
+    return pd.DataFrame(fold_rows), p_home, home_won
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the game winner model")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--games", help="game log CSV with a date column (train_model.py format)")
+    source.add_argument("--game-log", type=int, nargs="+", metavar="SEASON")
+    parser.add_argument("--game-log-dir", default=game_log.LOG_DIR)
+    parser.add_argument("--window", type=int, default=train_model.WINDOW)
+    parser.add_argument("--fold-days", type=int, default=FOLD_DAYS)
+    parser.add_argument("--min-train-games", type=int, default=MIN_TRAIN_GAMES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--objective", choices=train_model.OBJECTIVES, default="home-win")
+    parser.add_argument("--reuse-model", help="score this saved model on every fold instead of retraining")
+    parser.add_argument("--team-map", help="team map the reused model was trained with")
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--out", help="write per-fold metrics to this CSV")
+    args = parser.parse_args(argv)
+
+    if args.reuse_model and not args.team_map:
+        parser.error("--reuse-model needs --team-map so game ids line up with the model's classes")
+    team_map = joblib.load(args.team_map) if args.team_map else None
+
+    started = time.perf_counter()
+    path = prepare_features(args.games, args.game_log, args.game_log_dir, args.window, team_map, cache_dir=args.cache_dir)
+    data = load_features(path)
+    folds = make_folds(data["day"], args.fold_days, args.min_train_games)
+    print(f"features   {time.perf_counter() - started:8.2f}s  ({len(data['day']):,} games, {len(folds)} folds)")
+
+    params = {"n_estimators": args.n_estimators, "max_depth": args.max_depth, "learning_rate": args.learning_rate}
+    if args.workers > 1:
+        params["n_jobs"] = 1  # parallelism comes from the fold pool
+    started = time.perf_counter()
+    folds_df, p_home, home_won = backtest(path, folds, params, args.reuse_model, args.workers, args.objective)
+    print(f"folds      {time.perf_counter() - started:8.2f}s")
+
+    with pd.option_context("display.max_rows", None, "display.width", 120, "display.float_format", "{:.4f}".format):
+        print(folds_df.to_string(index=False))
+        if len(p_home):
+            overall = score(p_home, home_won)
+            table, ece = calibration_table(p_home, home_won)
+            print(f"\noverall: {overall['games']:,} games  accuracy {overall['accuracy']:.4f}  "
+                  f"log-loss {overall['log_loss']:.4f}  brier {overall['brier']:.4f}  ECE {ece:.4f}\n")
+            print(table.to_string(index=False))
+    if args.out:
+        folds_df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import predictor  # noqa: E402
+
+N_TEAMS = 32  # team_map has the 30 clubs plus AL/NL
+
+
+def synthetic_games(n, seed):
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, N_TEAMS, n)
+    away = (home + rng.integers(1, N_TEAMS, n)) % N_TEAMS
+    return pd.DataFrame({
+        "home_id": home, "away_id": away,
+        "home_win_pct": rng.uniform(0.3, 0.7, n), "away_win_pct": rng.uniform(0.3, 0.7, n),
+        "Walks Issued - Home": rng.uniform(1, 6, n), "Walks Issued - Away": rng.uniform(1, 6, n),
+        "Strikeouts Thrown - Home": rng.uniform(5, 13, n), "Strikeouts Thrown - Away": rng.uniform(5, 13, n),
+        "Total Bases - Home": rng.uniform(8, 18, n), "Total Bases - Away": rng.uniform(8, 18, n),
+    })[predictor.FEATURE_COLUMNS]
+
+
+def synthetic_model(n_estimators):
+    # Same shape as the pretrained model: multiclass over team ids
+    X = synthetic_games(4000, seed=0)
+    y = np.where(X["home_win_pct"] > X["away_win_pct"], X["home_id"], X["away_id"])
+    y[:N_TEAMS] = np.arange(N_TEAMS)
+    clf = XGBClassifier(n_estimators=n_estimators, max_depth=6, learning_rate=0.1, eval_metric="mlogloss")
+    clf.fit(X, y)
+    return clf
+
+
+def synthetic_home_win_model(n_estimators):
+    # The binary home-win model on the same games
+    X = synthetic_games(4000, seed=0)
+    clf = XGBClassifier(n_estimators=n_estimators, max_depth=6, learning_rate=0.1,
+                        objective="binary:logistic", eval_metric="logloss")
+    clf.fit(predictor.home_win_features(X), (X["home_win_pct"] > X["away_win_pct"]).astype(int))
+    return clf
+
+
+# The pre-refactor Daily Matchups path: one DataFrame and one predict_proba per game
+def per_row(clf, games):
+    results = []
+    for row in games.itertuples(index=False):
+        input_df = pd.DataFrame([list(row)], columns=predictor.FEATURE_COLUMNS)
+        probs = clf.predict_proba(input_df)[0]
+        class_ids = clf.classes_.tolist()
+        home_id, away_id = row[0], row[1]
+        results.append((probs[class_ids.index(home_id)], probs[class_ids.index(away_id)]))
+    return np.array(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs batched predict_proba on a synthetic slate")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--estimators", type=int, default=200)
+    args = parser.parse_args()
+
+    clf = synthetic_model(args.estimators)
+    games = synthetic_games(args.games, seed=1)
+
+    start = time.perf_counter()
+    slow = per_row(clf, games)
+    per_row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    home_probs, away_probs = predictor.predict_home_away(clf, predictor.build_feature_frame(games.values.tolist()))
+    batch_time = time.perf_counter() - start
+
+    np.testing.assert_allclose(slow, np.column_stack([home_probs, away_probs]), rtol=1e-6)
+    print(f"games={args.games} estimators={args.estimators} classes={N_TEAMS}")
+    print(f"per-row: {per_row_time:8.3f}s  ({args.games / per_row_time:,.0f} games/s)")
+    print(f"batched: {batch_time:8.3f}s  ({args.games / batch_time:,.0f} games/s, {per_row_time / batch_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boxscore_store  # noqa: E402
+import mlb_api  # noqa: E402
+import mlb_data  # noqa: E402
+from stub_statsapi import TEAM_IDS, StubStatsApi  # noqa: E402
+
+
+# The pre-refactor path: a per-team season schedule, then up to 10 boxscores one after another
+def serial_last_10_game_stats(team_id):
+    schedule_url = mlb_api.statsapi_url(f"schedule?teamId={team_id}&season=2025&sportId=1&gameType=R")
+    schedule_data = requests.get(schedule_url).json()
+
+    games = []
+    for date in schedule_data.get("dates", []):
+        for game in date.get("games", []):
+            if game["status"]["abstractGameState"] == "Final":
+                games.append(game["gamePk"])
+
+    game_stats = []
+    for game_pk in sorted(games, reverse=True)[:10]:
+        box_data = requests.get(mlb_data.boxscore_url(game_pk)).json()
+        row = mlb_data.extract_team_game_stats(box_data, team_id)
+        if row is not None:
+            game_stats.append(row)
+    if len(game_stats) == 0:
+        return None
+    return {
+        key: round(sum(g[key] for g in game_stats) / len(game_stats), 2)
+        for key in ["total_bases", "walks_issued", "strikeouts_thrown"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs concurrent 10-game stats fetch against a local stub API")
+    parser.add_argument("--latency", type=float, default=0.02, help="artificial per-request latency in seconds")
+    parser.add_argument("--teams", type=int, default=30)
+    args = parser.parse_args()
+
+    team_ids = TEAM_IDS[:args.teams]
+    with StubStatsApi(latency=args.latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        store = boxscore_store.BoxscoreStore(os.path.join(tmp, "store.sqlite"))
+        mlb_api.STATSAPI_BASE = stub.base_url
+
+        start = time.perf_counter()
+        serial = {tid: serial_last_10_game_stats(tid) for tid in team_ids}
+        serial_time = time.perf_counter() - start
+        serial_calls = sum(stub.hits.values())
+
+        stub.hits.clear()
+        mlb_data.schedule_snapshots.clear()
+        start = time.perf_counter()
+        concurrent = mlb_data.get_last_10_game_stats_many(team_ids, store=store)
+        concurrent_time = time.perf_counter() - start
+        concurrent_calls = sum(stub.hits.values())
+
+        # Second refresh: every Final boxscore is already in the on-disk store
+        stub.hits.clear()
+        mlb_data.schedule_snapshots.clear()
+        start = time.perf_counter()
+        stored = mlb_data.get_last_10_game_stats_many(team_ids, store=store)
+        stored_time = time.perf_counter() - start
+        stored_calls = sum(stub.hits.values())
+
+    assert serial == concurrent == stored, "all paths must produce identical averages"
+    print(f"teams={len(team_ids)} latency={args.latency * 1000:.0f}ms")
+    print(f"serial:     {serial_time:7.3f}s  {serial_calls} requests")
+    print(f"concurrent: {concurrent_time:7.3f}s  {concurrent_calls} requests  ({serial_time / concurrent_time:.1f}x faster)")
+    print(f"warm store: {stored_time:7.3f}s  {stored_calls} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import predictor  # noqa: E402
+import tree_model  # noqa: E402
+from bench_batch_predict import synthetic_games, synthetic_home_win_model, synthetic_model  # noqa: E402
+
+# XGBoost pickle vs the compiled NumPy artifact (tree_model.py):
+#   python benchmarks/bench_compiled_model.py
+#   python benchmarks/bench_compiled_model.py --model xgb_model_updated.pkl
+# Import and load are timed in a fresh interpreter each, as an app cold start would see them.
+# Throughput goes through predictor.predict_home_away, the path every page uses.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+clf = {load}
+loaded = time.perf_counter()
+print(json.dumps({{"import": imported - start, "load": loaded - imported}}))
+"""
+
+
+def cold_start(imports, load):
+    code = COLD_START.format(root=ROOT, imports=imports, load=load)
+    return json.loads(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def rows_per_second(clf, features, min_seconds=0.5):
+    predictor.predict_home_away(clf, features)
+    runs, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        predictor.predict_home_away(clf, features)
+        runs += 1
+    return runs * len(features) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XGBoost pickle vs compiled NumPy trees")
+    parser.add_argument("--model", help="an XGBClassifier pickle (default: synthetic models of both kinds)")
+    parser.add_argument("--estimators", type=int, default=200)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model:
+            models = {os.path.basename(args.model): args.model}
+        else:
+            models = {}
+            for name, build in (("home-win", synthetic_home_win_model), ("team-id", synthetic_model)):
+                models[name] = os.path.join(tmp, f"{name}.pkl")
+                joblib.dump(build(args.estimators), models[name])
+
+        for name, pkl_path in models.items():
+            npz_path, compiled = tree_model.export(pkl_path, os.path.join(tmp, f"{name}.npz"))
+            clf = joblib.load(pkl_path)
+            games = synthetic_games(10_000, seed=2)
+            features = predictor.home_win_features(games) if predictor.is_home_win_model(clf) else games
+            diff = tree_model.max_difference(clf, compiled, features)
+
+            pickle_cold = [cold_start("import joblib, xgboost", f"joblib.load({pkl_path!r})") for _ in range(args.cold_runs)]
+            compiled_cold = [cold_start("import tree_model", f"tree_model.load({npz_path!r})") for _ in range(args.cold_runs)]
+
+            print(f"== {name}: {compiled.n_trees:,} trees, depth {compiled.depth}, max |difference| {diff:.1e}")
+            print(f"{'':<18}{'xgboost':>14}{'compiled':>14}")
+            print(f"{'file MB':<18}{os.path.getsize(pkl_path) / 1e6:>14.2f}{os.path.getsize(npz_path) / 1e6:>14.2f}")
+            for key in ("import", "load"):
+                xgb_ms = min(r[key] for r in pickle_cold) * 1000
+                npz_ms = min(r[key] for r in compiled_cold) * 1000
+                print(f"{key + ' ms':<18}{xgb_ms:>14.1f}{npz_ms:>14.1f}")
+            for n in (15, 1000, 10_000):
+                batch = games.iloc[:n]
+                print(f"{f'rows/s @ {n:,}':<18}{rows_per_second(clf, batch):>14,.0f}{rows_per_second(compiled, batch):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
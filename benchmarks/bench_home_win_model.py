@@ -0,0 +1,108 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backtest  # noqa: E402
+import game_log  # noqa: E402
+import predictor  # noqa: E402
+import train_model  # noqa: E402
+from bench_batch_predict import synthetic_games  # noqa: E402
+
+# Team-id multiclass model vs the binary home-win model, trained and scored on the same games:
+#   python benchmarks/bench_home_win_model.py                         (synthetic games)
+#   python benchmarks/bench_home_win_model.py --game-log 2023 2024    (seasons from game_log.py)
+# The last --holdout share of games (by date for a game log) is held out for accuracy, log-loss
+# and Brier of the home team's win probability.
+
+
+def synthetic_results(n, seed):
+    # Outcomes driven by the stat gaps plus a small home edge, so both models have signal to find
+    rng = np.random.default_rng(seed)
+    df = synthetic_games(n, seed)
+    logit = (
+        0.15 + 4.0 * (df["home_win_pct"] - df["away_win_pct"])
+        + 0.15 * (df["Total Bases - Home"] - df["Total Bases - Away"])
+        - 0.10 * (df["Walks Issued - Home"] - df["Walks Issued - Away"])
+    )
+    home_won = rng.random(n) < 1 / (1 + np.exp(-logit))
+    df["winner_id"] = np.where(home_won, df["home_id"], df["away_id"])
+    return df
+
+
+def game_log_results(seasons, log_dir):
+    df = game_log.games_frame(seasons, window=train_model.WINDOW, log_dir=log_dir)
+    df = train_model.fill_feature_fallbacks(train_model.label_winners(df))
+    df = train_model.add_team_ids(df, train_model.build_team_maps(df)[0])
+    return df.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def evaluate(objective, train, test, n_estimators, repeats):
+    clf = train_model.make_model(objective, n_estimators=n_estimators)
+    start = time.perf_counter()
+    clf.fit(*train_model.training_set(train, objective))
+    fit_seconds = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    joblib.dump(clf, buffer)
+    features = test[predictor.FEATURE_COLUMNS]
+    slate, batch = features.iloc[:15], features.iloc[:1000]
+    predictor.predict_home_away(clf, slate)  # lazy booster setup
+
+    p_home = predictor.home_share(*predictor.predict_home_away(clf, features))
+    metrics = backtest.score(p_home, (test["winner_id"] == test["home_id"]).to_numpy(np.int8))
+    return dict(
+        metrics,
+        trees=len(clf.get_booster().get_dump()),
+        file_mb=buffer.tell() / 1e6,
+        fit_s=fit_seconds,
+        slate_ms=best_of(lambda: predictor.predict_home_away(clf, slate), repeats) * 1000,
+        batch_ms=best_of(lambda: predictor.predict_home_away(clf, batch), repeats) * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiclass team-id model vs binary home-win model")
+    parser.add_argument("--game-log", type=int, nargs="+", metavar="SEASON")
+    parser.add_argument("--game-log-dir", default=game_log.LOG_DIR)
+    parser.add_argument("--games", type=int, default=20_000, help="synthetic games when no --game-log")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--estimators", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    df = game_log_results(args.game_log, args.game_log_dir) if args.game_log else synthetic_results(args.games, seed=0)
+    split = int(len(df) * (1 - args.holdout))
+    train, test = df.iloc[:split], df.iloc[split:]
+
+    results = {objective: evaluate(objective, train, test, args.estimators, args.repeats) for objective in train_model.OBJECTIVES}
+    print(f"{len(train):,} training games, {len(test):,} held out, {args.estimators} boosting rounds")
+    print(f"{'':<16}" + "".join(f"{objective:>12}" for objective in results) + f"{'ratio':>10}")
+    rows = [
+        ("trees", "trees", "{:>12,}"), ("file MB", "file_mb", "{:>12.2f}"), ("fit s", "fit_s", "{:>12.2f}"),
+        ("15-game ms", "slate_ms", "{:>12.2f}"), ("1000-game ms", "batch_ms", "{:>12.2f}"),
+        ("accuracy", "accuracy", "{:>12.4f}"), ("log-loss", "log_loss", "{:>12.4f}"), ("brier", "brier", "{:>12.4f}"),
+    ]
+    binary, multiclass = results["home-win"], results["team-id"]
+    for label, key, fmt in rows:
+        ratio = multiclass[key] / binary[key] if binary[key] else float("nan")
+        print(f"{label:<16}" + "".join(fmt.format(r[key]) for r in results.values()) + f"{ratio:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
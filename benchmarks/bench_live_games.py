@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Pin the clock to the stub season before mlb_data builds any schedule url
+os.environ.setdefault("MLB_TODAY", "2025-05-01")
+
+import live_games  # noqa: E402
+import mlb_api  # noqa: E402
+import mlb_data  # noqa: E402
+import model_registry  # noqa: E402
+import slate  # noqa: E402
+from bench_batch_predict import synthetic_home_win_model  # noqa: E402
+from stub_statsapi import StubStatsApi  # noqa: E402
+
+# A full slate of live games followed from one asyncio loop against the local stub:
+#   python benchmarks/bench_live_games.py --step 0.1 --poll 0.02
+# The stub plays today's 15 games one plate appearance every --step seconds while the tracker
+# polls every --poll seconds (live, a 10 second poll against minutes between plate appearances,
+# so most polls find nothing new). The tracker runs
+# twice: polling the diff endpoint (recording every feed version it sees) and downloading the
+# whole feed on every poll, for the bandwidth comparison. A third run replays the recording
+# through the stub. Each run must end with every game final, its in-memory feed equal to the
+# server's final feed and the live probability at 0 or 1 for the right side.
+
+
+def bench_bundle():
+    team_map = {abbr: i for i, abbr in enumerate(sorted(mlb_data.mlb_team_ids))}
+    return model_registry.ModelBundle(
+        clf=synthetic_home_win_model(n_estimators=50), team_map=team_map,
+        reverse_map={i: abbr for abbr, i in team_map.items()}, model_path=None, mtimes=("bench",),
+        load_seconds=0.0, warmup_seconds=0.0, memory_bytes=0, file_bytes=0, loaded_at=0.0,
+    )
+
+
+class FullFeedTracker(live_games.LiveTracker):
+    # Baseline: no diffs, the whole feed on every poll
+    async def _poll(self, session, game):
+        self._apply(game, await self._get(session, live_games.feed_url(game.game_pk), "full"))
+
+
+def check(tracker, stub):
+    for game in tracker.games:
+        final = stub.timeline(game.game_pk)[-1]
+        assert game.feed == final, f"game {game.game_pk}: feed differs from the server's"
+        home, away = final["liveData"]["linescore"]["teams"]["home"]["runs"], final["liveData"]["linescore"]["teams"]["away"]["runs"]
+        assert game.home_win_prob == float(home > away), f"game {game.game_pk}: final probability {game.home_win_prob}"
+
+
+def follow(stub, tracker_class, poll, record_dir=None):
+    mlb_api.STATSAPI_BASE = stub.base_url
+    games = live_games.slate_games(mlb_data.today(), bench_bundle())
+    tracker = tracker_class(games, poll_interval=poll, record_dir=record_dir)
+    start = time.perf_counter()
+    asyncio.run(tracker.run())
+    elapsed = time.perf_counter() - start
+    check(tracker, stub)
+    return tracker, elapsed
+
+
+def report(name, tracker, elapsed):
+    stats = tracker.stats()
+    polls = stats["full_fetches"] + stats["diff_fetches"]
+    kb = (stats["bytes_full"] + stats["bytes_diff"]) / 1e3
+    print(f"{name:<10} {stats['games']} games in {elapsed:5.1f}s  {polls:5,} polls  {kb:9,.0f} KB  {kb / polls:6.1f} KB/poll  "
+          f"({stats['empty_diffs']:,} empty diffs, {stats['recomputes']:,} recomputes, "
+          f"{stats['resyncs']} resyncs, {stats['errors']} errors)")
+    return kb / polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live feed tracking: diff patches vs full downloads")
+    parser.add_argument("--step", type=float, default=0.1, help="stub seconds per plate appearance")
+    parser.add_argument("--poll", type=float, default=0.02, help="tracker seconds between polls")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub seconds per request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        slate.SLATE_DIR = tmp_dir
+        record_dir = os.path.join(tmp_dir, "recording")
+        with StubStatsApi(latency=args.latency, live_step=args.step) as stub:
+            diff_per_poll = report("diff", *follow(stub, live_games.LiveTracker, args.poll, record_dir))
+        with StubStatsApi(latency=args.latency, live_step=args.step) as stub:
+            full_per_poll = report("full", *follow(stub, FullFeedTracker, args.poll))
+        with StubStatsApi(latency=args.latency, live_step=args.step, live_dir=record_dir) as stub:
+            report("replay", *follow(stub, live_games.LiveTracker, args.poll))
+        versions = sum(len(files) for _, _, files in os.walk(record_dir))
+        print(f"recorded {versions:,} feed versions; a diff poll costs {diff_per_poll / full_per_poll:.1%} of a full-feed poll")
+
+        # Cost of one recompute, paid only when the score, inning or state changes
+        situation = live_games.Situation("Live", 3, 2, 7, "Bottom")
+        start = time.perf_counter()
+        for _ in range(1000):
+            live_games.situation_probability(situation, 0.1)
+        print(f"win probability recompute: {time.perf_counter() - start:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_registry  # noqa: E402
+from bench_batch_predict import N_TEAMS, synthetic_model  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rerun model unpickling vs the process-wide registry")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--estimators", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ("model.pkl", "team_map.pkl", "reverse_map.pkl")]
+        team_map = {f"T{i}": i for i in range(N_TEAMS)}
+        joblib.dump(synthetic_model(args.estimators), paths[0])
+        joblib.dump(team_map, paths[1])
+        joblib.dump({v: k for k, v in team_map.items()}, paths[2])
+
+        registry = model_registry.ModelRegistry(*paths)
+        start = time.perf_counter()
+        bundle = registry.current()
+        startup = time.perf_counter() - start
+
+        # Old behaviour: every Streamlit rerun unpickles all three artifacts
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            for path in paths:
+                joblib.load(path)
+        per_rerun_load = (time.perf_counter() - start) / args.reruns
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            registry.reload_if_changed()
+        per_rerun_registry = (time.perf_counter() - start) / args.reruns
+
+        # Hot swap: touch the artifact as a retrain would, then time the next rerun
+        os.utime(paths[0], (time.time() + 1, time.time() + 1))
+        start = time.perf_counter()
+        registry.reload_if_changed()
+        swap = time.perf_counter() - start
+
+    print(f"artifact: {bundle.file_bytes / 1e6:.2f} MB on disk, "
+          f"RSS grew {(bundle.memory_bytes or 0) / 1e6:.1f} MB during load")
+    print(f"startup (load + warm-up): {startup * 1000:8.1f} ms  "
+          f"(load {bundle.load_seconds * 1000:.1f} ms, warm-up {bundle.warmup_seconds * 1000:.1f} ms)")
+    print(f"per rerun, joblib.load:   {per_rerun_load * 1000:8.1f} ms")
+    print(f"per rerun, registry:      {per_rerun_registry * 1000:8.3f} ms")
+    print(f"hot swap on next rerun:   {swap * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Pin the clock to the stub season before mlb_data builds any schedule url
+os.environ.setdefault("MLB_TODAY", "2025-05-01")
+
+import boxscore_store  # noqa: E402
+import feeds  # noqa: E402
+import game_log  # noqa: E402
+import http_cache  # noqa: E402
+import live_games  # noqa: E402
+import mlb_api  # noqa: E402
+import mlb_data  # noqa: E402
+import model_registry  # noqa: E402
+import predictor  # noqa: E402
+import replay  # noqa: E402
+import season_sim  # noqa: E402
+import slate  # noqa: E402
+import tree_model  # noqa: E402
+from bench_batch_predict import synthetic_games, synthetic_home_win_model, synthetic_model  # noqa: E402
+from stub_statsapi import StubStatsApi, TEAM_IDS, build_season, json_diff, live_timeline  # noqa: E402
+
+# End-to-end benchmarks for each page's data path, cold vs warm, fully offline:
+#   pip install -r requirements-dev.txt
+#   pytest benchmarks/ --benchmark-only
+#   MLB_BENCH_LATENCY=0.05 pytest benchmarks/ --benchmark-only --benchmark-save=baseline
+#   pytest benchmarks/ --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:20%
+# The session fixture records every response from the local stub API into a fixture directory,
+# shuts the stub down, and replays the fixtures with MLB_BENCH_LATENCY seconds per request.
+# "cold" resets the schedule/standings snapshots, the boxscore store, the shared HTTP cache and
+# the feed cache before each round; "warm" runs against caches the previous call filled.
+
+BENCH_LATENCY = float(os.environ.get("MLB_BENCH_LATENCY", "0.01"))
+COLD_ROUNDS = 5
+TODAY = mlb_data.today()
+FEED_NAMES = ["mlb", "yankees", "redsox", "baseball"]
+PAIR = (147, 111)
+
+
+def bench_bundle(clf):
+    team_map = {abbr: i for i, abbr in enumerate(sorted(mlb_data.mlb_team_ids) + ["AL", "NL"])}
+    reverse_map = {i: abbr for abbr, i in team_map.items()}
+    return model_registry.ModelBundle(
+        clf=clf, team_map=team_map, reverse_map=reverse_map, model_path=None, mtimes=("bench",),
+        load_seconds=0.0, warmup_seconds=0.0, memory_bytes=0, file_bytes=0, loaded_at=0.0,
+    )
+
+
+class Env:
+    def __init__(self, tmp_dir, bundle, feed_urls):
+        self.tmp_dir = tmp_dir
+        self.bundle = bundle
+        self.feed_urls = feed_urls
+        self.log_dir = os.path.join(tmp_dir, "game_log")
+        self.resets = 0
+
+    def reset(self):
+        # Everything a fresh app process would have to refetch
+        self.resets += 1
+        mlb_data.schedule_snapshots.clear()
+        mlb_data.standings_snapshots.clear()
+        boxscore_store._store = boxscore_store.BoxscoreStore(os.path.join(self.tmp_dir, f"store-{self.resets}.sqlite"))
+        http_cache.get_cache().clear()
+        feeds.feed_cache = feeds.FeedCache()
+
+    def exercise(self):
+        # Touch every request the benchmarks make, so recording captures all of them
+        slate.build_slate(TODAY, self.bundle)
+        mlb_data.get_last_10_game_stats_many(PAIR)
+        feeds.get_feeds(self.feed_urls)
+        game_log.build_season(mlb_data.SEASON, log_dir=self.log_dir)
+
+
+@pytest.fixture(scope="session")
+def env(tmp_path_factory):
+    tmp_dir = tmp_path_factory.mktemp("bench")
+    fixture_dir = str(tmp_dir / "fixtures")
+    saved = (mlb_api.STATSAPI_BASE, boxscore_store._store, feeds.feed_cache)
+    http_cache.configure(path=str(tmp_dir / "http_cache.sqlite"), enabled=True)
+    bundle = bench_bundle(synthetic_home_win_model(n_estimators=100))
+
+    with StubStatsApi(latency=0) as stub:
+        mlb_api.STATSAPI_BASE = stub.base_url
+        environment = Env(str(tmp_dir), bundle, [stub.feed_url(name) for name in FEED_NAMES])
+        replay.configure(mode="record", fixture_dir=fixture_dir)
+        environment.reset()
+        environment.exercise()
+
+    # The stub is gone: from here on every response comes from the fixtures
+    replay.configure(mode="replay", latency=BENCH_LATENCY)
+    environment.reset()
+    yield environment
+
+    replay.configure(mode="live", latency=0)
+    mlb_api.STATSAPI_BASE, boxscore_store._store, feeds.feed_cache = saved
+    http_cache.configure()
+
+
+def run_cold(benchmark, env, target, *args):
+    def setup():
+        env.reset()
+        return args, {}
+
+    return benchmark.pedantic(target, setup=setup, rounds=COLD_ROUNDS, iterations=1)
+
+
+def run_warm(benchmark, env, target, *args):
+    target(*args)
+    return benchmark(target, *args)
+
+
+# === Daily Matchups ===
+@pytest.mark.benchmark(group="daily-matchups")
+def test_daily_slate_cold(benchmark, env):
+    daily = run_cold(benchmark, env, slate.build_slate, TODAY, env.bundle)
+    assert len(daily["matchups"]) == 15
+
+
+@pytest.mark.benchmark(group="daily-matchups")
+def test_daily_slate_warm(benchmark, env):
+    daily = run_warm(benchmark, env, slate.build_slate, TODAY, env.bundle)
+    assert len(daily["matchups"]) == 15
+
+
+def memoized_rerun(bundle, team_snapshot, memo):
+    # A Daily Matchups rerun after a widget change: version stamp, then a cache_data hit, which
+    # unpickles the stored (slate, matchups frame) pair
+    version = slate.slate_version(bundle, team_snapshot)
+    return pickle.loads(memo[(str(TODAY), version)])
+
+
+@pytest.mark.benchmark(group="daily-matchups")
+def test_daily_slate_memoized_rerun(benchmark, env):
+    team_snapshot = mlb_data.get_team_snapshot(mlb_data.season_of(TODAY))
+    daily = slate.build_slate(TODAY, env.bundle, team_snapshot)
+    version = slate.slate_version(env.bundle, team_snapshot)
+    memo = {(str(TODAY), version): pickle.dumps((daily, slate.matchups_frame(daily)))}
+    daily, matchups = benchmark(memoized_rerun, env.bundle, team_snapshot, memo)
+    assert len(matchups) == len(daily["matchups"]) == 15
+
+
+# === 10-Game Averages ===
+@pytest.mark.benchmark(group="10-game-averages")
+def test_league_averages_cold(benchmark, env):
+    stats = run_cold(benchmark, env, mlb_data.get_last_10_game_stats_many, TEAM_IDS)
+    assert all(stats.values())
+
+
+@pytest.mark.benchmark(group="10-game-averages")
+def test_league_averages_warm(benchmark, env):
+    stats = run_warm(benchmark, env, mlb_data.get_last_10_game_stats_many, TEAM_IDS)
+    assert all(stats.values())
+
+
+@pytest.mark.benchmark(group="10-game-averages")
+def test_standings_cold(benchmark, env):
+    win_pcts = run_cold(benchmark, env, mlb_data.get_win_percentages)
+    assert len(win_pcts) == len(TEAM_IDS)
+
+
+# === Single Game Prediction ===
+def predict_pair(bundle):
+    pair_stats = mlb_data.get_last_10_game_stats_many(PAIR)
+    row = predictor.feature_row(
+        bundle.team_map["NYY"], bundle.team_map["BOS"],
+        mlb_data.get_team_win_pct(PAIR[0]), mlb_data.get_team_win_pct(PAIR[1]),
+        pair_stats[PAIR[0]], pair_stats[PAIR[1]],
+    )
+    features = predictor.build_feature_frame([row])
+    return predictor.predict_home_away(bundle.clf, features)
+
+
+@pytest.mark.benchmark(group="single-game")
+def test_single_game_cold(benchmark, env):
+    run_cold(benchmark, env, predict_pair, env.bundle)
+
+
+@pytest.mark.benchmark(group="single-game")
+def test_single_game_warm(benchmark, env):
+    run_warm(benchmark, env, predict_pair, env.bundle)
+
+
+# === Team News Feeds ===
+def read_feeds(urls):
+    return feeds.get_feeds(urls)
+
+
+@pytest.mark.benchmark(group="team-news")
+def test_feeds_cold(benchmark, env):
+    result = run_cold(benchmark, env, read_feeds, env.feed_urls)
+    assert all(len(feed.entries) == feeds.TOP_N for feed in result.values())
+
+
+@pytest.mark.benchmark(group="team-news")
+def test_feeds_warm(benchmark, env):
+    result = run_warm(benchmark, env, read_feeds, env.feed_urls)
+    assert all(len(feed.entries) == feeds.TOP_N for feed in result.values())
+
+
+# === Batch inference ===
+@pytest.fixture(scope="session")
+def models(env):
+    # The served binary model, its compiled NumPy form and the legacy multiclass one
+    return {
+        "home-win": env.bundle.clf,
+        "home-win-compiled": tree_model.compile_booster(env.bundle.clf),
+        "team-id": synthetic_model(n_estimators=100),
+    }
+
+
+@pytest.mark.parametrize("objective", ["home-win", "home-win-compiled", "team-id"])
+@pytest.mark.parametrize("n_games", [15, 1000])
+@pytest.mark.benchmark(group="batch-inference")
+def test_batch_predict_cold(benchmark, models, n_games, objective):
+    # A freshly unpickled booster pays its lazy initialisation on the first predict_proba
+    features = synthetic_games(n_games, seed=1)
+    payload = pickle.dumps(models[objective])
+
+    def setup():
+        return (pickle.loads(payload), features), {}
+
+    benchmark.pedantic(predictor.predict_home_away, setup=setup, rounds=COLD_ROUNDS, iterations=1)
+
+
+@pytest.mark.parametrize("objective", ["home-win", "home-win-compiled", "team-id"])
+@pytest.mark.parametrize("n_games", [15, 1000])
+@pytest.mark.benchmark(group="batch-inference")
+def test_batch_predict_warm(benchmark, env, models, n_games, objective):
+    features = synthetic_games(n_games, seed=1)
+    home_probs, away_probs = run_warm(benchmark, env, predictor.predict_home_away, models[objective], features)
+    assert len(home_probs) == n_games
+
+
+# === Columnar game log ===
+def open_and_average(log_dir):
+    log = game_log.open_season(mlb_data.SEASON, log_dir)
+    return log.rolling_averages(TEAM_IDS)
+
+
+@pytest.mark.benchmark(group="game-log")
+def test_game_log_rolling_cold(benchmark, env):
+    def setup():
+        game_log._open_logs.clear()
+        return (env.log_dir,), {}
+
+    stats = benchmark.pedantic(open_and_average, setup=setup, rounds=COLD_ROUNDS, iterations=1)
+    assert all(stats.values())
+
+
+@pytest.mark.benchmark(group="game-log")
+def test_game_log_rolling_warm(benchmark, env):
+    stats = run_warm(benchmark, env, open_and_average, env.log_dir)
+    assert all(stats.values())
+
+
+@pytest.mark.benchmark(group="game-log")
+def test_game_log_training_frame(benchmark, env):
+    games = benchmark(game_log.games_frame, [mlb_data.SEASON], window=10, log_dir=env.log_dir)
+    assert len(games)
+
+
+# === Sensitivity sweep ===
+@pytest.mark.parametrize("steps", [50])
+@pytest.mark.benchmark(group="sensitivity-sweep")
+def test_sensitivity_sweep_2d(benchmark, env, steps):
+    base_row = [env.bundle.team_map["NYY"], env.bundle.team_map["BOS"], 0.55, 0.48, 3.1, 2.8, 8.9, 9.1, 12.3, 11.5]
+    sweeps = [("home_win_pct", np.linspace(0, 1, steps)), ("Total Bases - Home", np.linspace(0, 20, steps))]
+    home_grid, away_grid = benchmark(predictor.sensitivity_sweep, env.bundle.clf, base_row, sweeps)
+    assert home_grid.shape == (steps, steps)
+
+
+# === Season simulation ===
+@pytest.mark.benchmark(group="season-simulation")
+def test_season_simulation(benchmark, env):
+    # A full 162-game schedule's worth of games, 10,000 seasons, one process
+    rng = np.random.default_rng(0)
+    home = rng.integers(0, len(season_sim.TEAMS), 2430)
+    away = (home + rng.integers(1, len(season_sim.TEAMS), 2430)) % len(season_sim.TEAMS)
+    games = pd.DataFrame({"home": np.array(season_sim.TEAMS)[home], "away": np.array(season_sim.TEAMS)[away]})
+    p_home = rng.uniform(0.35, 0.65, len(games))
+    wins, division_winner, wild_card = benchmark.pedantic(
+        season_sim.simulate_season, args=(games, p_home, {}, 10_000), rounds=3, iterations=1
+    )
+    assert division_winner.sum() == 10_000 * len(mlb_data.divisions)
+    assert wild_card.sum() == 10_000 * 2 * season_sim.WILD_CARDS
+
+
+# === Live games ===
+def poll_slate(games, patches):
+    # One poll cycle of the live tracker over a slate: apply each game's patch, recompute on change
+    for game, ops in zip(games, patches):
+        game.update(live_games.apply_patch(game.feed, ops))
+
+
+@pytest.mark.benchmark(group="live-games")
+def test_live_slate_poll(benchmark, env):
+    # 15 games mid-game, each receiving its next plate appearance as a JSON Patch
+    timelines = [live_timeline(g) for g in build_season() if g["date"] == str(TODAY)]
+    games = [live_games.LiveGame(t[0]["gamePk"], "NYY", "BOS", 0.55) for t in timelines]
+    step = 40
+    patches = [json_diff(t[step], t[step + 1]) for t in timelines]
+
+    def setup():
+        for game, timeline in zip(games, timelines):
+            game.situation = None
+            game.update(json.loads(json.dumps(timeline[step])))
+        return (games, patches), {}
+
+    benchmark.pedantic(poll_slate, setup=setup, rounds=50, iterations=1)
+    assert [g.feed for g in games] == [t[step + 1] for t in timelines]
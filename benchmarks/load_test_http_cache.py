@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Pin the clock to the stub season before mlb_data builds any schedule url
+os.environ.setdefault("MLB_TODAY", "2025-05-01")
+
+import boxscore_store  # noqa: E402
+import http_cache  # noqa: E402
+import mlb_api  # noqa: E402
+import mlb_data  # noqa: E402
+from stub_statsapi import StubStatsApi, TEAM_IDS  # noqa: E402
+
+# Multi-process load simulation for the shared HTTP cache (http_cache.py) against the local stub:
+#   python benchmarks/load_test_http_cache.py --processes 4 --threads 8
+#   python benchmarks/load_test_http_cache.py --processes 4 --threads 8 --no-cache
+# Every thread of every process plays a session opening the 10-Game Averages page at the same
+# instant (a shared barrier releases them together): league standings, then the season schedule
+# and every boxscore the store is missing. All processes share one boxscore store and one HTTP
+# cache file, like Streamlit replicas on one host. With the cache on, each URL must reach the
+# stub exactly once; --no-cache shows the duplicated traffic.
+
+
+def session(barrier):
+    barrier.wait()
+    mlb_data.get_standings()
+    mlb_data.get_last_10_game_stats_many(TEAM_IDS)
+
+
+def worker(base_url, tmp_dir, use_cache, threads, barrier, results):
+    mlb_api.STATSAPI_BASE = base_url
+    http_cache.configure(path=os.path.join(tmp_dir, "http_cache.sqlite"), enabled=use_cache)
+    boxscore_store._store = boxscore_store.BoxscoreStore(os.path.join(tmp_dir, "store.sqlite"))
+    pool = [threading.Thread(target=session, args=(barrier,)) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(http_cache.get_cache().stats() if use_cache else {})
+
+
+def run(processes, threads, use_cache, latency):
+    with StubStatsApi(latency=latency) as stub, tempfile.TemporaryDirectory() as tmp_dir:
+        barrier = multiprocessing.Barrier(processes * threads)
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=worker, args=(stub.base_url, tmp_dir, use_cache, threads, barrier, results))
+            for _ in range(processes)
+        ]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        stats = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        return stub.url_hits, stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent sessions across processes vs the shared HTTP cache")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="sessions per process")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub seconds per request")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    url_hits, stats, elapsed = run(args.processes, args.threads, not args.no_cache, args.latency)
+    duplicated = {url: n for url, n in url_hits.items() if n > 1}
+    print(f"{args.processes} processes x {args.threads} sessions, cache {'off' if args.no_cache else 'on'}: {elapsed:.2f}s")
+    print(f"upstream requests: {sum(url_hits.values()):,} for {len(url_hits):,} distinct urls "
+          f"({len(duplicated):,} urls fetched more than once)")
+    if stats and stats[0]:
+        totals = {key: sum(s[key] for s in stats) for key in stats[0]}
+        print("cache: " + ", ".join(f"{key} {value:,}" for key, value in totals.items()))
+    if not args.no_cache and duplicated:
+        sys.exit(f"single-flight violated: {sorted(duplicated.items())[:5]}")
+
+
+if __name__ == "__main__":
+    main()
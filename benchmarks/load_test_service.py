@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+import numpy as np
+
+# Load test for prediction_service.py running locally:
+#   python prediction_service.py --stats fallback &
+#   python benchmarks/load_test_service.py --requests 2000 --concurrency 64
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BOS", "CHC", "CIN", "CLE", "COL", "CHW", "DET",
+    "HOU", "KC", "LAA", "LAD", "MIA", "MIL", "MIN", "NYM", "NYY", "OAK",
+    "PHI", "PIT", "SD", "SEA", "SF", "STL", "TB", "TEX", "TOR", "WSH",
+]
+
+
+async def worker(session, url, count, latencies, errors):
+    for _ in range(count):
+        home, away = random.sample(TEAMS, 2)
+        start = time.perf_counter()
+        try:
+            async with session.post(url, json={"home": home, "away": away}) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(base_url, total, concurrency):
+    latencies, errors = [], []
+    per_worker = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(session, f"{base_url}/predict", n, latencies, errors) for n in per_worker
+        ))
+        elapsed = time.perf_counter() - start
+        async with session.get(f"{base_url}/health") as response:
+            health = await response.json()
+    return np.array(latencies), errors, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description="p50/p99 latency and throughput of POST /predict")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    latencies, errors, elapsed, health = asyncio.run(run(args.url, args.requests, args.concurrency))
+    ms = latencies * 1000
+    print(f"requests={len(latencies)} errors={len(errors)} concurrency={args.concurrency}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency:    p50 {np.percentile(ms, 50):.1f} ms  p99 {np.percentile(ms, 99):.1f} ms  max {ms.max():.1f} ms")
+    if health.get("batches"):
+        print(f"batching:   {health['batched_requests'] / health['batches']:.1f} requests per predict_proba call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+import datetime
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for the statsapi.mlb.com endpoints the app uses, plus RSS feeds at /rss/<name>.
+# RSS responses carry an ETag and answer a matching If-None-Match with 304.
+# Every team plays every day; each game's boxscore is derived from its gamePk so runs are repeatable.
+# Games not yet final are played out on the live feed endpoints (/api/v1.1/game/<pk>/feed/live and
+# .../diffPatch), one plate appearance every `live_step` seconds, from a synthetic timeline or a
+# directory recorded with `live_games.py --record`.
+
+TEAM_IDS = [
+    109, 144, 110, 111, 112, 113, 114, 115, 145, 116,
+    117, 118, 108, 119, 146, 158, 142, 121, 147, 133,
+    143, 134, 135, 136, 137, 138, 139, 140, 141, 120,
+]
+OPENING_DAY = datetime.date(2025, 3, 27)
+FIRST_GAME_PK = 9_000_000  # far above real gamePks (~800k), so stub games can never pass for real ones
+LIVE_PA_SECONDS = 150  # game-clock seconds between plate appearances in synthetic feeds
+MAX_PATCH_STEPS = 40  # diffPatch answers with the full feed when a client is further behind
+
+
+def build_season(days=40, today=None):
+    today = today or OPENING_DAY + datetime.timedelta(days=days - 5)
+    games = []
+    for day in range(days):
+        date = OPENING_DAY + datetime.timedelta(days=day)
+        rng = random.Random(day)
+        order = TEAM_IDS[:]
+        rng.shuffle(order)
+        for i in range(0, len(order), 2):
+            game_pk = FIRST_GAME_PK + day * 15 + i // 2
+            games.append({
+                "gamePk": game_pk,
+                "date": date.isoformat(),
+                "home": order[i],
+                "away": order[i + 1],
+                "final": date < today,
+            })
+    return games
+
+
+def boxscore_payload(game):
+    rng = random.Random(game["gamePk"])
+
+    def side(team_id):
+        return {
+            "team": {"id": team_id},
+            "teamStats": {
+                "batting": {"totalBases": rng.randint(5, 22), "runs": rng.randint(0, 10)},
+                "pitching": {"baseOnBalls": rng.randint(0, 7), "strikeOuts": rng.randint(3, 14)},
+            },
+        }
+
+    return {"teams": {"home": side(game["home"]), "away": side(game["away"])}}
+
+
+def final_score(game):
+    # Same winner the standings payload counts
+    rng = random.Random(game["gamePk"])
+    home_wins = rng.random() < 0.54
+    winner_runs = rng.randint(2, 10)
+    loser_runs = rng.randint(0, winner_runs - 1)
+    return (winner_runs, loser_runs) if home_wins else (loser_runs, winner_runs)
+
+
+def game_payload(game):
+    payload = {
+        "gamePk": game["gamePk"],
+        "gameDate": f"{game['date']}T23:05:00Z",
+        "officialDate": game["date"],
+        "gameType": "R",
+        "status": {"abstractGameState": "Final" if game["final"] else "Preview"},
+        "teams": {
+            "home": {"team": {"id": game["home"]}},
+            "away": {"team": {"id": game["away"]}},
+        },
+        "venue": {"name": "Stub Park"},
+    }
+    if game["final"]:
+        payload["teams"]["home"]["score"], payload["teams"]["away"]["score"] = final_score(game)
+    return payload
+
+
+def schedule_payload(games, query):
+    team_id = query.get("teamId")
+    date = query.get("date")
+    start = query.get("startDate", date)
+    end = query.get("endDate", date)
+
+    by_date = {}
+    for game in games:
+        if team_id and int(team_id) not in (game["home"], game["away"]):
+            continue
+        if start and game["date"] < start:
+            continue
+        if end and game["date"] > end:
+            continue
+        by_date.setdefault(game["date"], []).append(game_payload(game))
+    return {"dates": [{"date": d, "games": g} for d, g in sorted(by_date.items())]}
+
+
+def standings_payload(games):
+    records = {tid: [0, 0] for tid in TEAM_IDS}
+    for game in games:
+        if not game["final"]:
+            continue
+        home_runs, away_runs = final_score(game)
+        winner, loser = (game["home"], game["away"]) if home_runs > away_runs else (game["away"], game["home"])
+        records[winner][0] += 1
+        records[loser][1] += 1
+    team_records = [{"team": {"id": tid}, "wins": w, "losses": l} for tid, (w, l) in records.items()]
+    return {"records": [{"teamRecords": team_records[:15]}, {"teamRecords": team_records[15:]}]}
+
+
+def rss_payload(name, items=30):
+    entries = "".join(
+        f"<item><title>{name} story {i}</title><link>https://example.com/{name}/{i}</link>"
+        f"<description>Story {i} about {name}.</description>"
+        f"<pubDate>Thu, 01 May 2025 {i % 24:02d}:00:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>'
+        f"<link>https://example.com/{name}</link><description>{name} news</description>{entries}"
+        "</channel></rss>"
+    ).encode()
+
+
+# === Live feeds ===
+def synthetic_play(rng, index, inning, half, outs, runs, home_runs, away_runs):
+    if runs < 0:
+        event = rng.choice(["Strikeout", "Groundout", "Flyout", "Lineout"])
+        runs = 0
+    else:
+        event = "Home Run" if runs >= 2 and rng.random() < 0.5 else rng.choice(["Single", "Double", "Walk"])
+    pitches = rng.randint(1, 7)
+    return {
+        "result": {"event": event, "description": f"Batter {index} {event.lower()}.", "rbi": runs,
+                   "awayScore": away_runs, "homeScore": home_runs},
+        "about": {"atBatIndex": index, "halfInning": half, "inning": inning, "isComplete": True},
+        "count": {"balls": rng.randint(0, 3), "strikes": rng.randint(0, 2), "outs": outs},
+        "playEvents": [
+            {"index": k, "details": {"description": rng.choice(["Ball", "Called Strike", "Foul", "In play"])},
+             "pitchData": {"startSpeed": round(rng.uniform(78, 99), 1), "zone": rng.randint(1, 14)}}
+            for k in range(pitches)
+        ],
+    }
+
+
+def live_timeline(game, step_seconds=LIVE_PA_SECONDS):
+    # Every version of one game's live feed, one per plate appearance or inning break
+    rng = random.Random(game["gamePk"] * 7 + 1)
+    start = datetime.datetime.fromisoformat(f"{game['date']}T23:05:00")
+    feed = {
+        "gamePk": game["gamePk"],
+        "metaData": {"wait": 10, "timeStamp": ""},
+        "gameData": {
+            "status": {"abstractGameState": "Preview", "detailedState": "Scheduled"},
+            "teams": {"home": {"id": game["home"]}, "away": {"id": game["away"]}},
+        },
+        "liveData": {
+            "plays": {"allPlays": []},
+            "linescore": {
+                "currentInning": 1, "inningState": "Top", "isTopInning": True, "outs": 0,
+                "teams": {"home": {"runs": 0, "hits": 0}, "away": {"runs": 0, "hits": 0}}, "innings": [],
+            },
+        },
+    }
+    timeline = []
+
+    def snapshot():
+        feed["metaData"]["timeStamp"] = (start + datetime.timedelta(seconds=step_seconds * len(timeline))).strftime("%Y%m%d_%H%M%S")
+        timeline.append(json.loads(json.dumps(feed)))
+
+    snapshot()
+    feed["gameData"]["status"] = {"abstractGameState": "Live", "detailedState": "In Progress"}
+    linescore = feed["liveData"]["linescore"]
+    score = {"home": 0, "away": 0}
+    inning = 0
+    while True:
+        inning += 1
+        linescore["innings"].append({"num": inning, "home": {"runs": 0}, "away": {"runs": 0}})
+        for half, side in (("top", "away"), ("bottom", "home")):
+            if side == "home" and inning >= 9 and score["home"] > score["away"]:
+                break
+            linescore.update(currentInning=inning, inningState=half.title(), isTopInning=half == "top", outs=0)
+            outs = 0
+            while outs < 3:
+                runs = -1 if rng.random() < 0.68 else rng.choices([0, 1, 2, 3], [0.55, 0.3, 0.1, 0.05])[0]
+                if runs < 0:
+                    outs += 1
+                else:
+                    score[side] += runs
+                    linescore["teams"][side]["hits"] += 1
+                    linescore["teams"][side]["runs"] = score[side]
+                    linescore["innings"][-1][side]["runs"] += runs
+                linescore["outs"] = outs
+                feed["liveData"]["plays"]["allPlays"].append(synthetic_play(
+                    rng, len(feed["liveData"]["plays"]["allPlays"]), inning, half, outs, runs, score["home"], score["away"],
+                ))
+                walk_off = side == "home" and inning >= 9 and score["home"] > score["away"]
+                snapshot()
+                if walk_off:
+                    break
+            if outs == 3:
+                linescore.update(inningState="Middle" if half == "top" else "End", outs=0)
+                snapshot()
+        if inning >= 9 and score["home"] != score["away"]:
+            break
+    feed["gameData"]["status"] = {"abstractGameState": "Final", "detailedState": "Final"}
+    snapshot()
+    return timeline
+
+
+def load_recording(live_dir):
+    # gamePk -> feed versions in timecode order, from `live_games.py --record live_dir`
+    recordings = {}
+    for name in os.listdir(live_dir):
+        game_dir = os.path.join(live_dir, name)
+        if not (name.isdigit() and os.path.isdir(game_dir)):
+            continue
+        feeds = []
+        for file_name in sorted(os.listdir(game_dir)):
+            with open(os.path.join(game_dir, file_name)) as f:
+                feeds.append(json.load(f))
+        recordings[int(name)] = feeds
+    return recordings
+
+
+def escape_pointer(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old, new, path=""):
+    # JSON Patch operations turning old into new: objects key by key, lists element by element
+    # with "add" for appended items; anything else is replaced whole
+    if type(old) is not type(new) or (isinstance(old, list) and len(new) < len(old)):
+        return [{"op": "replace", "path": path, "value": new}]
+    if isinstance(old, dict):
+        ops = [{"op": "remove", "path": f"{path}/{escape_pointer(k)}"} for k in old if k not in new]
+        for key, value in new.items():
+            sub = f"{path}/{escape_pointer(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": sub, "value": value})
+            elif old[key] != value:
+                ops.extend(json_diff(old[key], value, sub))
+        return ops
+    if isinstance(old, list):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                ops.extend(json_diff(a, b, f"{path}/{i}"))
+        ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old):])
+        return ops
+    return [] if old == new else [{"op": "replace", "path": path, "value": new}]
+
+
+class StubStatsApi:
+    def __init__(self, latency=0.02, days=40, today=None, live_step=1.0, live_dir=None):
+        self.latency = latency
+        self.today = today or OPENING_DAY + datetime.timedelta(days=days - 5)
+        self.games = build_season(days, self.today)
+        self.games_by_pk = {g["gamePk"]: g for g in self.games}
+        self.live_step = live_step  # wall seconds per live feed version
+        self.timelines = load_recording(live_dir) if live_dir else {}
+        self.diffs = {}
+        self.hits = {}
+        self.url_hits = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._started = None
+
+    @property
+    def root_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self):
+        return f"{self.root_url}/api/v1"
+
+    def feed_url(self, name):
+        return f"{self.root_url}/rss/{name}"
+
+    def route(self, path, query):
+        if path.endswith("/schedule"):
+            return "schedule", schedule_payload(self.games, query)
+        if path.endswith("/boxscore"):
+            game_pk = int(path.rstrip("/").split("/")[-2])
+            return "boxscore", boxscore_payload(self.games_by_pk[game_pk])
+        if path.endswith("/standings"):
+            return "standings", standings_payload(self.games)
+        if "/feed/live" in path:
+            return self.live_route(path, query)
+        return None, None
+
+    # === Live feeds ===
+    def timeline(self, game_pk):
+        with self._lock:
+            if game_pk not in self.timelines:
+                self.timelines[game_pk] = live_timeline(self.games_by_pk[game_pk])
+            return self.timelines[game_pk]
+
+    def live_position(self, game_pk):
+        # Games start a few plate appearances apart, like a real slate's staggered first pitches
+        stagger = (game_pk - FIRST_GAME_PK) % 15 // 3
+        steps = int((time.monotonic() - self._started) / self.live_step) - stagger
+        return min(max(steps, 0), len(self.timeline(game_pk)) - 1)
+
+    def diff(self, game_pk, index):
+        # Operations from version index to index + 1, computed once
+        key = (game_pk, index)
+        if key not in self.diffs:
+            timeline = self.timeline(game_pk)
+            self.diffs[key] = json_diff(timeline[index], timeline[index + 1])
+        return self.diffs[key]
+
+    def live_route(self, path, query):
+        parts = path.rstrip("/").split("/")
+        game_pk = int(parts[parts.index("game") + 1])
+        if game_pk not in self.timelines and (game_pk not in self.games_by_pk or self.games_by_pk[game_pk]["final"]):
+            return "feed_live", None
+        timeline = self.timeline(game_pk)
+        current = self.live_position(game_pk)
+        if not path.endswith("/diffPatch"):
+            return "feed_live", timeline[current]
+        timecodes = [feed["metaData"]["timeStamp"] for feed in timeline]
+        start = query.get("startTimecode")
+        if start not in timecodes or current - timecodes.index(start) > MAX_PATCH_STEPS:
+            return "feed_diff", timeline[current]
+        return "feed_diff", [{"diff": self.diff(game_pk, i)} for i in range(timecodes.index(start), current)]
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                etag = None
+                if parsed.path.startswith("/rss/"):
+                    endpoint, content_type = "rss", "application/rss+xml"
+                    body = rss_payload(parsed.path.rsplit("/", 1)[-1])
+                    etag = f'"{zlib.crc32(body):08x}"'
+                else:
+                    endpoint, payload = stub.route(parsed.path, query)
+                    content_type = "application/json"
+                    body = json.dumps(payload).encode() if payload is not None else None
+                with stub._lock:
+                    stub.hits[endpoint] = stub.hits.get(endpoint, 0) + 1
+                    stub.url_hits[self.path] = stub.url_hits.get(self.path, 0) + 1
+                time.sleep(stub.latency)
+                if etag is not None and self.headers.get("If-None-Match") == etag:
+                    # Conditional GET: the feed hasn't changed
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200 if body is not None else 404)
+                body = body if body is not None else b"{}"
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        # Today's games are played out from the moment the server starts
+        for game in self.games:
+            if game["date"] == self.today.isoformat():
+                self.timeline(game["gamePk"])
+        self._started = time.monotonic()
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 128  # a slate's worth of clients connecting at once
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# Parsed per-game team stats from Final boxscores. A Final boxscore never changes, so a game
+# only ever has to be downloaded once; the SQLite file survives restarts and is shared by
+# every Streamlit worker process on the host (WAL mode allows concurrent readers and one writer).
+
+STORE_PATH = os.environ.get("MLB_STORE_PATH", "mlb_store.sqlite")
+STAT_COLUMNS = ["total_bases", "walks_issued", "strikeouts_thrown"]
+
+# A stat the boxscore doesn't report is NULL, never 0; the rolling averages skip it
+TEAM_GAME_STATS = """
+CREATE TABLE IF NOT EXISTS team_game_stats (
+    game_pk INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    total_bases INTEGER,
+    walks_issued INTEGER,
+    strikeouts_thrown INTEGER,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (game_pk, team_id)
+);
+"""
+
+SCHEMA = TEAM_GAME_STATS + """
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    season INTEGER PRIMARY KEY,
+    final_games INTEGER NOT NULL,
+    stored_games INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    completed_at REAL
+);
+"""
+
+
+class BoxscoreStore:
+    def __init__(self, path=None):
+        self.path = path or STORE_PATH
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            if self._stats_not_null(conn):
+                self._migrate(conn)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _stats_not_null(self, conn):
+        return any(row[1] in STAT_COLUMNS and row[3] for row in conn.execute("PRAGMA table_info(team_game_stats)"))
+
+    def _migrate(self, conn):
+        # Stores created while the stat columns were NOT NULL are rebuilt once with nullable ones
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._stats_not_null(conn):  # another process may have migrated meanwhile
+                conn.execute("ALTER TABLE team_game_stats RENAME TO team_game_stats_old")
+                conn.execute(TEAM_GAME_STATS)
+                conn.execute("INSERT INTO team_game_stats SELECT * FROM team_game_stats_old")
+                conn.execute("DROP TABLE team_game_stats_old")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def missing_game_pks(self, game_pks):
+        game_pks = list(dict.fromkeys(game_pks))
+        if not game_pks:
+            return []
+        with closing(self._connect()) as conn:
+            placeholders = ",".join("?" * len(game_pks))
+            stored = {row[0] for row in conn.execute(
+                f"SELECT DISTINCT game_pk FROM team_game_stats WHERE game_pk IN ({placeholders})", game_pks
+            )}
+        return [pk for pk in game_pks if pk not in stored]
+
+    def save_game_stats(self, rows):
+        # rows: iterable of (game_pk, team_id, stats dict); a stat may be None
+        now = time.time()
+        records = [
+            (game_pk, team_id, *(stats[c] for c in STAT_COLUMNS), now)
+            for game_pk, team_id, stats in rows
+        ]
+        if not records:
+            return 0
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO team_game_stats "
+                "(game_pk, team_id, total_bases, walks_issued, strikeouts_thrown, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+        return len(records)
+
+    def team_game_stats(self, team_id, game_pks):
+        # Returned in the order of game_pks; games not in the store are skipped
+        game_pks = list(game_pks)
+        if not game_pks:
+            return []
+        with closing(self._connect()) as conn:
+            placeholders = ",".join("?" * len(game_pks))
+            rows = conn.execute(
+                f"SELECT game_pk, {', '.join(STAT_COLUMNS)} FROM team_game_stats "
+                f"WHERE team_id = ? AND game_pk IN ({placeholders})",
+                [team_id, *game_pks],
+            ).fetchall()
+        by_pk = {row[0]: dict(zip(STAT_COLUMNS, row[1:])) for row in rows}
+        return [by_pk[pk] for pk in game_pks if pk in by_pk]
+
+    def game_stats(self, game_pks):
+        # Both teams' lines for each stored game: {(game_pk, team_id): stats}
+        game_pks = list(dict.fromkeys(game_pks))
+        if not game_pks:
+            return {}
+        with closing(self._connect()) as conn:
+            placeholders = ",".join("?" * len(game_pks))
+            rows = conn.execute(
+                f"SELECT game_pk, team_id, {', '.join(STAT_COLUMNS)} FROM team_game_stats "
+                f"WHERE game_pk IN ({placeholders})",
+                game_pks,
+            ).fetchall()
+        return {(row[0], row[1]): dict(zip(STAT_COLUMNS, row[2:])) for row in rows}
+
+    # === Backfill checkpoints ===
+    def backfill_progress(self, season):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT final_games, stored_games, updated_at, completed_at FROM backfill_progress WHERE season = ?",
+                (season,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(["final_games", "stored_games", "updated_at", "completed_at"], row))
+
+    def save_backfill_progress(self, season, final_games, stored_games, completed=False):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO backfill_progress "
+                "(season, final_games, stored_games, updated_at, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (season, final_games, stored_games, now, now if completed else None),
+            )
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = BoxscoreStore()
+    return _store
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+import requests
+
+import instrumentation
+import mlb_api
+
+# Cached RSS feeds for the news pages.
+# - Feeds are fetched concurrently through the shared pooled session.
+# - Refreshes send If-None-Match / If-Modified-Since; a 304 keeps the stored entries.
+# - Only the first TOP_N parsed entries are kept per feed.
+# - Stale entries are served immediately while one background refresh runs
+#   (stale-while-revalidate), so a page never blocks on a feed it has shown before.
+
+FEED_TTL = 600  # seconds
+TOP_N = 25  # Reddit pages are scanned for game threads; news pages show 3
+FEED_TIMEOUT = (3.05, 8)
+USER_AGENT = "mlb-game-predictor/1.0 (feed reader)"  # reddit throttles the default UA
+
+Feed = namedtuple("Feed", ["entries", "fetched_at", "etag", "modified"])
+EMPTY_FEED = Feed(entries=[], fetched_at=0.0, etag=None, modified=None)
+
+
+class FeedCache:
+    def __init__(self, ttl=FEED_TTL, top_n=TOP_N, max_workers=8, stale_while_revalidate=True):
+        self.ttl = ttl
+        self.top_n = top_n
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._feeds = {}
+        self._refreshing = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feeds")
+
+    def _download(self, url, previous):
+        headers = {"User-Agent": USER_AGENT}
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.modified:
+            headers["If-Modified-Since"] = previous.modified
+        try:
+            response = mlb_api.get_session().get(url, headers=headers, timeout=FEED_TIMEOUT)
+        except requests.RequestException:
+            return previous
+        instrumentation.record_request(url, len(response.content))
+        if response.status_code == 304:
+            with self._lock:
+                self.not_modified += 1
+            return previous._replace(fetched_at=time.time())
+        if response.status_code != 200:
+            return previous
+        with instrumentation.timed("feed_parse"):
+            parsed = feedparser.parse(response.content)
+        return Feed(
+            entries=list(parsed.entries[:self.top_n]),
+            fetched_at=time.time(),
+            etag=response.headers.get("ETag"),
+            modified=response.headers.get("Last-Modified"),
+        )
+
+    def _refresh(self, url):
+        # One download per url at a time; concurrent callers share the same future
+        with self._lock:
+            future = self._refreshing.get(url)
+            if future is None:
+                future = self._pool.submit(self._refresh_now, url)
+                self._refreshing[url] = future
+        return future
+
+    def _refresh_now(self, url):
+        try:
+            feed = self._download(url, self._feeds.get(url, EMPTY_FEED))
+            with self._lock:
+                self._feeds[url] = feed
+            return feed
+        finally:
+            with self._lock:
+                self._refreshing.pop(url, None)
+
+    def get_many(self, urls):
+        urls = list(dict.fromkeys(urls))
+        now = time.time()
+        results = {}
+        waiting = {}
+        for url in urls:
+            feed = self._feeds.get(url)
+            expired = feed is not None and now - feed.fetched_at >= self.ttl
+            cached = feed is not None and (not expired or self.stale_while_revalidate)
+            with self._lock:
+                if cached:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if cached:
+                results[url] = feed
+                if expired:
+                    self._refresh(url)
+            else:
+                waiting[url] = self._refresh(url)
+        for url, future in waiting.items():
+            results[url] = future.result()
+        return results
+
+    def get(self, url):
+        return self.get_many([url])[url]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "not_modified": self.not_modified}
+
+
+feed_cache = FeedCache()
+instrumentation.register_cache("feeds", feed_cache.stats)
+
+
+def get_feed(url):
+    return feed_cache.get(url)
+
+
+def get_feeds(urls):
+    return feed_cache.get_many(urls)
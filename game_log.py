@@ -0,0 +1,345 @@
+import argparse
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# Compact per-team-per-game stat log, one Arrow IPC file per season:
+#   game_log/season=2024.arrow, game_log/season=2025.arrow, ...
+# Rows are sorted by (team_id, game_date, game_number), so one team's season is a contiguous slice
+# found with two searchsorted calls. Files are written uncompressed and opened through a memory
+# map: column arrays are zero-copy views of the page cache, so opening a season costs no reads
+# up front and resident memory stays flat however many seasons are on disk.
+#   python game_log.py build --season 2025           (schedule index + boxscore store)
+#   python game_log.py import-games games.csv        (train_model.py game log format)
+
+LOG_DIR = os.environ.get("MLB_GAME_LOG_DIR", "game_log")
+STATS = ["total_bases", "walks_issued", "strikeouts_thrown"]
+
+SCHEMA = pa.schema([
+    ("team_id", pa.int16()),
+    ("game_date", pa.date32()),
+    ("game_number", pa.int8()),  # 2 for the second game of a doubleheader
+    ("game_pk", pa.int32()),
+    ("opponent_id", pa.int16()),
+    ("is_home", pa.int8()),
+    ("won", pa.int8()),
+    ("runs", pa.int16()),
+    ("runs_allowed", pa.int16()),
+    ("total_bases", pa.int16()),  # stats are null where the source had no value
+    ("walks_issued", pa.int16()),
+    ("strikeouts_thrown", pa.int16()),
+])
+# gamePk order is not play order (postponed games keep their old ids), hence game_number
+SORT_KEYS = [("team_id", "ascending"), ("game_date", "ascending"), ("game_number", "ascending")]
+
+
+def season_path(season, log_dir=None):
+    return os.path.join(log_dir or LOG_DIR, f"season={season}.arrow")
+
+
+def available_seasons(log_dir=None):
+    log_dir = log_dir or LOG_DIR
+    if not os.path.isdir(log_dir):
+        return []
+    return sorted(
+        int(name[len("season="):-len(".arrow")]) for name in os.listdir(log_dir)
+        if name.startswith("season=") and name.endswith(".arrow")
+    )
+
+
+# === Writing ===
+def rows_table(rows):
+    # rows: DataFrame (or dict of columns) with every SCHEMA column; game_date as dates or ISO strings
+    frame = pd.DataFrame(rows)
+    frame["game_date"] = pd.to_datetime(frame["game_date"]).dt.date
+    table = pa.Table.from_pandas(frame[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+    return table.sort_by(SORT_KEYS)
+
+
+def write_season(season, table, log_dir=None):
+    # One record batch per file so every column maps to a single contiguous buffer; written to a
+    # temp file and renamed, so readers holding the old map keep a consistent view
+    path = season_path(season, log_dir)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table = table.cast(SCHEMA).combine_chunks()
+    with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, SCHEMA) as writer:
+        writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(tmp_path, path)
+    return path
+
+
+def append_games(season, rows, log_dir=None):
+    # Merge new rows into a season; a (game_pk, team_id) already present is replaced
+    new = rows_table(rows)
+    path = season_path(season, log_dir)
+    if os.path.exists(path):
+        old = open_season(season, log_dir).table
+        keys = set(zip(new["game_pk"].to_pylist(), new["team_id"].to_pylist()))
+        keep = [
+            (pk, tid) not in keys
+            for pk, tid in zip(old["game_pk"].to_numpy(), old["team_id"].to_numpy())
+        ]
+        new = pa.concat_tables([old.filter(pa.array(keep, type=pa.bool_())), new]).sort_by(SORT_KEYS)
+    return write_season(season, new, log_dir)
+
+
+def team_rows(game_pk, game_date, game_number, home_id, away_id, home_score, away_score, home_stats, away_stats):
+    # The two per-team rows for one final game
+    home_won = int(home_score > away_score)
+    game = dict(game_date=game_date, game_number=game_number, game_pk=game_pk)
+    return [
+        dict(game, team_id=home_id, opponent_id=away_id, is_home=1,
+             won=home_won, runs=home_score, runs_allowed=away_score, **home_stats),
+        dict(game, team_id=away_id, opponent_id=home_id, is_home=0,
+             won=1 - home_won, runs=away_score, runs_allowed=home_score, **away_stats),
+    ]
+
+
+# === Reading ===
+class SeasonLog:
+    def __init__(self, table):
+        self.table = table
+        self._columns = {}
+        team_ids = self.column("team_id")
+        self.teams, self._starts = np.unique(team_ids, return_index=True)
+        self._ends = np.append(self._starts[1:], len(team_ids))
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def column(self, name):
+        # NumPy view over the mapped buffer (dates as int32 days since the epoch). A column with
+        # nulls is copied out as float64 with NaN in their place.
+        array = self._columns.get(name)
+        if array is None:
+            chunks = self.table.column(name).chunks
+            chunk = chunks[0] if len(chunks) == 1 else pa.concat_arrays(chunks)
+            if pa.types.is_date32(chunk.type):
+                chunk = chunk.view(pa.int32())
+            array = chunk.to_numpy(zero_copy_only=len(chunks) == 1 and chunk.null_count == 0)
+            self._columns[name] = array
+        return array
+
+    def dates(self):
+        return self.column("game_date").astype("datetime64[D]")
+
+    def team_slice(self, team_id, before=None):
+        # Row range of one team's games, optionally only those before a date
+        i = np.searchsorted(self.teams, team_id)
+        if i == len(self.teams) or self.teams[i] != team_id:
+            return slice(0, 0)
+        start, end = int(self._starts[i]), int(self._ends[i])
+        if before is not None:
+            day = np.datetime64(before, "D").astype(np.int32)
+            end = start + int(np.searchsorted(self.column("game_date")[start:end], day, side="left"))
+        return slice(start, end)
+
+    def stat_matrix(self, stats=STATS):
+        return np.column_stack([self.column(s) for s in stats])
+
+    def rolling_averages(self, team_ids, window=10, before=None, stats=STATS):
+        # Same shape as mlb_data.get_last_10_game_stats_many: team_id -> {stat: avg} or None.
+        # Missing values are left out of the mean; a stat with none in the window gives None.
+        results = {}
+        for team_id in team_ids:
+            rows = self.team_slice(team_id, before)
+            rows = slice(max(rows.start, rows.stop - window), rows.stop)
+            values = np.column_stack([self.column(s)[rows] for s in stats]).astype(np.float32)
+            present = ~np.isnan(values)
+            if not present.any(axis=0).all():
+                results[team_id] = None
+                continue
+            means = np.where(present, values, 0).sum(axis=0) / present.sum(axis=0)
+            results[team_id] = {s: round(float(v), 2) for s, v in zip(stats, means)}
+        return results
+
+    def pregame_features(self, window=10, stats=STATS):
+        # Every row's team features as they stood before that game, for all teams at once:
+        # season win % so far and the mean of the previous `window` games (NaN with no history).
+        # Prefix sums over the team-sorted rows; differences never cross a team boundary. Missing
+        # stat values are left out of both the sums and the counts, as in RollingFeatureEngine.
+        n = len(self)
+        row = np.arange(n)
+        team_start = np.repeat(self._starts, self._ends - self._starts)
+
+        won = np.concatenate([[0], np.cumsum(self.column("won"), dtype=np.int64)])
+        played = row - team_start
+        with np.errstate(invalid="ignore", divide="ignore"):
+            win_pct = ((won[row] - won[team_start]) / played).astype(np.float32)
+
+        values = self.stat_matrix(stats).astype(np.float64)
+        present = ~np.isnan(values)
+        sums = np.vstack([np.zeros((1, len(stats))), np.cumsum(np.where(present, values, 0.0), axis=0)])
+        counts = np.vstack([np.zeros((1, len(stats)), dtype=np.int64), np.cumsum(present, axis=0)])
+        lo = np.maximum(row - window, team_start)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = ((sums[row] - sums[lo]) / (counts[row] - counts[lo])).astype(np.float32)
+        return win_pct, averages
+
+
+_open_logs = {}
+_open_lock = threading.Lock()
+
+
+def open_season(season, log_dir=None):
+    # Memory-mapped and cached per file; a rewritten file (new mtime) is mapped again
+    path = season_path(season, log_dir)
+    mtime = os.path.getmtime(path)
+    with _open_lock:
+        cached = _open_logs.get(path)
+        if cached is None or cached[0] != mtime:
+            with pa.memory_map(path, "r") as source:
+                table = ipc.open_file(source).read_all()
+            cached = (mtime, SeasonLog(table))
+            _open_logs[path] = cached
+    return cached[1]
+
+
+# === Game frames ===
+def games_frame(seasons, window=None, log_dir=None):
+    # One row per game in train_model.py's game log format (home, away, date, scores and
+    # home-/away- stat columns). With `window`, the model's stat feature columns are filled from
+    # pregame_features (NaN where a team has no history yet).
+    import mlb_data
+    from predictor import STAT_FEATURES
+
+    frames = []
+    for season in seasons:
+        log = open_season(season, log_dir)
+        columns = {name: log.column(name) for name in ["team_id", "game_pk", "game_number", "is_home", "runs"] + STATS}
+        if window:
+            win_pct, averages = log.pregame_features(window)
+            columns["win_pct"] = win_pct
+            for i, stat in enumerate(STATS):
+                columns[f"avg_{stat}"] = averages[:, i]
+        rows = pd.DataFrame(columns)
+        rows["date"] = log.dates()
+
+        home = rows[rows["is_home"] == 1].set_index("game_pk")
+        away = rows[rows["is_home"] == 0].set_index("game_pk")
+        home, away = home.align(away, join="inner", axis=0)
+        games = pd.DataFrame({
+            "date": home["date"].to_numpy(),
+            "game_pk": home.index.to_numpy(),
+            "game_number": home["game_number"].to_numpy(),
+            "home": home["team_id"].map(mlb_data.id_to_abbr).to_numpy(),
+            "away": away["team_id"].map(mlb_data.id_to_abbr).to_numpy(),
+            "home-score": home["runs"].to_numpy(np.float32),
+            "away-score": away["runs"].to_numpy(np.float32),
+        })
+        for stat in STATS:
+            games[f"home-{stat.replace('_', '-')}"] = home[stat].to_numpy(np.float32)
+            games[f"away-{stat.replace('_', '-')}"] = away[stat].to_numpy(np.float32)
+        if window:
+            for key, (home_column, away_column) in STAT_FEATURES.items():
+                source = key if key == "win_pct" else f"avg_{key}"
+                games[home_column] = home[source].to_numpy()
+                games[away_column] = away[source].to_numpy()
+        frames.append(games)
+
+    games = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if len(games):
+        games = games.sort_values(["date", "game_number"], kind="stable").reset_index(drop=True)
+        for column in ["home", "away"]:
+            games[column] = games[column].astype("category")
+    return games
+
+
+# === Builders ===
+def build_season(season, store=None, log_dir=None, schedule_index=None, **fetch_kwargs):
+    # Every Final game of a season from the league schedule index, stats from the boxscore store
+    # (downloading whatever the store hasn't seen yet; fetch_kwargs go to mlb_data.sync_boxscores)
+    import boxscore_store
+    import mlb_data
+
+    store = store or boxscore_store.get_store()
+    index = schedule_index or mlb_data.get_schedule_index(season)
+    finals = [g for g in index.games if g["state"] == "Final" and g["home_score"] is not None]
+    mlb_data.sync_boxscores(store, [g["game_pk"] for g in finals], **fetch_kwargs)
+
+    stats = store.game_stats([g["game_pk"] for g in finals])
+
+    rows = []
+    game_numbers = {}
+    for game in finals:  # in start-time order
+        key = (game["home_id"], game["official_date"])
+        game_numbers[key] = game_numbers.get(key, 0) + 1
+        home_stats = stats.get((game["game_pk"], game["home_id"]))
+        away_stats = stats.get((game["game_pk"], game["away_id"]))
+        if home_stats is None or away_stats is None:
+            continue
+        rows.extend(team_rows(
+            game["game_pk"], game["official_date"], game_numbers[key], game["home_id"], game["away_id"],
+            game["home_score"], game["away_score"], home_stats, away_stats,
+        ))
+    if not rows:
+        return None
+    return write_season(season, rows_table(rows), log_dir)
+
+
+def import_games(games, log_dir=None):
+    # Convert a train_model.py style game log (team abbreviations, home-/away- stat columns) into
+    # season files. Logs without game_pk get synthetic ids, stable for a given file.
+    import mlb_data
+
+    games = games.dropna(subset=["home", "away", "home-score", "away-score", "date"]).copy()
+    games["date"] = pd.to_datetime(games["date"])
+    games["home_id"] = games["home"].astype(str).map(mlb_data.mlb_team_ids)
+    games["away_id"] = games["away"].astype(str).map(mlb_data.mlb_team_ids)
+    games = games.dropna(subset=["home_id", "away_id"])
+    if "game_pk" not in games.columns:
+        games["game_pk"] = games["date"].dt.year * 100_000 + games.groupby(games["date"].dt.year).cumcount() + 1
+    # Rows are assumed to be in play order within a day
+    games["game_number"] = games.groupby([games["home_id"], games["date"].dt.date]).cumcount() + 1
+
+    paths = []
+    for season, season_games in games.groupby(games["date"].dt.year):
+        home_won = (season_games["home-score"] > season_games["away-score"]).astype(np.int8)
+        columns = {}
+        for side, other, is_home in [("home", "away", 1), ("away", "home", 0)]:
+            columns[side] = pd.DataFrame({
+                "team_id": season_games[f"{side}_id"].to_numpy(),
+                "game_date": season_games["date"].dt.date.to_numpy(),
+                "game_number": season_games["game_number"].to_numpy(),
+                "game_pk": season_games["game_pk"].to_numpy(),
+                "opponent_id": season_games[f"{other}_id"].to_numpy(),
+                "is_home": is_home,
+                "won": home_won.to_numpy() if is_home else 1 - home_won.to_numpy(),
+                "runs": season_games[f"{side}-score"].to_numpy(),
+                "runs_allowed": season_games[f"{other}-score"].to_numpy(),
+                # Missing stats stay null; training fills them with the serving fallbacks
+                **{
+                    stat: season_games.get(f"{side}-{stat.replace('_', '-')}", pd.Series(np.nan, index=season_games.index))
+                    .to_numpy(np.float64)
+                    for stat in STATS
+                },
+            })
+        paths.append(write_season(int(season), rows_table(pd.concat(columns.values(), ignore_index=True)), log_dir))
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the per-season columnar game log")
+    parser.add_argument("--log-dir", default=LOG_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a season from the MLB API and the boxscore store")
+    build.add_argument("--season", type=int, action="append", required=True)
+    imported = commands.add_parser("import-games", help="convert a train_model.py game log CSV")
+    imported.add_argument("games")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        paths = [build_season(season, log_dir=args.log_dir) for season in args.season]
+    else:
+        paths = import_games(pd.read_csv(args.games), log_dir=args.log_dir)
+    for path in filter(None, paths):
+        print(f"{path}  {len(open_season(int(path.rsplit('=', 1)[1][:-len('.arrow')]), args.log_dir)):,} team games")
+
+
+if __name__ == "__main__":
+    main()
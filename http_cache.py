@@ -0,0 +1,259 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from urllib.parse import urlparse
+
+import instrumentation
+
+# Shared response cache for the statsapi schedule, standings and boxscore endpoints, keyed by URL.
+# Responses live in a SQLite file that every app process on the host (Streamlit replicas, the
+# prefetch worker, the prediction service) reads and writes, and concurrent identical requests
+# produce one upstream call:
+# - within a process, the first thread to miss fetches and the others wait on its result;
+# - across processes, the fetching thread first takes a lease row for the URL. Other processes
+#   that miss while the lease is held poll for the response instead of fetching. While a fetch
+#   runs (retries included) one thread per process re-stamps its leases every LEASE_SECONDS / 3,
+#   so only a lease whose process died goes LEASE_SECONDS without renewal and is taken over.
+# If the upstream call fails and an expired copy exists, the expired copy is served.
+
+CACHE_PATH = os.environ.get("MLB_HTTP_CACHE_PATH", "mlb_http_cache.sqlite")
+ENABLED = os.environ.get("MLB_HTTP_CACHE", "1") != "0"
+LEASE_SECONDS = 30.0
+POLL_SECONDS = 0.02
+PURGE_EVERY = 500  # writes between sweeps of expired responses
+
+# URL path suffix -> seconds a response stays fresh; other URLs are not cached
+TTLS = {
+    "/schedule": 60,
+    "/standings": 300,
+    "/boxscore": 3600,  # parsed into the boxscore store right away; kept long enough to coalesce
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    url TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    started_at REAL NOT NULL
+);
+"""
+
+
+def ttl_for(url):
+    path = urlparse(url).path.rstrip("/")
+    for suffix, ttl in TTLS.items():
+        if path.endswith(suffix):
+            return ttl
+    return None
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SharedHttpCache:
+    def __init__(self, path=None):
+        self.path = path or CACHE_PATH
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.hits = 0  # fresh responses read from the file
+        self.misses = 0  # upstream calls made by this process
+        self.coalesced = 0  # waited on another thread in this process
+        self.shared = 0  # waited on another process
+        self.stale = 0
+        self._writes = 0
+        self._flights = {}
+        self._held = 0  # leases this process is fetching under
+        self._renewer = None
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # Autocommit mode, so claims can use explicit BEGIN IMMEDIATE transactions
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self, conn):
+        # Write lock up front; rolled back if the body fails, never committed if BEGIN itself did
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _read(self, conn, url, fresh_only=True):
+        row = conn.execute("SELECT body, expires_at FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None or (fresh_only and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+
+    def get_json(self, url, ttl, fetch):
+        # fetch() performs the upstream request and returns parsed JSON
+        with closing(self._connect()) as conn:
+            value = self._read(conn, url)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._flights[url] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch_once(url, ttl, fetch)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[url]
+            flight.done.set()
+        return flight.value
+
+    def _fetch_once(self, url, ttl, fetch):
+        # Runs in one thread per process per URL; coordinates with other processes via the lease
+        with closing(self._connect()) as conn:
+            while True:
+                claimed, value = self._claim(conn, url)
+                if value is not None:
+                    with self._lock:
+                        self.shared += 1
+                    return value
+                if claimed:
+                    break
+                time.sleep(POLL_SECONDS)
+
+            self._hold_lease()
+            try:
+                with self._lock:
+                    self.misses += 1
+                value = fetch()
+            except Exception:
+                conn.execute("DELETE FROM leases WHERE url = ? AND owner = ?", (url, self.owner))
+                stale = self._read(conn, url, fresh_only=False)
+                if stale is None:
+                    raise
+                with self._lock:
+                    self.stale += 1
+                return stale
+            finally:
+                with self._lock:
+                    self._held -= 1
+
+            now = time.time()
+            with self._transaction(conn):
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (url, body, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (url, json.dumps(value), now, now + ttl),
+                )
+                conn.execute("DELETE FROM leases WHERE url = ? AND owner = ?", (url, self.owner))
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY == 0
+            if purge:
+                self.purge_expired()
+            return value
+
+    def _claim(self, conn, url):
+        # (True, None): this process fetches. (False, value): another process already did.
+        # (False, None): another process is fetching right now.
+        with self._transaction(conn):
+            value = self._read(conn, url)
+            if value is not None:
+                return False, value
+            now = time.time()
+            lease = conn.execute("SELECT started_at FROM leases WHERE url = ?", (url,)).fetchone()
+            if lease is not None and now - lease[0] < LEASE_SECONDS:
+                return False, None
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (url, owner, started_at) VALUES (?, ?, ?)", (url, self.owner, now)
+            )
+        return True, None
+
+    def _hold_lease(self):
+        with self._lock:
+            self._held += 1
+            if self._renewer is None:
+                self._renewer = threading.Thread(target=self._renew_leases, name="http-cache-leases", daemon=True)
+                self._renewer.start()
+
+    def _renew_leases(self):
+        # Runs while this process holds any lease; one UPDATE re-stamps all of them
+        with closing(self._connect()) as conn:
+            while True:
+                time.sleep(LEASE_SECONDS / 3)
+                with self._lock:
+                    if self._held == 0:
+                        self._renewer = None
+                        return
+                try:
+                    conn.execute("UPDATE leases SET started_at = ? WHERE owner = ?", (time.time(), self.owner))
+                except sqlite3.Error:
+                    pass  # retried on the next beat; a lease expires only after LEASE_SECONDS
+
+    def clear(self):
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM leases")
+
+    def purge_expired(self, older_than=0):
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - older_than,))
+
+    def stats(self):
+        # Anything answered without an upstream call of our own counts as a hit
+        return {
+            "hits": self.hits + self.coalesced + self.shared, "misses": self.misses,
+            "coalesced": self.coalesced, "shared": self.shared, "stale": self.stale,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SharedHttpCache()
+    return _cache
+
+
+def configure(path=None, enabled=None):
+    # Point this process at another cache file and/or switch the cache on or off; with no path
+    # the next get_cache() opens CACHE_PATH again
+    global _cache, ENABLED
+    with _cache_lock:
+        if enabled is not None:
+            ENABLED = enabled
+        _cache = SharedHttpCache(path) if path and ENABLED else None
+
+
+instrumentation.register_cache("http_cache", lambda: get_cache().stats() if ENABLED else {"enabled": False})
@@ -0,0 +1,163 @@
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import ContextDecorator
+from urllib.parse import urlparse
+
+# Lightweight process-wide metrics:
+# - stage timers:      with timed("predict_proba"): ...   or   @timed("get_team_win_pct")
+# - outbound requests: count and response bytes per endpoint (ids collapsed to {id})
+# - cache hit/miss:    counted directly, or pulled from any object with a stats() method
+# - status:            free-form stats of background components (trackers, workers), not caches
+# Exported as a JSON log line, Prometheus text, or a dict for the app's diagnostics page.
+
+log = logging.getLogger("mlb.metrics")
+
+_lock = threading.Lock()
+_timings = {}    # name -> [count, total_seconds, max_seconds]
+_requests = {}   # endpoint -> [count, bytes]
+_caches = {}     # name -> [hits, misses]
+_cache_sources = {}  # name -> callable returning {"hits": .., "misses": ..}
+_status_sources = {}  # name -> callable returning a flat dict
+
+
+# === Timers ===
+def record_timing(name, seconds):
+    with _lock:
+        entry = _timings.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+
+class timed(ContextDecorator):
+    def __init__(self, name):
+        self.name = name
+        self._start = None
+
+    def _recreate_cm(self):
+        # Fresh instance per decorated call, so concurrent calls don't share a start time
+        return timed(self.name)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record_timing(self.name, time.perf_counter() - self._start)
+        return False
+
+
+# === Outbound requests ===
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(url):
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{_ID_SEGMENT.sub('/{id}', parsed.path)}"
+
+
+def record_request(url, num_bytes):
+    endpoint = endpoint_name(url)
+    with _lock:
+        entry = _requests.setdefault(endpoint, [0, 0])
+        entry[0] += 1
+        entry[1] += num_bytes or 0
+
+
+# === Caches ===
+def record_cache(name, hits=0, misses=0):
+    with _lock:
+        entry = _caches.setdefault(name, [0, 0])
+        entry[0] += hits
+        entry[1] += misses
+
+
+def register_cache(name, stats_source):
+    _cache_sources[name] = stats_source
+
+
+# === Status ===
+def register_status(name, stats_source):
+    _status_sources[name] = stats_source
+
+
+# === Export ===
+def snapshot():
+    with _lock:
+        caches = {name: {"hits": h, "misses": m} for name, (h, m) in _caches.items()}
+        timings = {
+            name: {"count": c, "total_seconds": round(t, 6), "mean_seconds": round(t / c, 6), "max_seconds": round(mx, 6)}
+            for name, (c, t, mx) in _timings.items()
+        }
+        requests = {endpoint: {"count": c, "bytes": b} for endpoint, (c, b) in _requests.items()}
+    for name, source in _cache_sources.items():
+        stats = source()
+        caches[name] = {"hits": stats.get("hits", 0), "misses": stats.get("misses", 0)}
+    for stats in caches.values():
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 4) if total else None
+    status = {name: source() for name, source in _status_sources.items()}
+    return {"timestamp": time.time(), "timings": timings, "requests": requests, "caches": caches, "status": status}
+
+
+def to_json():
+    return json.dumps(snapshot(), sort_keys=True)
+
+
+def log_json(path=None):
+    # One structured line per call: to `path` if given, otherwise to the mlb.metrics logger
+    line = to_json()
+    if path:
+        with open(path, "a") as f:
+            f.write(line + "\n")
+    else:
+        log.info(line)
+    return line
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus():
+    data = snapshot()
+    lines = [
+        "# TYPE mlb_stage_seconds summary",
+    ]
+    for name, t in sorted(data["timings"].items()):
+        lines.append(f'mlb_stage_seconds_count{{stage="{_label(name)}"}} {t["count"]}')
+        lines.append(f'mlb_stage_seconds_sum{{stage="{_label(name)}"}} {t["total_seconds"]}')
+    lines.append("# TYPE mlb_stage_seconds_max gauge")
+    for name, t in sorted(data["timings"].items()):
+        lines.append(f'mlb_stage_seconds_max{{stage="{_label(name)}"}} {t["max_seconds"]}')
+
+    lines.append("# TYPE mlb_http_requests_total counter")
+    for endpoint, r in sorted(data["requests"].items()):
+        lines.append(f'mlb_http_requests_total{{endpoint="{_label(endpoint)}"}} {r["count"]}')
+    lines.append("# TYPE mlb_http_response_bytes_total counter")
+    for endpoint, r in sorted(data["requests"].items()):
+        lines.append(f'mlb_http_response_bytes_total{{endpoint="{_label(endpoint)}"}} {r["bytes"]}')
+
+    lines.append("# TYPE mlb_cache_hits_total counter")
+    for name, c in sorted(data["caches"].items()):
+        lines.append(f'mlb_cache_hits_total{{cache="{_label(name)}"}} {c["hits"]}')
+    lines.append("# TYPE mlb_cache_misses_total counter")
+    for name, c in sorted(data["caches"].items()):
+        lines.append(f'mlb_cache_misses_total{{cache="{_label(name)}"}} {c["misses"]}')
+
+    lines.append("# TYPE mlb_status gauge")
+    for name, stats in sorted(data["status"].items()):
+        for key, value in sorted(stats.items()):
+            if isinstance(value, (int, float)):
+                lines.append(f'mlb_status{{component="{_label(name)}",stat="{_label(key)}"}} {float(value)}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _requests.clear()
+        _caches.clear()
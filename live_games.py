@@ -0,0 +1,517 @@
+import argparse
+import asyncio
+import copy
+import datetime
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import mlb_api
+import mlb_data
+import model_registry
+import predictor
+import slate
+
+# Live win probability for the day's games, kept current from each game's statsapi live feed:
+#   python live_games.py                        # follow today's slate until every game is final
+#   python live_games.py --record recordings    # also save every feed version seen, for replay
+# One asyncio loop follows the whole slate. Each game's full feed (feed/live) is downloaded once;
+# after that each poll asks feed/live/diffPatch for the JSON Patch operations since the last
+# timecode and applies them to the copy held in memory, so a poll with nothing new costs a few
+# bytes. The win probability is recomputed only when the score, the inning or the game state
+# changes. Rows go to slates/live-<date>.json, which the Daily Matchups page re-reads every
+# PAGE_REFRESH seconds; with MLB_LIVE_INPROCESS=1 the app runs the tracker itself and reads it
+# from memory. benchmarks/stub_statsapi.py serves synthetic or recorded feeds on the same
+# endpoints for offline runs (benchmarks/bench_live_games.py).
+
+DEFAULT_POLL = 10  # seconds, when the feed does not say (metaData.wait)
+PREVIEW_POLL = 60  # seconds between polls before first pitch
+IDLE_SECONDS = 600  # in-process tracker: pause before retrying a slate that failed to start
+MAX_FAILURES = 10  # consecutive failed polls before a game is dropped from the slate
+FLUSH_SECONDS = 2.0  # at most one artifact write per this many seconds
+LIVE_MAX_AGE = 120  # seconds before an artifact from a stopped tracker is ignored
+PAGE_REFRESH = 15  # seconds between reruns of the page's live table
+MAX_CONNECTIONS = 16
+FEED_TIMEOUT = 10  # seconds
+
+# In-game model: each side scores Poisson(RUNS_PER_HALF * e^{±strength}) runs per half-inning,
+# with the strength fit so the first pitch reproduces the pregame prediction
+RUNS_PER_HALF = 0.5
+REGULATION_INNINGS = 9
+MAX_RUNS = 30  # truncation of the runs-scored distribution
+STRENGTH_LIMIT = 2.0
+
+LIVE_COLUMNS = ["Away", "Home", "Status", "Score", "Inning", "Pregame Home Win %", "Live Home Win %"]
+
+Situation = namedtuple("Situation", ["state", "home_runs", "away_runs", "inning", "inning_state"])
+
+log = logging.getLogger("live")
+
+
+def live_base():
+    # The live feed lives under /api/v1.1 next to the /api/v1 endpoints
+    base = mlb_api.STATSAPI_BASE.rstrip("/")
+    return base + ".1" if base.endswith("/v1") else base
+
+
+def feed_url(game_pk):
+    return f"{live_base()}/game/{game_pk}/feed/live"
+
+
+def diff_url(game_pk, timecode):
+    return f"{feed_url(game_pk)}/diffPatch?startTimecode={timecode}"
+
+
+# === JSON Patch ===
+def _tokens(pointer):
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer.split("/")[1:]]
+
+
+def _parent(doc, pointer):
+    tokens = _tokens(pointer)
+    node = doc
+    for token in tokens[:-1]:
+        node = node[int(token)] if isinstance(node, list) else node[token]
+    return node, tokens[-1]
+
+
+def _get(doc, pointer):
+    if pointer == "":
+        return doc
+    node, key = _parent(doc, pointer)
+    return node[int(key)] if isinstance(node, list) else node[key]
+
+
+def _put(doc, pointer, value, insert):
+    node, key = _parent(doc, pointer)
+    if not isinstance(node, list):
+        node[key] = value
+    elif key == "-":
+        node.append(value)
+    elif insert:
+        node.insert(int(key), value)
+    else:
+        node[int(key)] = value
+
+
+def _pop(doc, pointer):
+    node, key = _parent(doc, pointer)
+    return node.pop(int(key) if isinstance(node, list) else key)
+
+
+def apply_patch(doc, operations):
+    # RFC 6902 operations, applied in place; returns the document (a new one if the root was
+    # replaced). A bad path raises KeyError/IndexError/TypeError/ValueError.
+    for op in operations:
+        kind, path = op["op"], op["path"]
+        if path == "" and kind in ("add", "replace"):
+            doc = op["value"]
+        elif kind == "add":
+            _put(doc, path, op["value"], insert=True)
+        elif kind == "replace":
+            _put(doc, path, op["value"], insert=False)
+        elif kind == "remove":
+            _pop(doc, path)
+        elif kind == "copy":
+            _put(doc, path, copy.deepcopy(_get(doc, op["from"])), insert=True)
+        elif kind == "move":
+            _put(doc, path, _pop(doc, op["from"]), insert=True)
+        elif kind == "test":
+            if _get(doc, path) != op["value"]:
+                raise ValueError(f"patch test failed at {path}")
+        else:
+            raise ValueError(f"unknown patch op {kind!r}")
+    return doc
+
+
+# === Win probability ===
+def runs_pmf(rate, halves):
+    # P(k runs) over `halves` half-innings, k = 0..MAX_RUNS
+    lam = rate * halves
+    terms = np.empty(MAX_RUNS + 1)
+    terms[0] = math.exp(-lam)
+    terms[1:] = lam / np.arange(1, MAX_RUNS + 1)
+    return np.cumprod(terms)
+
+
+def run_difference(home_pmf, away_pmf):
+    # Distribution of home runs minus away runs; index MAX_RUNS is a difference of 0
+    diff = np.convolve(home_pmf, away_pmf[::-1])
+    return diff / diff.sum()
+
+
+def extra_innings_win(home_rate, away_rate):
+    # P(home wins) from a tie, playing whole innings until one ends untied
+    diff = run_difference(runs_pmf(home_rate, 1), runs_pmf(away_rate, 1))
+    return diff[MAX_RUNS + 1:].sum() / (1.0 - diff[MAX_RUNS])
+
+
+def halves_left(inning, inning_state):
+    # Half-innings (away, home) still to bat in regulation, counting the current one
+    last = max(REGULATION_INNINGS, inning)
+    away = last - inning + (inning_state == "Top")
+    home = last - inning + (inning_state in ("Top", "Middle", "Bottom"))
+    return away, home
+
+
+def win_probability(lead, away_halves, home_halves, strength=0.0):
+    # P(home wins) leading by `lead` runs with the given half-innings left
+    home_rate, away_rate = RUNS_PER_HALF * math.exp(strength), RUNS_PER_HALF * math.exp(-strength)
+    diff = run_difference(runs_pmf(home_rate, home_halves), runs_pmf(away_rate, away_halves))
+    final = np.arange(-MAX_RUNS, MAX_RUNS + 1) + lead
+    tie = diff[final == 0].sum()
+    return float(diff[final > 0].sum() + (tie * extra_innings_win(home_rate, away_rate) if tie else 0.0))
+
+
+def team_strength(prior, iterations=30):
+    # Bisection for the strength whose first-pitch win probability equals `prior`
+    prior = min(max(prior, 0.01), 0.99)
+    full = halves_left(1, "Top")
+    lo, hi = -STRENGTH_LIMIT, STRENGTH_LIMIT
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        if win_probability(0, *full, strength=mid) < prior:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def situation_probability(situation, strength):
+    lead = situation.home_runs - situation.away_runs
+    if situation.state == "Final":
+        return 0.5 if lead == 0 else float(lead > 0)
+    if situation.state != "Live":
+        return win_probability(lead, *halves_left(1, "Top"), strength=strength)
+    return win_probability(lead, *halves_left(situation.inning, situation.inning_state), strength=strength)
+
+
+def feed_situation(feed):
+    linescore = feed.get("liveData", {}).get("linescore", {})
+    teams = linescore.get("teams", {})
+    return Situation(
+        state=feed.get("gameData", {}).get("status", {}).get("abstractGameState", "Preview"),
+        home_runs=teams.get("home", {}).get("runs", 0),
+        away_runs=teams.get("away", {}).get("runs", 0),
+        inning=linescore.get("currentInning", 1),
+        inning_state=linescore.get("inningState", "Top"),
+    )
+
+
+# === Tracking ===
+class LiveGame:
+    def __init__(self, game_pk, home, away, prior):
+        self.game_pk = game_pk
+        self.home = home
+        self.away = away
+        self.prior = prior
+        self.strength = team_strength(prior)
+        self.feed = None
+        self.timecode = None
+        self.situation = None
+        self.home_win_prob = prior
+        self.recomputes = 0
+        self.updated_at = None
+        self.failures = 0  # consecutive
+        self.dropped = False
+
+    @property
+    def final(self):
+        return self.situation is not None and self.situation.state == "Final"
+
+    @property
+    def finished(self):
+        return self.final or self.dropped
+
+    def update(self, feed):
+        # True when the score, inning or state changed and the probability was recomputed
+        self.feed = feed
+        self.timecode = feed.get("metaData", {}).get("timeStamp", self.timecode)
+        situation = feed_situation(feed)
+        if situation == self.situation:
+            return False
+        self.situation = situation
+        self.home_win_prob = situation_probability(situation, self.strength)
+        self.recomputes += 1
+        self.updated_at = time.time()
+        return True
+
+    def wait_seconds(self):
+        wait = float(self.feed.get("metaData", {}).get("wait", DEFAULT_POLL)) if self.feed else DEFAULT_POLL
+        return max(wait, PREVIEW_POLL) if self.situation is None or self.situation.state == "Preview" else wait
+
+    def row(self):
+        situation = self.situation or Situation("Preview", 0, 0, 1, "Top")
+        live = situation.state == "Live"
+        return {
+            "gamePk": self.game_pk,
+            "Away": self.away,
+            "Home": self.home,
+            "Status": "Unavailable" if self.dropped else situation.state,
+            "Score": f"{situation.away_runs}-{situation.home_runs}" if situation.state != "Preview" else "",
+            "Inning": f"{situation.inning_state} {situation.inning}" if live else "",
+            "Pregame Home Win %": round(self.prior * 100, 1),
+            "Live Home Win %": round(self.home_win_prob * 100, 1),
+            "updated_at": self.updated_at,
+        }
+
+
+class LiveTracker:
+    def __init__(self, games, date=None, poll_interval=None, on_change=None, record_dir=None,
+                 max_connections=MAX_CONNECTIONS, flush_seconds=FLUSH_SECONDS):
+        # poll_interval overrides the feed's own wait hint (replays run faster than real time);
+        # on_change(tracker) runs at most every flush_seconds while rows are changing
+        self.games = list(games)
+        self.date = date
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self.record_dir = record_dir
+        self.max_connections = max_connections
+        self.flush_seconds = flush_seconds
+        self.full_fetches = 0
+        self.diff_fetches = 0
+        self.empty_diffs = 0
+        self.resyncs = 0
+        self.errors = 0
+        self.bytes = {"full": 0, "diff": 0}
+        self._dirty = False
+
+    @property
+    def done(self):
+        return all(game.finished for game in self.games)
+
+    async def run(self, session=None):
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT),
+            )
+        flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+        try:
+            # Each game handles its own errors; anything that still escapes ends that game only
+            results = await asyncio.gather(*(self._follow(session, game) for game in self.games), return_exceptions=True)
+            for game, result in zip(self.games, results):
+                if isinstance(result, Exception):
+                    game.dropped = True
+                    self._dirty = True
+                    log.error("game %s: stopped following", game.game_pk, exc_info=result)
+        finally:
+            flusher.cancel()
+            if own_session:
+                await session.close()
+            self._flush()
+        return self
+
+    async def _follow(self, session, game):
+        # A game that fails MAX_FAILURES polls in a row (a 404, a feed that stopped updating) is
+        # dropped, so the slate still finishes without it
+        while not game.finished:
+            try:
+                if game.feed is None:
+                    self._apply(game, await self._get(session, feed_url(game.game_pk), "full"))
+                else:
+                    await self._poll(session, game)
+                game.failures = 0
+            except Exception as exc:
+                self.errors += 1
+                game.failures += 1
+                log.warning("game %s: %s (%d in a row)", game.game_pk, exc, game.failures)
+                if game.failures >= MAX_FAILURES:
+                    game.dropped = True
+                    self._dirty = True
+                    log.error("game %s: dropped after %d failed polls", game.game_pk, game.failures)
+            if not game.finished:
+                await asyncio.sleep(self.poll_interval or game.wait_seconds())
+
+    async def _poll(self, session, game):
+        patches = await self._get(session, diff_url(game.game_pk, game.timecode), "diff")
+        if isinstance(patches, dict):
+            # Too far behind for a diff: the endpoint answers with the whole feed
+            self._apply(game, patches)
+        elif not patches:
+            self.empty_diffs += 1
+        else:
+            try:
+                feed = game.feed
+                for patch in patches:
+                    feed = apply_patch(feed, patch["diff"])
+            except (KeyError, IndexError, TypeError, ValueError) as exc:
+                # Our copy no longer matches the server's; start over from the full feed
+                self.resyncs += 1
+                game.feed = None
+                log.warning("game %s: resyncing after bad patch (%s)", game.game_pk, exc)
+                return
+            self._apply(game, feed)
+
+    async def _get(self, session, url, kind):
+        async with session.get(url) as response:
+            response.raise_for_status()
+            body = await response.read()
+        instrumentation.record_request(url, len(body))
+        self.bytes[kind] += len(body)
+        if kind == "full":
+            self.full_fetches += 1
+        else:
+            self.diff_fetches += 1
+        return json.loads(body)
+
+    def _apply(self, game, feed):
+        if game.update(feed):
+            self._dirty = True
+        if self.record_dir:
+            self._record(game)
+
+    def _record(self, game):
+        path = os.path.join(self.record_dir, str(game.game_pk), f"{game.timecode}.json")
+        if not os.path.exists(path):
+            slate.write_json_atomic(game.feed, path)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            self._flush()
+
+    def _flush(self):
+        if self._dirty and self.on_change is not None:
+            self._dirty = False
+            self.on_change(self)
+
+    def rows(self):
+        return [game.row() for game in self.games]
+
+    def stats(self):
+        return {
+            "games": len(self.games),
+            "final": sum(game.final for game in self.games),
+            "dropped": sum(game.dropped for game in self.games),
+            "full_fetches": self.full_fetches,
+            "diff_fetches": self.diff_fetches,
+            "empty_diffs": self.empty_diffs,
+            "resyncs": self.resyncs,
+            "errors": self.errors,
+            "bytes_full": self.bytes["full"],
+            "bytes_diff": self.bytes["diff"],
+            "recomputes": sum(game.recomputes for game in self.games),
+        }
+
+
+def slate_games(date, bundle=None):
+    # The day's games with the pregame home-win share from the slate as each game's prior
+    bundle = bundle or model_registry.get_registry().reload_if_changed()
+    built = slate.read_slate_artifact(date, bundle) or slate.build_slate(date, bundle)
+    games = []
+    for game_pk, matchup in zip(built["game_pks"], built["matchups"]):
+        prior = predictor.home_share(np.array([matchup["Home Win %"]]), np.array([matchup["Away Win %"]]))[0]
+        games.append(LiveGame(game_pk, matchup["Home"], matchup["Away"], float(prior)))
+    return games
+
+
+# === Artifacts ===
+def live_path(date, slate_dir=None):
+    return os.path.join(slate_dir or slate.SLATE_DIR, f"live-{date}.json")
+
+
+def write_live_artifact(tracker, slate_dir=None):
+    payload = {"date": str(tracker.date), "generated_at": time.time(), "rows": tracker.rows()}
+    return slate.write_json_atomic(payload, live_path(tracker.date, slate_dir))
+
+
+def read_live_artifact(date, max_age=LIVE_MAX_AGE, slate_dir=None):
+    try:
+        with open(live_path(date, slate_dir)) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - payload.get("generated_at", 0) > max_age:
+        return None
+    return payload["rows"]
+
+
+def live_frame(rows):
+    return pd.DataFrame(rows, columns=LIVE_COLUMNS)
+
+
+# === Running ===
+_tracker = None
+_thread = None
+
+
+def read_live(date):
+    # Rows for the page: the in-process tracker when it follows this date, else the artifact
+    tracker = _tracker
+    if tracker is not None and str(tracker.date) == str(date):
+        return tracker.rows()
+    return read_live_artifact(date)
+
+
+def follow(date, record_dir=None, poll_interval=None, bundle=None):
+    global _tracker
+    tracker = LiveTracker(slate_games(date, bundle), date=date, poll_interval=poll_interval,
+                          on_change=write_live_artifact, record_dir=record_dir)
+    _tracker = tracker
+    asyncio.run(tracker.run())
+    return tracker
+
+
+def seconds_until_tomorrow(now=None):
+    now = now or datetime.datetime.now()
+    return (datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time()) - now).total_seconds()
+
+
+def run_forever(stop_event=None):
+    # Follows each day's slate until every game is final or dropped, then sleeps until the date
+    # changes; the next day's games are polled at PREVIEW_POLL until first pitch. A slate that
+    # fails to start is retried after IDLE_SECONDS.
+    stop_event = stop_event or threading.Event()
+    finished = None
+    while not stop_event.is_set():
+        date = mlb_data.today()
+        if date == finished:
+            stop_event.wait(seconds_until_tomorrow() + 1)
+            continue
+        try:
+            tracker = follow(date)
+            finished = date
+            log.info("live %s: %s", date, tracker.stats())
+        except Exception:
+            log.exception("live tracker failed")
+            stop_event.wait(IDLE_SECONDS)
+
+
+def start_in_process():
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _thread = threading.Thread(target=run_forever, name="live-games", daemon=True)
+        _thread.start()
+    return _thread
+
+
+instrumentation.register_status("live_games", lambda: _tracker.stats() if _tracker else {"running": False})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow the day's games and keep live win probabilities")
+    parser.add_argument("--date", help="YYYY-MM-DD, default today")
+    parser.add_argument("--record", metavar="DIR", help="save every feed version seen as DIR/<gamePk>/<timecode>.json")
+    parser.add_argument("--poll", type=float, help="seconds between polls, instead of the feed's hint")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    date = args.date or mlb_data.today()
+    start = time.perf_counter()
+    tracker = follow(date, record_dir=args.record, poll_interval=args.poll)
+    log.info("%s: all %d games finished after %.0fs: %s", date, len(tracker.games), time.perf_counter() - start, tracker.stats())
+
+
+if __name__ == "__main__":
+    main()
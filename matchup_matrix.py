@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import mlb_data
+import predictor
+
+# Home/away win probabilities for every pairing of the 30 clubs, scored in one predict_proba
+# call from the current team snapshot (win % plus 10-game averages). Stored as dense matrices
+# indexed [home_id, away_id] by team_map id, so a matchup is an O(1) lookup and a full league
+# view needs no extra inference. A matrix is tied to one model and one snapshot: when either
+# changes, the next get_matrix() rebuilds it.
+
+MAX_MATRICES = 4  # e.g. the current season plus a few browsed past ones
+
+
+def snapshot_fingerprint(team_snapshot):
+    payload = json.dumps(team_snapshot, sort_keys=True, default=float)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class MatchupMatrix:
+    def __init__(self, home_probs, away_probs, team_map, version, build_seconds):
+        self.home_probs = home_probs
+        self.away_probs = away_probs
+        self.team_map = team_map
+        self.version = version
+        self.build_seconds = build_seconds
+        self.built_at = time.time()
+
+    def lookup(self, home_ids, away_ids):
+        # (home_probs, away_probs) for aligned id arrays; ids outside the matrix come back NaN
+        home_ids = np.asarray(home_ids, dtype=np.int64)
+        away_ids = np.asarray(away_ids, dtype=np.int64)
+        size = len(self.home_probs)
+        inside = (home_ids >= 0) & (home_ids < size) & (away_ids >= 0) & (away_ids < size)
+        home_probs = np.full(len(home_ids), np.nan)
+        away_probs = np.full(len(home_ids), np.nan)
+        home_probs[inside] = self.home_probs[home_ids[inside], away_ids[inside]]
+        away_probs[inside] = self.away_probs[home_ids[inside], away_ids[inside]]
+        return home_probs, away_probs
+
+    def score(self, games):
+        # Drop-in for predictor.score_games on a frame of "home"/"away" abbreviations
+        home_ids = games["home"].map(self.team_map).fillna(-1).astype(np.int64).to_numpy()
+        away_ids = games["away"].map(self.team_map).fillna(-1).astype(np.int64).to_numpy()
+        home_probs, away_probs = self.lookup(home_ids, away_ids)
+        home_wins, margin, available = predictor.summarize(home_probs, away_probs)
+        winner = np.where(home_wins, games["home"].to_numpy(), games["away"].to_numpy())
+        return pd.DataFrame({
+            "home_win_prob": home_probs,
+            "away_win_prob": away_probs,
+            "predicted_winner": np.where(available, winner, "Unavailable"),
+            "confidence": np.where(available, margin, 0.0),
+        }, index=games.index)
+
+    def head_to_head(self, teams):
+        # Home win share (predictor.home_share) for each listed team at home (rows) vs away (columns)
+        ids = [self.team_map[t] for t in teams]
+        share = predictor.home_share(self.home_probs[np.ix_(ids, ids)], self.away_probs[np.ix_(ids, ids)])
+        np.fill_diagonal(share, np.nan)
+        return pd.DataFrame(share, index=teams, columns=teams)
+
+
+@instrumentation.timed("matchup_matrix_build")
+def build_matrix(clf, team_map, team_snapshot, version=None):
+    # Every ordered pair of clubs, the diagonal included so any selection has an entry
+    teams = [abbr for abbr in mlb_data.mlb_team_ids if abbr in team_map]
+    start = time.perf_counter()
+    games = pd.DataFrame({
+        "home": np.repeat(teams, len(teams)),
+        "away": np.tile(teams, len(teams)),
+    }, dtype=object)
+    scored = predictor.score_games(clf, games, team_map, team_snapshot)
+
+    size = max(team_map.values()) + 1
+    home_probs = np.full((size, size), np.nan, dtype=np.float32)
+    away_probs = np.full((size, size), np.nan, dtype=np.float32)
+    home_ids = games["home"].map(team_map).to_numpy(np.int64)
+    away_ids = games["away"].map(team_map).to_numpy(np.int64)
+    home_probs[home_ids, away_ids] = scored["home_win_prob"].to_numpy()
+    away_probs[home_ids, away_ids] = scored["away_win_prob"].to_numpy()
+    return MatchupMatrix(home_probs, away_probs, team_map, version, time.perf_counter() - start)
+
+
+class MatrixCache:
+    # The most recently used matrices by (model files, snapshot content); a new model or a changed
+    # snapshot is a new key, so stale matrices simply age out
+    def __init__(self, max_entries=MAX_MATRICES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._matrices = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, bundle, team_snapshot):
+        version = (repr(bundle.mtimes), snapshot_fingerprint(team_snapshot))
+        with self._lock:
+            matrix = self._matrices.get(version)
+            if matrix is not None:
+                self.hits += 1
+                self._matrices.move_to_end(version)
+                return matrix
+            self.misses += 1
+            matrix = build_matrix(bundle.clf, bundle.team_map, team_snapshot, version)
+            self._matrices[version] = matrix
+            while len(self._matrices) > self.max_entries:
+                self._matrices.popitem(last=False)
+            return matrix
+
+    def clear(self):
+        with self._lock:
+            self._matrices.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+matrix_cache = MatrixCache()
+instrumentation.register_cache("matchup_matrix", matrix_cache.stats)
+
+
+def get_matrix(bundle, team_snapshot=None, season=mlb_data.SEASON):
+    if team_snapshot is None:
+        team_snapshot = mlb_data.get_team_snapshot(season)
+    return matrix_cache.get(bundle, team_snapshot)
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_cache
+import instrumentation
+import replay
+
+# === HTTP settings ===
+STATSAPI_BASE = os.environ.get("MLB_STATSAPI_BASE", "https://statsapi.mlb.com/api/v1")
+REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+MAX_WORKERS = 16
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # One pooled session per process, sized so every worker thread gets a keep-alive connection
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = replay.make_adapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def reset_session():
+    # Drop the pooled session; the next get_session() mounts a fresh adapter (e.g. after replay.configure)
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+class RateLimiter:
+    # Token bucket shared by worker threads: at most `rate` requests per second on average,
+    # with bursts of up to `burst`
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def statsapi_url(path):
+    return f"{STATSAPI_BASE}/{path.lstrip('/')}"
+
+
+def get_json(url, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, limiter=None, cache=True):
+    # Schedule, standings and boxscore responses go through the shared cross-process cache;
+    # bulk jobs that persist what they fetch pass cache=False
+    ttl = http_cache.ttl_for(url)
+    if cache and ttl is not None and http_cache.ENABLED:
+        return http_cache.get_cache().get_json(url, ttl, lambda: fetch_json(url, timeout, retries, backoff, limiter))
+    return fetch_json(url, timeout, retries, backoff, limiter)
+
+
+def fetch_json(url, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, limiter=None):
+    session = get_session()
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            response = session.get(url, timeout=timeout)
+            instrumentation.record_request(url, len(response.content))
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                time.sleep(backoff * (2 ** attempt))
+                continue
+            response.raise_for_status()
+            return response.json()
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+
+
+def get_json_many(urls, max_workers=MAX_WORKERS, **kwargs):
+    # Fetch every url concurrently; failed requests map to None so one bad game doesn't sink a page
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+
+    def fetch(url):
+        try:
+            return get_json(url, **kwargs)
+        except (requests.RequestException, ValueError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return dict(zip(urls, pool.map(fetch, urls)))
@@ -0,0 +1,236 @@
+import datetime
+import os
+import threading
+import time
+
+import boxscore_store
+import instrumentation
+import mlb_api
+from rolling_features import RollingFeatureEngine
+from schedule_index import ScheduleIndex
+
+SEASON = int(os.environ.get("MLB_SEASON", "2025"))  # default season; every accessor takes a season
+ROLLING_GAMES = 10
+SCHEDULE_TTL = 900  # seconds
+STANDINGS_TTL = 900  # seconds
+
+# Only the fields the schedule index reads, to keep the league-wide payload small
+SCHEDULE_FIELDS = (
+    "dates,date,games,gamePk,gameDate,officialDate,status,abstractGameState,"
+    "teams,home,away,team,id,score"
+)
+
+
+mlb_team_ids = {
+    "ARI": 109, "ATL": 144, "BAL": 110, "BOS": 111, "CHC": 112,
+    "CIN": 113, "CLE": 114, "COL": 115, "CHW": 145, "DET": 116,
+    "HOU": 117, "KC": 118, "LAA": 108, "LAD": 119, "MIA": 146,
+    "MIL": 158, "MIN": 142, "NYM": 121, "NYY": 147, "OAK": 133,
+    "PHI": 143, "PIT": 134, "SD": 135, "SEA": 136, "SF": 137,
+    "STL": 138, "TB": 139, "TEX": 140, "TOR": 141, "WSH": 120
+}
+id_to_abbr = {v: k for k, v in mlb_team_ids.items()}
+
+divisions = {
+    "AL East": ["BAL", "BOS", "NYY", "TB", "TOR"],
+    "AL Central": ["CHW", "CLE", "DET", "KC", "MIN"],
+    "AL West": ["HOU", "LAA", "OAK", "SEA", "TEX"],
+    "NL East": ["ATL", "MIA", "NYM", "PHI", "WSH"],
+    "NL Central": ["CHC", "CIN", "MIL", "PIT", "STL"],
+    "NL West": ["ARI", "COL", "LAD", "SD", "SF"],
+}
+
+
+def season_of(date):
+    return int(str(date)[:4])
+
+
+def today():
+    # MLB_TODAY=YYYY-MM-DD pins the clock, so replayed fixtures keep matching their urls
+    pinned = os.environ.get("MLB_TODAY")
+    return datetime.date.fromisoformat(pinned) if pinned else datetime.date.today()
+
+
+# === URLs ===
+def season_dates(season, start_date=None, end_date=None):
+    # (start, end) clamped to the calendar season; start > end means the range is empty
+    first, last = datetime.date(season, 1, 1), datetime.date(season, 12, 31)
+    return max(start_date or first, first), min(end_date or last, last)
+
+
+def league_schedule_url(season=SEASON, end_date=None, start_date=None):
+    # Defaults to the season so far; a season that has not started yet gets an empty one-day range
+    start_date, end_date = season_dates(season, start_date, end_date or today())
+    end_date = max(end_date, start_date)
+    return mlb_api.statsapi_url(
+        f"schedule?sportId=1&gameType=R&startDate={start_date}&endDate={end_date}"
+        f"&fields={SCHEDULE_FIELDS}"
+    )
+
+
+def standings_url(season=SEASON):
+    return mlb_api.statsapi_url(f"standings?season={season}&leagueId=103,104&standingsTypes=regularSeason")
+
+
+def boxscore_url(game_pk):
+    return mlb_api.statsapi_url(f"game/{game_pk}/boxscore")
+
+
+# === Parsing ===
+def extract_game_stats(box_data):
+    rows = []
+    teams = box_data.get("teams", {})
+    for side in ["home", "away"]:
+        team = teams.get(side, {}).get("team", {})
+        if "id" not in team:
+            continue
+        stats = teams[side].get("teamStats", {})
+        batting_stats = stats.get("batting", {})
+        pitching_stats = stats.get("pitching", {})
+        # None when the boxscore doesn't report a stat, so it is skipped rather than averaged as 0
+        rows.append((team["id"], {
+            "total_bases": batting_stats.get("totalBases"),
+            "walks_issued": pitching_stats.get("baseOnBalls"),
+            "strikeouts_thrown": pitching_stats.get("strikeOuts"),
+        }))
+    return rows
+
+
+def extract_team_game_stats(box_data, team_id):
+    for row_team_id, stats in extract_game_stats(box_data):
+        if row_team_id == team_id:
+            return stats
+    return None
+
+
+# === Snapshots ===
+class SnapshotCache:
+    # Process-wide TTL cache for whole-league payloads. The lock is held while loading, so
+    # concurrent callers on a miss wait for one download instead of each starting their own.
+    def __init__(self, loader, max_age):
+        self.loader = loader
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.max_age:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            value = self.loader(key)
+            self._entries[key] = (time.time(), value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def load_schedule_index(season):
+    return ScheduleIndex.from_schedule(mlb_api.get_json(league_schedule_url(season)))
+
+
+def load_standings(season):
+    # team_id -> (wins, losses)
+    standings_data = mlb_api.get_json(standings_url(season))
+    records = {}
+    for record in standings_data.get("records", []):
+        for team_record in record.get("teamRecords", []):
+            team_id = team_record.get("team", {}).get("id")
+            records[team_id] = (team_record.get("wins", 0), team_record.get("losses", 0))
+    return records
+
+
+schedule_snapshots = SnapshotCache(load_schedule_index, SCHEDULE_TTL)
+standings_snapshots = SnapshotCache(load_standings, STANDINGS_TTL)
+instrumentation.register_cache("schedule_snapshot", schedule_snapshots.stats)
+instrumentation.register_cache("standings_snapshot", standings_snapshots.stats)
+
+
+def get_schedule_index(season=SEASON):
+    return schedule_snapshots.get(season)
+
+
+def get_standings(season=SEASON):
+    return standings_snapshots.get(season)
+
+
+def get_win_percentages(season=SEASON):
+    return {
+        team_id: round(wins / (wins + losses), 3)
+        for team_id, (wins, losses) in get_standings(season).items() if wins + losses > 0
+    }
+
+
+@instrumentation.timed("get_team_win_pct")
+def get_team_win_pct(team_id, season=SEASON):
+    return get_win_percentages(season).get(team_id, 0.5)
+
+
+# === Rolling stats ===
+def get_last_10_game_stats(team_id, season=SEASON):
+    return get_last_10_game_stats_many([team_id], season=season).get(team_id)
+
+
+@instrumentation.timed("get_last_10_game_stats")
+def get_last_10_game_stats_many(team_ids, store=None, schedule_index=None, window=ROLLING_GAMES, season=SEASON):
+    # Recent Finals come from the shared league schedule index; only boxscores the local
+    # store hasn't seen are downloaded. Both teams' lines are stored from each boxscore.
+    # For a past season these are the last games of that season.
+    store = store or boxscore_store.get_store()
+    schedule_index = schedule_index or get_schedule_index(season)
+
+    team_games = {
+        team_id: schedule_index.recent_final_game_pks(team_id, window)
+        for team_id in team_ids
+    }
+
+    sync_boxscores(store, [pk for pks in team_games.values() for pk in pks])
+
+    # Same rolling engine training uses; games go in oldest first
+    engine = RollingFeatureEngine(window=window)
+    results = {}
+    for team_id, pks in team_games.items():
+        for stats in reversed(store.team_game_stats(team_id, pks)):
+            engine.ingest(team_id, stats)
+        averages = engine.averages(team_id)
+        results[team_id] = {k: round(v, 2) for k, v in averages.items()} if averages else None
+    return results
+
+
+def sync_boxscores(store, game_pks, **fetch_kwargs):
+    # fetch_kwargs go to mlb_api.get_json_many (max_workers, limiter, ...)
+    missing = store.missing_game_pks(game_pks)
+    requested = len(set(game_pks))
+    instrumentation.record_cache("boxscore_store", hits=requested - len(missing), misses=len(missing))
+    boxscores = mlb_api.get_json_many([boxscore_url(pk) for pk in missing], **fetch_kwargs)
+
+    rows = []
+    with instrumentation.timed("boxscore_parse"):
+        for game_pk in missing:
+            box_data = boxscores.get(boxscore_url(game_pk))
+            if box_data is None:
+                continue
+            rows.extend((game_pk, team_id, stats) for team_id, stats in extract_game_stats(box_data))
+    store.save_game_stats(rows)
+    return len(missing)
+
+
+def get_team_snapshot(season=SEASON):
+    # Current inputs for every club, keyed by abbreviation: win_pct plus the 10-game averages
+    # (None when no rolling stats are available yet)
+    all_stats = get_last_10_game_stats_many(mlb_team_ids.values(), season=season)
+    win_pcts = get_win_percentages(season)
+    snapshot = {}
+    for abbr, team_id in mlb_team_ids.items():
+        stats = all_stats.get(team_id)
+        snapshot[abbr] = dict(stats, win_pct=win_pcts.get(team_id, 0.5)) if stats else None
+    return snapshot
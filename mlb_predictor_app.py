@@ -1,78 +1,114 @@
 #Newest With Sliders
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import joblib
-import feedparser
-import requests
 import datetime
+import os
+import time
 import matplotlib.pyplot as plt
 
+import feeds
+import instrumentation
+import live_games
+import matchup_matrix
+import mlb_api
+import mlb_data
+from mlb_data import mlb_team_ids
+import model_registry
+import predictor
+import prefetch_worker
+import season_sim
+import slate
+
+rerun_started = time.perf_counter()
+
 # === Load model and mappings ===
-clf = joblib.load("xgb_model_updated.pkl")
-team_map = joblib.load("team_map_updated.pkl")
-reverse_map = joblib.load("reverse_map_updated.pkl")
+# Loaded once per process; a retrained artifact dropped in place is picked up on the next rerun
+@st.cache_resource
+def get_model_registry():
+    return model_registry.get_registry()
+
+model_bundle = get_model_registry().reload_if_changed()
+
+# Single-process deployments can keep the daily slate warm from inside the app
+@st.cache_resource
+def start_prefetch():
+    return prefetch_worker.start_in_process()
+
+if os.environ.get("MLB_INPROCESS_PREFETCH") == "1":
+    start_prefetch()
+
+# Live win probabilities: followed here, or by a separate `python live_games.py` writing the artifact
+@st.cache_resource
+def start_live_tracker():
+    return live_games.start_in_process()
+
+if os.environ.get("MLB_LIVE_INPROCESS") == "1":
+    start_live_tracker()
+clf = model_bundle.clf
+team_map = model_bundle.team_map
+reverse_map = model_bundle.reverse_map
 
 # === Load API data ===
 @st.cache_data(ttl=3600)
-def get_last_10_game_stats(team_id):
-    schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?teamId={team_id}&season=2025&sportId=1&gameType=R"
-    schedule_data = requests.get(schedule_url).json()
-
-    games = []
-    for date in schedule_data.get("dates", []):
-        for game in date.get("games", []):
-            if game["status"]["abstractGameState"] == "Final":
-                games.append(game["gamePk"])
-
-    games = sorted(games, reverse=True)[:10]
-
-    total_bases_list = []
-    walks_issued_list = []
-    strikeouts_thrown_list = []
-
-    for game_pk in games:
-        boxscore_url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
-        box_data = requests.get(boxscore_url).json()
-
-        teams = box_data.get("teams", {})
-        for side in ["home", "away"]:
-            team = teams[side].get("team", {})
-            if team["id"] == team_id:
-                stats = teams[side].get("teamStats", {})
-                batting_stats = stats.get("batting", {})
-                pitching_stats = stats.get("pitching", {})
-
-                total_bases = batting_stats.get("totalBases", 0)
-                walks_issued = pitching_stats.get("baseOnBalls", 0)
-                strikeouts_thrown = pitching_stats.get("strikeOuts", 0)
-
-                total_bases_list.append(total_bases)
-                walks_issued_list.append(walks_issued)
-                strikeouts_thrown_list.append(strikeouts_thrown)
-                break
-
-    if len(total_bases_list) == 0:
-        return None
-
-    return {
-        "total_bases": round(sum(total_bases_list) / len(total_bases_list), 2),
-        "walks_issued": round(sum(walks_issued_list) / len(walks_issued_list), 2),
-        "strikeouts_thrown": round(sum(strikeouts_thrown_list) / len(strikeouts_thrown_list), 2)
-    }
+def get_last_10_game_stats_many(team_ids, season):
+    return mlb_data.get_last_10_game_stats_many(team_ids, season=season)
+
+def get_team_win_pct(team_abbr, season):
+    return mlb_data.get_team_win_pct(mlb_team_ids[team_abbr], season)
+
+@st.cache_data(ttl=300)
+def get_team_snapshot(season):
+    return mlb_data.get_team_snapshot(season)
+
+# Slider label -> (feature column, sweep range)
+sweep_inputs = {
+    "Home Win %": ("home_win_pct", 0.0, 1.0),
+    "Away Win %": ("away_win_pct", 0.0, 1.0),
+    "Walks Issued (Home)": ("Walks Issued - Home", 0.0, 10.0),
+    "Walks Issued (Away)": ("Walks Issued - Away", 0.0, 10.0),
+    "Strikeouts Thrown (Home)": ("Strikeouts Thrown - Home", 0.0, 15.0),
+    "Strikeouts Thrown (Away)": ("Strikeouts Thrown - Away", 0.0, 15.0),
+    "Total Bases (Home)": ("Total Bases - Home", 0.0, 20.0),
+    "Total Bases (Away)": ("Total Bases - Away", 0.0, 20.0),
+}
+feature_index = {column: i for i, column in enumerate(predictor.FEATURE_COLUMNS)}
 
-@st.cache_data(ttl=3600)
-def get_team_win_pct(team_abbr):
-    team_id = mlb_team_ids[team_abbr]
-    standings_url = "https://statsapi.mlb.com/api/v1/standings?season=2025&leagueId=103,104&standingsTypes=regularSeason"
-    standings_data = requests.get(standings_url).json()
+# Keyed by the model version and the full input tuple, so moving back to an earlier setting is free
+@st.cache_data(max_entries=64)
+def run_sensitivity_sweep(model_version, base_row, columns, ranges, steps):
+    sweeps = [(column, np.linspace(low, high, steps)) for column, (low, high) in zip(columns, ranges)]
+    return predictor.sensitivity_sweep(clf, list(base_row), sweeps)
 
-    for record in standings_data.get("records", []):
-        for tr in record.get("teamRecords", []):
-            if tr["team"]["id"] == team_id:
-                w, l = tr["wins"], tr["losses"]
-                return round(w / (w + l), 3) if (w + l) > 0 else 0.5
-    return 0.5
+def get_matchup_matrix(season):
+    # Rescored only when the model or the snapshot's content changes
+    return matchup_matrix.get_matrix(model_bundle, get_team_snapshot(season))
+
+@st.cache_data(ttl=3600)
+def project_season(season, n_sims, model_version):
+    return season_sim.project_season(season, bundle=model_bundle, n_sims=n_sims)
+
+# Switching the view or the selected matchup reruns the page without refetching the schedule or
+# rescoring. A prefetched artifact is memoized on its generated_at and model version; a slate
+# built live on (date, model + stats version), so new stats or a new model are a new key.
+@st.cache_data(ttl=slate.SLATE_MAX_AGE, max_entries=8)
+def prefetched_slate(date, generated_at, model_version, _daily_slate):
+    return _daily_slate, slate.matchups_frame(_daily_slate)
+
+@st.cache_data(ttl=slate.SLATE_MAX_AGE, max_entries=8)
+def live_slate(date, version):
+    daily_slate = slate.build_slate(date, model_bundle, get_team_snapshot(mlb_data.season_of(date)))
+    return daily_slate, slate.matchups_frame(daily_slate)
+
+def get_daily_slate(date):
+    # Serve the slate the prefetch worker prepared without touching the API; only without a fresh
+    # one is the team snapshot taken and the slate built live
+    daily_slate = slate.read_slate_artifact(date, model_bundle)
+    if daily_slate is not None:
+        return prefetched_slate(date, daily_slate["generated_at"], daily_slate["model_version"], daily_slate)
+    version = slate.slate_version(model_bundle, get_team_snapshot(mlb_data.season_of(date)))
+    return live_slate(date, version)
 
 
 # === Team logos map ===
@@ -112,20 +148,32 @@ team_logos = {
 
 
 
-mlb_team_ids = {
-    "ARI": 109, "ATL": 144, "BAL": 110, "BOS": 111, "CHC": 112,
-    "CIN": 113, "CLE": 114, "COL": 115, "CHW": 145, "DET": 116,
-    "HOU": 117, "KC": 118, "LAA": 108, "LAD": 119, "MIA": 146,
-    "MIL": 158, "MIN": 142, "NYM": 121, "NYY": 147, "OAK": 133,
-    "PHI": 143, "PIT": 134, "SD": 135, "SEA": 136, "SF": 137,
-    "STL": 138, "TB": 139, "TEX": 140, "TOR": 141, "WSH": 120
+
+team_name_map = {
+    "ARI": "dbacks", "ATL": "braves", "BAL": "orioles", "BOS": "redsox",
+    "CHC": "cubs", "CIN": "reds", "CLE": "guardians", "COL": "rockies",
+    "CHW": "whitesox", "DET": "tigers", "HOU": "astros", "KC": "royals",
+    "LAA": "angels", "LAD": "dodgers", "MIA": "marlins", "MIL": "brewers",
+    "MIN": "twins", "NYM": "mets", "NYY": "yankees", "OAK": "athletics",
+    "PHI": "phillies", "PIT": "pirates", "SD": "padres", "SEA": "mariners",
+    "SF": "giants", "STL": "cardinals", "TB": "rays", "TEX": "rangers",
+    "TOR": "bluejays", "WSH": "nationals"
 }
-id_to_abbr = {v: k for k, v in mlb_team_ids.items()}
+
+def team_news_url(team_abbr):
+    team_name = team_name_map.get(team_abbr, team_abbr.lower())
+    return f"https://www.mlb.com/{team_name}/feeds/news/rss.xml"
 
 filtered_team_keys = [key for key in sorted(team_map.keys()) if key not in ("AL", "NL")]
 
 st.sidebar.title("MLB Predictor Navigation")
-page = st.sidebar.radio("Go to", ["Daily Matchups", "Single Game Prediction", "Team News Feeds", "10-Game Averages"])
+pages = ["Daily Matchups", "Single Game Prediction", "Matchup Heat Map", "Playoff Odds", "Team News Feeds", "10-Game Averages"]
+# Hidden page: open the app with ?diagnostics=1
+if st.query_params.get("diagnostics") == "1":
+    pages.append("Diagnostics")
+page = st.sidebar.radio("Go to", pages)
+# Stats pages read this season; past seasons come from the local store once backfilled
+season = st.sidebar.selectbox("Season", list(range(mlb_data.SEASON, mlb_data.SEASON - 6, -1)))
 
 # === Single Game Prediction ===
 if page == "Single Game Prediction":
@@ -167,25 +215,16 @@ if page == "Single Game Prediction":
             tb_away_slider = st.slider("Total Bases (Away)", 0.0, 20.0, 11.5, step=0.1, key="tb_away_slider")
             tb_away = st.number_input("Or type value for Total Bases (Away)", min_value=0.0, max_value=20.0, value=tb_away_slider, step=0.1, key="tb_away_input")
 
-    else:
-        # Default average stats
-        home_win_pct = 0.55
-        away_win_pct = 0.48
-        walks_home = 3.1
-        walks_away = 2.8
-        k_home = 8.9
-        k_away = 9.1
-        tb_home = 12.3
-        tb_away = 11.5
 
     # === Display Charts ===
 
     st.markdown("### 📊 Live 10-Game Stats for Selected Teams")
     with st.spinner("Fetching stats from MLB API..."):
-        home_stats = get_last_10_game_stats(mlb_team_ids[home_team])
-        away_stats = get_last_10_game_stats(mlb_team_ids[away_team])
-        home_win = get_team_win_pct(home_team)
-        away_win = get_team_win_pct(away_team)
+        pair_stats = get_last_10_game_stats_many(tuple(sorted({mlb_team_ids[home_team], mlb_team_ids[away_team]})), season)
+        home_stats = pair_stats.get(mlb_team_ids[home_team])
+        away_stats = pair_stats.get(mlb_team_ids[away_team])
+        home_win = get_team_win_pct(home_team, season)
+        away_win = get_team_win_pct(away_team, season)
 
         if home_stats and away_stats:
             display_df = pd.DataFrame({
@@ -216,24 +255,19 @@ if page == "Single Game Prediction":
             home_id = team_map[home_team]
             away_id = team_map[away_team]
 
-            input_df = pd.DataFrame([[
-                home_id, away_id,
-                home_win_pct, away_win_pct,
-                walks_home, walks_away,
-                k_home, k_away,
-                tb_home, tb_away
-            ]], columns=[
-                "home_id", "away_id",
-                "home_win_pct", "away_win_pct",
-                "Walks Issued - Home", "Walks Issued - Away",
-                "Strikeouts Thrown - Home", "Strikeouts Thrown - Away",
-                "Total Bases - Home", "Total Bases - Away"
-            ])
-
-            probs = clf.predict_proba(input_df)[0]
-            class_ids = clf.classes_.tolist()
-
-            selected = {tid: probs[class_ids.index(tid)] for tid in [home_id, away_id] if tid in class_ids}
+            if customize:
+                input_df = predictor.build_feature_frame([[
+                    home_id, away_id,
+                    home_win_pct, away_win_pct,
+                    walks_home, walks_away,
+                    k_home, k_away,
+                    tb_home, tb_away
+                ]])
+                home_probs, away_probs = predictor.predict_home_away(clf, input_df)
+            else:
+                # Live stats: every pairing is already scored in the matchup matrix
+                home_probs, away_probs = get_matchup_matrix(season).lookup([home_id], [away_id])
+            selected = {tid: p for tid, p in [(home_id, home_probs[0]), (away_id, away_probs[0])] if not np.isnan(p)}
             if not selected:
                 st.error("Neither team is in training data.")
             elif len(selected) == 1:
@@ -246,19 +280,61 @@ if page == "Single Game Prediction":
                 st.success(f"🏆 Predicted Winner: {predicted_winner}")
                 st.caption(f"📊 Confidence margin: {prob_margin:.2%}")
 
+    # === Sensitivity sweep ===
+    if customize and home_team in team_map and away_team in team_map:
+        st.markdown("#### 🔬 Sensitivity Sweep")
+        st.write("Vary one or two inputs over a grid while the other sliders stay where they are.")
+        sweep_labels = st.multiselect("Inputs to sweep (up to two)", list(sweep_inputs), default=["Home Win %"], max_selections=2)
+        sweep_steps = st.slider("Grid points per input", 5, 50, 25)
+
+        if sweep_labels:
+            base_row = (
+                team_map[home_team], team_map[away_team],
+                home_win_pct, away_win_pct,
+                walks_home, walks_away,
+                k_home, k_away,
+                tb_home, tb_away
+            )
+            sweep_columns = tuple(sweep_inputs[label][0] for label in sweep_labels)
+            sweep_ranges = tuple(sweep_inputs[label][1:] for label in sweep_labels)
+            axes = [np.linspace(low, high, sweep_steps) for low, high in sweep_ranges]
+            home_grid, away_grid = run_sensitivity_sweep(
+                repr(model_bundle.mtimes), base_row, sweep_columns, sweep_ranges, sweep_steps
+            )
+
+            with instrumentation.timed("matplotlib"):
+                if len(sweep_labels) == 1:
+                    fig, ax = plt.subplots(figsize=(8, 4))
+                    ax.plot(axes[0], home_grid, label=f"{home_team} (home)")
+                    ax.plot(axes[0], away_grid, label=f"{away_team} (away)")
+                    ax.axvline(base_row[feature_index[sweep_columns[0]]], color="grey", linestyle=":")
+                    ax.set_xlabel(sweep_labels[0])
+                    ax.set_ylabel("Win probability")
+                    ax.legend()
+                else:
+                    share = predictor.home_share(home_grid, away_grid)
+                    fig, ax = plt.subplots(figsize=(7, 6))
+                    image = ax.imshow(
+                        share.T, origin="lower", aspect="auto", cmap="RdBu_r", vmin=0.0, vmax=1.0,
+                        extent=[axes[0][0], axes[0][-1], axes[1][0], axes[1][-1]],
+                    )
+                    ax.plot(base_row[feature_index[sweep_columns[0]]], base_row[feature_index[sweep_columns[1]]], "k+", markersize=12)
+                    ax.set_xlabel(sweep_labels[0])
+                    ax.set_ylabel(sweep_labels[1])
+                    fig.colorbar(image, ax=ax, label=f"{home_team} share of win probability")
+                st.pyplot(fig)
+            st.caption(f"{home_grid.size:,} scenarios scored in one batch")
 
 
 # === Daily Matchups ===
 
 if page == "Daily Matchups":
     st.title("📅 Today's MLB Matchups & Predictions")
-    today = datetime.date.today()
-    url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={today}"
-    response = requests.get(url)
-    data = response.json()
+    today = mlb_data.today()
 
-    id_to_abbr = {v: k for k, v in mlb_team_ids.items()}
-    games = data.get("dates", [])
+    with st.spinner("Fetching today's games and stats from MLB API..."):
+        daily_slate, matchups_df = get_daily_slate(today)
+    matchups = daily_slate["matchups"]
 
     team_subreddits = {
         "NYY": "NYYankees", "BOS": "RedSox", "LAD": "Dodgers", "CHC": "CHICubs",
@@ -272,11 +348,13 @@ if page == "Daily Matchups":
         "TB": "TampaBayRays", "CWS": "whitesox"
     }
 
+    def reddit_feed_url(team_abbr):
+        return f"https://www.reddit.com/r/{team_subreddits[team_abbr]}/.rss"
+
     def display_top_reddit_post(team_abbr):
         if team_abbr in team_subreddits:
             subreddit = team_subreddits[team_abbr]
-            feed_url = f"https://www.reddit.com/r/{subreddit}/.rss"
-            feed = feedparser.parse(feed_url)
+            feed = feeds.get_feed(reddit_feed_url(team_abbr))
             st.subheader(f"📣 Reddit - Top Post from r/{subreddit}")
 
             for entry in feed.entries:
@@ -294,112 +372,33 @@ if page == "Daily Matchups":
         else:
             st.info(f"No subreddit found for {team_abbr}.")
 
-    if not games:
+    if not matchups:
         st.info("No games scheduled for today.")
     else:
-        matchups = []
-        for game in games[0]["games"]:
-            home_id_raw = game["teams"]["home"]["team"]["id"]
-            away_id_raw = game["teams"]["away"]["team"]["id"]
-            home_team = id_to_abbr.get(home_id_raw)
-            away_team = id_to_abbr.get(away_id_raw)
-
-            if home_team in team_map and away_team in team_map:
-                home_id = team_map[home_team]
-                away_id = team_map[away_team]
-            
-            # Pull live API stats
-            if home_team is not None and away_team is not None and home_team in mlb_team_ids and away_team in mlb_team_ids:
-                home_stats = get_last_10_game_stats(mlb_team_ids[home_team])
-                away_stats = get_last_10_game_stats(mlb_team_ids[away_team])
-                home_win_pct = get_team_win_pct(home_team)
-                away_win_pct = get_team_win_pct(away_team)
-            else:
-                home_stats = None
-                away_stats = None
-                home_win_pct = 0.5
-                away_win_pct = 0.5
-
-            # Use fallback if API fails
-            if home_stats and away_stats:
-                walks_home = home_stats["walks_issued"]
-                walks_away = away_stats["walks_issued"]
-                k_home = home_stats["strikeouts_thrown"]
-                k_away = away_stats["strikeouts_thrown"]
-                tb_home = home_stats["total_bases"]
-                tb_away = away_stats["total_bases"]
-            else:
-                home_win_pct = 0.50
-                away_win_pct = 0.50
-                walks_home = 3.0
-                walks_away = 3.0
-                k_home = 8.0
-                k_away = 8.0
-                tb_home = 12.0
-                tb_away = 12.0
-
-            # Create input dataframe with real or fallback values
-            input_df = pd.DataFrame([[
-                home_id, away_id,
-                home_win_pct, away_win_pct,
-                walks_home, walks_away,
-                k_home, k_away,
-                tb_home, tb_away
-            ]], columns=[
-                "home_id", "away_id",
-                "home_win_pct", "away_win_pct",
-                "Walks Issued - Home", "Walks Issued - Away",
-                "Strikeouts Thrown - Home", "Strikeouts Thrown - Away",
-                "Total Bases - Home", "Total Bases - Away"
-            ])
-
-                # Average placeholder values used for new model
-                #input_df = pd.DataFrame([[
-                 #   home_id, away_id,
-                  #  0.50, 0.50,
-                   # 3.0, 3.0,
-                    #8.0, 8.0,
-                    #12.0, 12.0
-                #]], columns=[
-               #     "home_id", "away_id",
-                #    "home_win_pct", "away_win_pct",
-                 #   "Walks Issued - Home", "Walks Issued - Away",
-                  #  "Strikeouts Thrown - Home", "Strikeouts Thrown - Away",
-                   # "Total Bases - Home", "Total Bases - Away"
-                #])
-
-            probs = clf.predict_proba(input_df)[0]
-            class_ids = clf.classes_.tolist()
-
-            selected = {tid: probs[class_ids.index(tid)] for tid in [home_id, away_id] if tid in class_ids}
-            if selected:
-                winner_id = max(selected, key=selected.get)
-                predicted = reverse_map[winner_id]
-                margin = abs(selected[home_id] - selected[away_id])
-            else:
-                predicted = "Unavailable"
-                margin = 0
-
-            matchups.append({
-                "Away": away_team,
-                "Home": home_team,
-                "Predicted Winner": predicted,
-                "Confidence": round(margin, 3),
-                "Home Win %": round(selected.get(home_id, 0) * 100, 1),
-                "Away Win %": round(selected.get(away_id, 0) * 100, 1)
-            })
+        prepared_at = datetime.datetime.fromtimestamp(daily_slate["generated_at"])
+        st.caption(f"Predictions prepared at {prepared_at:%H:%M}")
+
+        # Reruns on its own every PAGE_REFRESH seconds without rerunning the rest of the page
+        @st.fragment(run_every=live_games.PAGE_REFRESH)
+        def show_live_games():
+            live_rows = live_games.read_live(today)
+            if live_rows and any(row["Status"] != "Preview" for row in live_rows):
+                st.subheader("🔴 Live Win Probability")
+                st.dataframe(live_games.live_frame(live_rows), hide_index=True)
+
+        show_live_games()
 
         view_mode = st.radio("View Mode", ["View All Matchups", "Detailed Matchup View"], horizontal=True)
 
         if view_mode == "View All Matchups":
-            st.dataframe(pd.DataFrame(matchups))
-            df = pd.DataFrame(matchups)
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ax.bar(df["Home"] + " vs " + df["Away"], df["Confidence"], color="skyblue")
-            ax.set_ylabel("Confidence")
-            ax.set_title("Prediction Confidence for Today's Matchups")
-            ax.set_xticklabels(df["Home"] + " vs " + df["Away"], rotation=45, ha='right')
-            st.pyplot(fig)
+            st.dataframe(matchups_df)
+            with instrumentation.timed("matplotlib"):
+                fig, ax = plt.subplots(figsize=(8, 5))
+                ax.bar(matchups_df["Home"] + " vs " + matchups_df["Away"], matchups_df["Confidence"], color="skyblue")
+                ax.set_ylabel("Confidence")
+                ax.set_title("Prediction Confidence for Today's Matchups")
+                ax.set_xticklabels(matchups_df["Home"] + " vs " + matchups_df["Away"], rotation=45, ha='right')
+                st.pyplot(fig)
 
         elif view_mode == "Detailed Matchup View":
             selected_matchup = st.selectbox("Select a Matchup", matchups, format_func=lambda x: f"{x['Away']} @ {x['Home']}")
@@ -426,19 +425,7 @@ if page == "Daily Matchups":
             st.write(f"**Confidence Margin:** {selected_matchup['Confidence']}")
 
             def display_team_news(team_abbr):
-                team_name_map = {
-                    "ARI": "dbacks", "ATL": "braves", "BAL": "orioles", "BOS": "redsox",
-                    "CHC": "cubs", "CIN": "reds", "CLE": "guardians", "COL": "rockies",
-                    "CHW": "whitesox", "DET": "tigers", "HOU": "astros", "KC": "royals",
-                    "LAA": "angels", "LAD": "dodgers", "MIA": "marlins", "MIL": "brewers",
-                    "MIN": "twins", "NYM": "mets", "NYY": "yankees", "OAK": "athletics",
-                    "PHI": "phillies", "PIT": "pirates", "SD": "padres", "SEA": "mariners",
-                    "SF": "giants", "STL": "cardinals", "TB": "rays", "TEX": "rangers",
-                    "TOR": "bluejays", "WSH": "nationals"
-                }
-                team_name = team_name_map.get(team_abbr, team_abbr.lower())
-                feed_url = f"https://www.mlb.com/{team_name}/feeds/news/rss.xml"
-                feed = feedparser.parse(feed_url)
+                feed = feeds.get_feed(team_news_url(team_abbr))
                 st.subheader(f"🗞️ News for {team_abbr}")
                 if not feed.entries:
                     st.warning("No recent news found or feed unavailable.")
@@ -450,91 +437,75 @@ if page == "Daily Matchups":
                         st.caption(entry.published)
                         st.markdown("---")
 
+            # Download all four feeds at once; the display calls below then read from the cache
+            feeds.get_feeds(
+                [team_news_url(t) for t in (home_team, away_team)] +
+                [reddit_feed_url(t) for t in (home_team, away_team) if t in team_subreddits]
+            )
+
             display_team_news(selected_matchup["Home"])
             display_top_reddit_post(selected_matchup["Home"])
 
             display_team_news(selected_matchup["Away"])
             display_top_reddit_post(selected_matchup["Away"])
 
+# === Matchup Heat Map ===
+elif page == "Matchup Heat Map":
+    st.title("🗺️ League Matchup Heat Map")
+    st.write("Home team's share of the win probability for every pairing, from current 10-game stats and win %.")
+
+    with st.spinner("Scoring every matchup..."):
+        matrix = get_matchup_matrix(season)
+    heat_teams = [t for t in filtered_team_keys if t in mlb_team_ids]
+    share = matrix.head_to_head(heat_teams)
+
+    with instrumentation.timed("matplotlib"):
+        fig, ax = plt.subplots(figsize=(10, 9))
+        image = ax.imshow(share.to_numpy(), cmap="RdBu_r", vmin=0.0, vmax=1.0)
+        ax.set_xticks(range(len(heat_teams)))
+        ax.set_xticklabels(heat_teams, rotation=90)
+        ax.set_yticks(range(len(heat_teams)))
+        ax.set_yticklabels(heat_teams)
+        ax.set_xlabel("Away")
+        ax.set_ylabel("Home")
+        fig.colorbar(image, ax=ax, label="Home win share")
+        st.pyplot(fig)
+
+    with st.expander("Table"):
+        st.dataframe(share.style.format("{:.2f}", na_rep="—"), use_container_width=True)
+    built_at = datetime.datetime.fromtimestamp(matrix.built_at)
+    st.caption(f"Matrix scored at {built_at:%H:%M} in {matrix.build_seconds * 1000:.0f} ms")
+
+
+# === Playoff Odds ===
+elif page == "Playoff Odds":
+    st.title("🏁 Projected Standings & Playoff Odds")
+    st.write("Monte Carlo simulation of the remaining regular season, using the model's win probability for every game.")
+
+    n_sims = st.select_slider("Simulations", options=[1_000, 5_000, 10_000, 25_000], value=10_000)
+    with st.spinner("Simulating the rest of the season..."):
+        started = time.perf_counter()
+        odds, remaining = project_season(season, n_sims, repr(model_bundle.mtimes))
+        elapsed = time.perf_counter() - started
+
+    if not remaining:
+        st.info("No regular-season games left to simulate.")
+    for division, table in odds.groupby("Division", sort=True):
+        st.subheader(division)
+        st.dataframe(table.drop(columns="Division").set_index("Team"), use_container_width=True)
+    st.caption(f"{n_sims:,} simulations of {remaining:,} remaining games ({elapsed:.2f}s). Ties are broken at random.")
+
+
 # === 10-Game Averages ===
 elif page == "10-Game Averages":
     st.title("📊 10-Game Simple Moving Averages (Live)")
 
-    mlb_team_ids = {
-        "ARI": 109, "ATL": 144, "BAL": 110, "BOS": 111, "CHC": 112,
-        "CIN": 113, "CLE": 114, "COL": 115, "CHW": 145, "DET": 116,
-        "HOU": 117, "KC": 118, "LAA": 108, "LAD": 119, "MIA": 146,
-        "MIL": 158, "MIN": 142, "NYM": 121, "NYY": 147, "OAK": 133,
-        "PHI": 143, "PIT": 134, "SD": 135, "SEA": 136, "SF": 137,
-        "STL": 138, "TB": 139, "TEX": 140, "TOR": 141, "WSH": 120
-    }
-
-    @st.cache_data(ttl=3600)
-    def get_last_10_game_stats(team_id):
-        schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?teamId={team_id}&season=2025&sportId=1&gameType=R"
-        schedule_data = requests.get(schedule_url).json()
-
-        games = []
-        for date in schedule_data.get("dates", []):
-            for game in date.get("games", []):
-                if game["status"]["abstractGameState"] == "Final":
-                    games.append(game["gamePk"])
-
-        games = sorted(games, reverse=True)[:10]
-
-        total_bases_list = []
-        walks_issued_list = []
-        strikeouts_thrown_list = []
-
-        for game_pk in games:
-            boxscore_url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
-            box_data = requests.get(boxscore_url).json()
-
-            teams = box_data.get("teams", {})
-            for side in ["home", "away"]:
-                team = teams[side].get("team", {})
-                if team["id"] == team_id:
-                    stats = teams[side].get("teamStats", {})
-                    batting_stats = stats.get("batting", {})
-                    pitching_stats = stats.get("pitching", {})
-
-                    total_bases = batting_stats.get("totalBases", 0)
-                    walks_issued = pitching_stats.get("baseOnBalls", 0)
-                    strikeouts_thrown = pitching_stats.get("strikeOuts", 0)
-
-                    total_bases_list.append(total_bases)
-                    walks_issued_list.append(walks_issued)
-                    strikeouts_thrown_list.append(strikeouts_thrown)
-                    break
-
-        if len(total_bases_list) == 0:
-            return None
-
-        return {
-            "total_bases": round(sum(total_bases_list) / len(total_bases_list), 2),
-            "walks_issued": round(sum(walks_issued_list) / len(walks_issued_list), 2),
-            "strikeouts_thrown": round(sum(strikeouts_thrown_list) / len(strikeouts_thrown_list), 2)
-        }
-
-    def get_win_percentages():
-        standings_url = "https://statsapi.mlb.com/api/v1/standings?season=2025&leagueId=103,104&standingsTypes=regularSeason"
-        standings_data = requests.get(standings_url).json()
-        win_pct_map = {}
-        for record in standings_data.get("records", []):
-            for team_record in record.get("teamRecords", []):
-                team_id = team_record.get("team", {}).get("id")
-                wins = team_record.get("wins", 0)
-                losses = team_record.get("losses", 0)
-                total = wins + losses
-                if total > 0:
-                    win_pct_map[team_id] = round(wins / total, 3)
-        return win_pct_map
-
     with st.spinner("Fetching 10-game averages from MLB API..."):
         stats_data = {}
-        win_pct_data = get_win_percentages()
+        win_pct_data = mlb_data.get_win_percentages(season)
+        all_stats = get_last_10_game_stats_many(tuple(mlb_team_ids.values()), season)
         for abbr, team_id in mlb_team_ids.items():
-            stats = get_last_10_game_stats(team_id)
+            stats = all_stats.get(team_id)
             if stats:
                 stats["win_pct"] = win_pct_data.get(team_id, 0.5)
                 stats_data[abbr] = stats
@@ -551,6 +522,9 @@ elif page == "10-Game Averages":
         else:
             st.warning("Could not load stats from the API.")
 
+    standings_cache = mlb_data.standings_snapshots.stats()
+    st.caption(f"Standings snapshot: {standings_cache['misses']} downloads, {standings_cache['hits']} cached lookups")
+
 
 # === Live News Feeds ===
 elif page == "Team News Feeds":
@@ -565,17 +539,6 @@ elif page == "Team News Feeds":
     selected_label = st.selectbox("Choose a team or league:", custom_team_list)
     selected_team = league_abbr_map.get(selected_label, selected_label)
 
-    team_name_map = {
-        "ARI": "dbacks", "ATL": "braves", "BAL": "orioles", "BOS": "redsox",
-        "CHC": "cubs", "CIN": "reds", "CLE": "guardians", "COL": "rockies",
-        "CHW": "whitesox", "DET": "tigers", "HOU": "astros", "KC": "royals",
-        "LAA": "angels", "LAD": "dodgers", "MIA": "marlins", "MIL": "brewers",
-        "MIN": "twins", "NYM": "mets", "NYY": "yankees", "OAK": "athletics",
-        "PHI": "phillies", "PIT": "pirates", "SD": "padres", "SEA": "mariners",
-        "SF": "giants", "STL": "cardinals", "TB": "rays", "TEX": "rangers",
-        "TOR": "bluejays", "WSH": "nationals"
-    }
-
     if selected_team == "AL":
         st.subheader("📰 American League News (via ESPN)")
         rss_url = "https://www.espn.com/espn/rss/mlb/news"
@@ -583,13 +546,12 @@ elif page == "Team News Feeds":
         st.subheader("📰 National League News (via ESPN)")
         rss_url = "https://www.espn.com/espn/rss/mlb/news"
     else:
-        team_name = team_name_map.get(selected_team, selected_team.lower())
-        rss_url = f"https://www.mlb.com/{team_name}/feeds/news/rss.xml"
+        rss_url = team_news_url(selected_team)
         if selected_team in team_logos:
             st.image(team_logos[selected_team], width=150)
         st.subheader(f"Latest news about {selected_team}")
 
-    feed = feedparser.parse(rss_url)
+    feed = feeds.get_feed(rss_url)
     if not feed.entries:
         st.warning("No recent news found or feed unavailable.")
     else:
@@ -609,11 +571,10 @@ elif page == "Team News Feeds":
         st.subheader("📅 Upcoming Schedule")
         team_id = mlb_team_ids.get(selected_team)
         if team_id:
-            today = datetime.date.today()
+            today = mlb_data.today()
             end = today + datetime.timedelta(days=14)
-            url = f"https://statsapi.mlb.com/api/v1/schedule?teamId={team_id}&sportId=1&startDate={today}&endDate={end}"
-            response = requests.get(url)
-            data = response.json()
+            url = mlb_api.statsapi_url(f"schedule?teamId={team_id}&sportId=1&startDate={today}&endDate={end}")
+            data = mlb_api.get_json(url)
 
             games = data.get("dates", [])
             if not games:
@@ -631,9 +592,49 @@ elif page == "Team News Feeds":
             st.error("Team ID not found for schedule lookup.")
     else:
         st.info("Schedule not available for league-wide selections.")
+
+# === Diagnostics ===
+elif page == "Diagnostics":
+    st.title("🩺 Diagnostics")
+    metrics = instrumentation.snapshot()
+
+    st.subheader("Stage timings")
+    if metrics["timings"]:
+        st.dataframe(pd.DataFrame.from_dict(metrics["timings"], orient="index").sort_values("total_seconds", ascending=False))
+    else:
+        st.info("No timings recorded yet in this process.")
+
+    st.subheader("Outbound requests")
+    if metrics["requests"]:
+        st.dataframe(pd.DataFrame.from_dict(metrics["requests"], orient="index").sort_values("count", ascending=False))
+    else:
+        st.info("No outbound requests yet in this process.")
+
+    st.subheader("Caches")
+    st.dataframe(pd.DataFrame.from_dict(metrics["caches"], orient="index"))
+
+    if metrics["status"]:
+        st.subheader("Background tasks")
+        st.json(metrics["status"])
+
+    st.subheader("Model")
+    st.json(get_model_registry().stats())
+
+    with st.expander("Prometheus text"):
+        st.code(instrumentation.to_prometheus(), language="text")
+    if st.button("Write JSON metrics log line"):
+        st.code(instrumentation.log_json(os.environ.get("MLB_METRICS_LOG", "metrics.jsonl")), language="json")
+
 # === Footer ===
 st.markdown("---")
 version = "v5.0 - Live Data"
 last_updated = "2025-05-15"
 st.caption(f"🔢 App Version: **{version}**  |  🕒 Last Updated: {last_updated}")
+render_seconds = time.perf_counter() - rerun_started
+instrumentation.record_timing(f"page:{page}", render_seconds)
+st.caption(
+    f"⏱️ Rendered in {render_seconds * 1000:.0f} ms  |  "
+    f"Model loaded in {model_bundle.load_seconds * 1000:.0f} ms "
+    f"({model_bundle.file_bytes / 1e6:.1f} MB on disk)"
+)
 
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+import numpy as np
+
+import predictor
+import tree_model
+
+# Prefer the compiled artifact (tree_model.py), which loads and scores without importing xgboost
+MODEL_PATH = os.environ.get("MLB_MODEL_PATH") or next(
+    (p for p in ("xgb_model_updated.npz", "xgb_model_updated.pkl") if os.path.exists(p)), "xgb_model_updated.pkl"
+)
+TEAM_MAP_PATH = os.environ.get("MLB_TEAM_MAP_PATH", "team_map_updated.pkl")
+REVERSE_MAP_PATH = os.environ.get("MLB_REVERSE_MAP_PATH", "reverse_map_updated.pkl")
+
+ModelBundle = namedtuple("ModelBundle", [
+    "clf", "team_map", "reverse_map",
+    "model_path", "mtimes", "load_seconds", "warmup_seconds", "memory_bytes", "file_bytes", "loaded_at",
+])
+
+
+def _rss_bytes():
+    # Current resident set size; linux only, None elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _mtimes(paths):
+    return tuple(os.path.getmtime(p) for p in paths)
+
+
+def warm_up(clf):
+    # First predict_proba pays for lazy booster setup; do it at load time, not on a user's click
+    start = time.perf_counter()
+    dummy = predictor.build_feature_frame([[0, 1, 0.5, 0.5, 3.0, 3.0, 8.0, 8.0, 12.0, 12.0]])
+    predictor.predict_home_away(clf, dummy)
+    return time.perf_counter() - start
+
+
+def load_model(path):
+    if path.endswith(".npz"):
+        return tree_model.load(path)
+    return joblib.load(path)
+
+
+def load_bundle(model_path=MODEL_PATH, team_map_path=TEAM_MAP_PATH, reverse_map_path=REVERSE_MAP_PATH, warm=True):
+    paths = (model_path, team_map_path, reverse_map_path)
+    mtimes = _mtimes(paths)
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    clf = load_model(model_path)
+    team_map = joblib.load(team_map_path)
+    reverse_map = joblib.load(reverse_map_path)
+    load_seconds = time.perf_counter() - start
+    rss_after = _rss_bytes()
+
+    warmup_seconds = warm_up(clf) if warm else None
+    memory_bytes = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+    return ModelBundle(
+        clf=clf, team_map=team_map, reverse_map=reverse_map,
+        model_path=model_path, mtimes=mtimes,
+        load_seconds=load_seconds, warmup_seconds=warmup_seconds,
+        memory_bytes=memory_bytes, file_bytes=sum(os.path.getsize(p) for p in paths),
+        loaded_at=time.time(),
+    )
+
+
+class ModelRegistry:
+    # Holds the live ModelBundle for the process. Readers grab one bundle per request, so a hot
+    # swap never mixes an old model with new mappings mid-render.
+    def __init__(self, model_path=MODEL_PATH, team_map_path=TEAM_MAP_PATH, reverse_map_path=REVERSE_MAP_PATH, warm=True):
+        self.paths = (model_path, team_map_path, reverse_map_path)
+        self.warm = warm
+        self._bundle = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def current(self):
+        if self._bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = load_bundle(*self.paths, warm=self.warm)
+        return self._bundle
+
+    def reload(self, model_path=None, team_map_path=None, reverse_map_path=None):
+        # Load the new artifact fully before swapping, so callers keep serving the old one meanwhile
+        paths = (
+            model_path or self.paths[0],
+            team_map_path or self.paths[1],
+            reverse_map_path or self.paths[2],
+        )
+        bundle = load_bundle(*paths, warm=self.warm)
+        with self._lock:
+            self.paths = paths
+            self._bundle = bundle
+        return bundle
+
+    def _changed(self):
+        try:
+            return _mtimes(self.paths) != self.current().mtimes
+        except OSError:
+            # Artifact is mid-write or was removed; keep serving what we have
+            return False
+
+    def reload_if_changed(self):
+        if not self._changed():
+            return self.current()
+        # Sessions that spot the change together wait for one reload instead of each doing it
+        with self._reload_lock:
+            if self._changed():
+                return self.reload()
+        return self.current()
+
+    def stats(self):
+        bundle = self._bundle
+        if bundle is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "model_path": bundle.model_path,
+            "load_seconds": round(bundle.load_seconds, 4),
+            "warmup_seconds": round(bundle.warmup_seconds, 4) if bundle.warmup_seconds is not None else None,
+            "memory_bytes": bundle.memory_bytes,
+            "file_bytes": bundle.file_bytes,
+            "n_classes": int(np.size(getattr(bundle.clf, "classes_", []))),
+            "objective": "home-win" if predictor.is_home_win_model(bundle.clf) else "team-id",
+            "compiled": isinstance(bundle.clf, tree_model.CompiledModel),
+            "loaded_at": bundle.loaded_at,
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,144 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import model_registry
+import predictor
+
+# Headless batch scoring:
+#   python predict_cli.py games.csv predictions.csv
+#   python predict_cli.py seasons.parquet predictions.parquet --workers 4 --stats fallback
+# Input needs home and away team abbreviations (plus any other columns, e.g. date, which are
+# passed through). If the file also carries the model's stat columns they are used directly.
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+# === Reading / writing in chunks ===
+def is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def read_chunks(path, chunksize):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, df):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# === Scoring ===
+# Module globals so each pool worker loads the model once in its initializer
+_bundle = None
+_team_snapshot = None
+
+
+def init_worker(model_paths, team_snapshot, single_threaded=False):
+    global _bundle, _team_snapshot
+    _bundle = model_registry.load_bundle(*model_paths)
+    _team_snapshot = team_snapshot
+    if single_threaded and hasattr(_bundle.clf, "set_params"):
+        # Parallelism comes from the pool; one booster thread per worker avoids oversubscription.
+        # A compiled .npz model is plain NumPy and has no thread setting.
+        _bundle.clf.set_params(n_jobs=1)
+
+
+def score_chunk(chunk):
+    games = chunk.copy()
+    games["home"] = games["home"].astype(str).str.upper()
+    games["away"] = games["away"].astype(str).str.upper()
+    scored = predictor.score_games(_bundle.clf, games, _bundle.team_map, _team_snapshot)
+    return pd.concat([chunk, scored], axis=1)
+
+
+def scored_chunks(chunks, workers, model_paths, team_snapshot):
+    if workers <= 1:
+        init_worker(model_paths, team_snapshot)
+        for chunk in chunks:
+            yield score_chunk(chunk)
+        return
+
+    # Keep only a few chunks in flight so memory stays bounded however big the input is,
+    # and yield results in input order
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(model_paths, team_snapshot, True)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_team_snapshot(mode):
+    if mode == "live":
+        import mlb_data
+        return mlb_data.get_team_snapshot()
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a file of MLB games with the pretrained model")
+    parser.add_argument("input", help="CSV or Parquet with home and away team abbreviations")
+    parser.add_argument("output", help="CSV or Parquet path for predictions")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=1, help="processes to split chunks across")
+    parser.add_argument("--stats", choices=["live", "fallback"], default="live",
+                        help="where stat features come from when the input has no stat columns")
+    parser.add_argument("--model", default=model_registry.MODEL_PATH)
+    parser.add_argument("--team-map", default=model_registry.TEAM_MAP_PATH)
+    parser.add_argument("--reverse-map", default=model_registry.REVERSE_MAP_PATH)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        os.remove(args.output)
+
+    start = time.perf_counter()
+    team_snapshot = load_team_snapshot(args.stats)
+    model_paths = (args.model, args.team_map, args.reverse_map)
+
+    writer = ChunkWriter(args.output)
+    rows = 0
+    try:
+        for scored in scored_chunks(read_chunks(args.input, args.chunksize), args.workers, model_paths, team_snapshot):
+            writer.write(scored)
+            rows += len(scored)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows:,} games in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} games/s) -> {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
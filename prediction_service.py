@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import datetime
+import math
+
+import pandas as pd
+from aiohttp import web
+
+import instrumentation
+import mlb_data
+import model_registry
+import predictor
+import slate
+
+# HTTP prediction API over the same feature building and probability extraction as the app:
+#   python prediction_service.py --port 8080
+#   POST /predict        {"home": "NYY", "away": "BOS"}
+#   POST /predict/batch  {"games": [{"home": "NYY", "away": "BOS"}, ...]}
+#   GET  /slate          today's slate (?date=YYYY-MM-DD for another day)
+#   GET  /health
+#   GET  /metrics        Prometheus text from instrumentation.py
+# Every request checks the model artifact's mtimes (model_registry), so a newly published model
+# is served without a restart.
+# Single-game requests go through a micro-batching queue: requests that arrive within a few
+# milliseconds of each other are scored together with one predict_proba call.
+
+MAX_BATCH = 256
+MAX_WAIT = 0.005  # seconds a single request may wait for others to join its batch
+SNAPSHOT_TTL = 900  # seconds
+
+STAT_COLUMNS = [c for pair in predictor.STAT_FEATURES.values() for c in pair]
+
+
+def has_stats(game):
+    return all(c in game for c in STAT_COLUMNS)
+
+
+def games_frame(games):
+    # Games either all carry the model's stat columns or all take them from the snapshot
+    for game in games:
+        if not isinstance(game, dict) or "home" not in game or "away" not in game:
+            raise ValueError("every game needs 'home' and 'away'")
+    columns = ["home", "away"] + (STAT_COLUMNS if games and all(has_stats(g) for g in games) else [])
+    frame = pd.DataFrame([{c: g[c] for c in columns} for g in games], columns=columns)
+    frame["home"] = frame["home"].astype(str).str.upper()
+    frame["away"] = frame["away"].astype(str).str.upper()
+    return frame
+
+
+def prediction_records(games, scored):
+    records = []
+    for game, row in zip(games.itertuples(index=False), scored.itertuples(index=False)):
+        records.append({
+            "home": game.home,
+            "away": game.away,
+            "home_win_prob": None if math.isnan(row.home_win_prob) else round(float(row.home_win_prob), 4),
+            "away_win_prob": None if math.isnan(row.away_win_prob) else round(float(row.away_win_prob), 4),
+            "predicted_winner": row.predicted_winner,
+            "confidence": round(float(row.confidence), 4),
+        })
+    return records
+
+
+class MicroBatcher:
+    def __init__(self, score, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.score = score
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def submit(self, game):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((game, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                # Inference runs off the event loop so new requests keep queueing meanwhile
+                records = await loop.run_in_executor(None, self.score, [game for game, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), record in zip(batch, records):
+                if not future.done():
+                    future.set_result(record)
+
+
+class PredictionService:
+    def __init__(self, registry=None, stats="live", season=mlb_data.SEASON):
+        self.registry = registry or model_registry.get_registry()
+        self.snapshots = mlb_data.SnapshotCache(mlb_data.get_team_snapshot, SNAPSHOT_TTL)
+        self.stats = stats
+        self.season = season
+        self.batcher = MicroBatcher(self.score)
+
+    def team_snapshot(self):
+        return self.snapshots.get(self.season) if self.stats == "live" else None
+
+    def score(self, games):
+        # A mixed batch is split by feature source: at most two predict_proba calls
+        bundle = self.registry.reload_if_changed()
+        records = [None] * len(games)
+        with_stats = [i for i, g in enumerate(games) if has_stats(g)]
+        without_stats = [i for i, g in enumerate(games) if not has_stats(g)]
+        for indexes, use_snapshot in [(with_stats, False), (without_stats, True)]:
+            if not indexes:
+                continue
+            team_snapshot = self.team_snapshot() if use_snapshot else None
+            frame = games_frame([games[i] for i in indexes])
+            scored = predictor.score_games(bundle.clf, frame, bundle.team_map, team_snapshot)
+            for i, record in zip(indexes, prediction_records(frame, scored)):
+                records[i] = record
+        return records
+
+    # === Handlers ===
+    async def predict(self, request):
+        try:
+            game = await request.json()
+            games_frame([game])
+        except ValueError as exc:
+            raise web.HTTPBadRequest(text=str(exc))
+        return web.json_response(await self.batcher.submit(game))
+
+    async def predict_batch(self, request):
+        try:
+            body = await request.json()
+            games = body.get("games", []) if isinstance(body, dict) else body
+            games_frame(games)
+        except (ValueError, AttributeError, TypeError) as exc:
+            raise web.HTTPBadRequest(text=str(exc))
+        if not games:
+            return web.json_response({"predictions": []})
+        records = await asyncio.get_running_loop().run_in_executor(None, self.score, games)
+        return web.json_response({"predictions": records})
+
+    async def daily_slate(self, request):
+        try:
+            date = datetime.date.fromisoformat(request.query["date"]) if "date" in request.query else mlb_data.today()
+        except ValueError:
+            raise web.HTTPBadRequest(text="date must be YYYY-MM-DD")
+        loop = asyncio.get_running_loop()
+        bundle = await loop.run_in_executor(None, self.registry.reload_if_changed)
+        daily = slate.read_slate_artifact(date, bundle)
+        if daily is None:
+            daily = await loop.run_in_executor(None, slate.build_slate, date, bundle)
+        return web.json_response(daily)
+
+    async def metrics(self, request):
+        return web.Response(text=instrumentation.to_prometheus(), content_type="text/plain")
+
+    async def health(self, request):
+        return web.json_response({
+            "status": "ok",
+            "model": self.registry.stats(),
+            "batches": self.batcher.batches,
+            "batched_requests": self.batcher.requests,
+        })
+
+    # === App ===
+    async def on_startup(self, app):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.registry.current)
+        self.batcher.start()
+
+    async def on_cleanup(self, app):
+        await self.batcher.stop()
+
+    def make_app(self):
+        app = web.Application()
+        app.add_routes([
+            web.post("/predict", self.predict),
+            web.post("/predict/batch", self.predict_batch),
+            web.get("/slate", self.daily_slate),
+            web.get("/health", self.health),
+            web.get("/metrics", self.metrics),
+        ])
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MLB game predictions over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--stats", choices=["live", "fallback"], default="live",
+                        help="where stat features come from when a request has none")
+    parser.add_argument("--season", type=int, default=mlb_data.SEASON, help="season the live stats come from")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT * 1000)
+    args = parser.parse_args(argv)
+
+    service = PredictionService(stats=args.stats, season=args.season)
+    service.batcher.max_batch = args.max_batch
+    service.batcher.max_wait = args.max_wait_ms / 1000
+    print(f"Serving predictions on http://{args.host}:{args.port}")
+    web.run_app(service.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
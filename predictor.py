@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+# Column order the pretrained model was fit with
+FEATURE_COLUMNS = [
+    "home_id", "away_id",
+    "home_win_pct", "away_win_pct",
+    "Walks Issued - Home", "Walks Issued - Away",
+    "Strikeouts Thrown - Home", "Strikeouts Thrown - Away",
+    "Total Bases - Home", "Total Bases - Away"
+]
+
+# Used when live stats can't be fetched for either team
+FALLBACK_WIN_PCT = 0.50
+FALLBACK_STATS = {"walks_issued": 3.0, "strikeouts_thrown": 8.0, "total_bases": 12.0}
+
+
+def feature_row(home_id, away_id, home_win_pct, away_win_pct, home_stats, away_stats):
+    # home_stats/away_stats: dicts as returned by mlb_data.get_last_10_game_stats_many
+    if not (home_stats and away_stats):
+        home_win_pct = away_win_pct = FALLBACK_WIN_PCT
+        home_stats = away_stats = FALLBACK_STATS
+    return [
+        home_id, away_id,
+        home_win_pct, away_win_pct,
+        home_stats["walks_issued"], away_stats["walks_issued"],
+        home_stats["strikeouts_thrown"], away_stats["strikeouts_thrown"],
+        home_stats["total_bases"], away_stats["total_bases"]
+    ]
+
+
+@instrumentation.timed("feature_frame")
+def build_feature_frame(rows):
+    return pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+
+
+# Snapshot stat -> (home column, away column)
+STAT_FEATURES = {
+    "win_pct": ("home_win_pct", "away_win_pct"),
+    "walks_issued": ("Walks Issued - Home", "Walks Issued - Away"),
+    "strikeouts_thrown": ("Strikeouts Thrown - Home", "Strikeouts Thrown - Away"),
+    "total_bases": ("Total Bases - Home", "Total Bases - Away"),
+}
+
+
+# The binary home-win model is team-agnostic: both sides' stats plus home-minus-away differences
+DIFF_FEATURES = {key: f"{key}_diff" for key in STAT_FEATURES}
+HOME_WIN_FEATURE_COLUMNS = [c for pair in STAT_FEATURES.values() for c in pair] + list(DIFF_FEATURES.values())
+
+
+def home_win_features(features):
+    # The binary model's inputs, derived from a FEATURE_COLUMNS frame in one array operation
+    stats = features[HOME_WIN_FEATURE_COLUMNS[:-len(DIFF_FEATURES)]].to_numpy(np.float32)
+    values = np.hstack([stats, stats[:, 0::2] - stats[:, 1::2]])
+    return pd.DataFrame(values, columns=HOME_WIN_FEATURE_COLUMNS, index=features.index)
+
+
+def is_home_win_model(clf):
+    # Binary models are fit on HOME_WIN_FEATURE_COLUMNS; the legacy model is multiclass over team ids
+    names = getattr(clf, "feature_names_in_", None)
+    if names is not None:
+        return list(names) == HOME_WIN_FEATURE_COLUMNS
+    return getattr(clf, "n_features_in_", len(FEATURE_COLUMNS)) == len(HOME_WIN_FEATURE_COLUMNS)
+
+
+@instrumentation.timed("feature_frame")
+def games_feature_frame(games, team_map, team_snapshot=None):
+    # Vectorized feature_row over a frame of games with "home"/"away" abbreviations.
+    # Stat columns already present in `games` are used as-is; otherwise they come from
+    # team_snapshot (abbr -> stats dict or None, see mlb_data.get_team_snapshot) with the
+    # same fallback rule as feature_row. Returns (features, known) where known marks games
+    # whose teams are both in team_map.
+    home_ids = games["home"].map(team_map)
+    away_ids = games["away"].map(team_map)
+    known = (home_ids.notna() & away_ids.notna()).to_numpy()
+
+    features = pd.DataFrame(index=games.index)
+    features["home_id"] = home_ids.fillna(-1).astype(np.int64)
+    features["away_id"] = away_ids.fillna(-1).astype(np.int64)
+
+    stat_columns = [c for pair in STAT_FEATURES.values() for c in pair]
+    if all(c in games.columns for c in stat_columns):
+        for column in stat_columns:
+            features[column] = games[column].astype(float)
+        return features[FEATURE_COLUMNS], known
+
+    snapshot = {abbr: stats for abbr, stats in (team_snapshot or {}).items() if stats}
+    have_both = games["home"].isin(list(snapshot)) & games["away"].isin(list(snapshot))
+    for key, (home_column, away_column) in STAT_FEATURES.items():
+        lookup = {abbr: stats[key] for abbr, stats in snapshot.items()}
+        fallback = FALLBACK_WIN_PCT if key == "win_pct" else FALLBACK_STATS[key]
+        features[home_column] = games["home"].map(lookup).where(have_both, fallback).astype(float)
+        features[away_column] = games["away"].map(lookup).where(have_both, fallback).astype(float)
+    return features[FEATURE_COLUMNS], known
+
+
+def class_probabilities(probs, classes, team_ids):
+    # Pull each row's probability for the given class id with one fancy-indexing step.
+    # Ids the model was never trained on come back as NaN.
+    classes = np.asarray(classes)
+    team_ids = np.asarray(team_ids, dtype=np.int64)
+    order = np.argsort(classes)
+    pos = np.searchsorted(classes, team_ids, sorter=order)
+    pos = order[np.minimum(pos, len(classes) - 1)]
+    known = classes[pos] == team_ids
+    out = np.full(len(team_ids), np.nan)
+    rows = np.arange(len(team_ids))
+    out[known] = probs[rows[known], pos[known]]
+    return out
+
+
+def predict_home_away(clf, features):
+    # One predict_proba call for the whole slate; returns (home_probs, away_probs) arrays.
+    # A home-win model gives P(home wins) and its complement; a legacy team-id model gives each
+    # team's own class probability, so the pair need not sum to 1.
+    if len(features) == 0:
+        return np.empty(0), np.empty(0)
+    if is_home_win_model(clf):
+        with instrumentation.timed("predict_proba"):
+            home_probs = clf.predict_proba(home_win_features(features))[:, 1].astype(float)
+        return home_probs, 1.0 - home_probs
+    with instrumentation.timed("predict_proba"):
+        probs = clf.predict_proba(features[FEATURE_COLUMNS])
+    home_probs = class_probabilities(probs, clf.classes_, features["home_id"].to_numpy())
+    away_probs = class_probabilities(probs, clf.classes_, features["away_id"].to_numpy())
+    return home_probs, away_probs
+
+
+def home_share(home_probs, away_probs):
+    # Home team's share of the pair (arrays of any shape), comparable across both model kinds;
+    # 0.5 where neither is known
+    home = np.nan_to_num(home_probs)
+    away = np.nan_to_num(away_probs)
+    total = home + away
+    return np.divide(home, total, out=np.full(home.shape, 0.5), where=total > 0)
+
+
+def sweep_frame(base_row, sweeps):
+    # base_row: a feature_row; sweeps: [(column, values), ...] for one or two inputs. Every
+    # grid point becomes one row with the other inputs held at base_row (first axis slowest).
+    grids = np.meshgrid(*[np.asarray(values, dtype=float) for _, values in sweeps], indexing="ij")
+    frame = pd.DataFrame(np.tile(np.asarray(base_row, dtype=float), (grids[0].size, 1)), columns=FEATURE_COLUMNS)
+    frame["home_id"] = frame["home_id"].astype(np.int64)
+    frame["away_id"] = frame["away_id"].astype(np.int64)
+    for (column, _), grid in zip(sweeps, grids):
+        frame[column] = grid.ravel()
+    return frame, grids[0].shape
+
+
+def sensitivity_sweep(clf, base_row, sweeps):
+    # The whole grid in one predict_proba call; (home_probs, away_probs) shaped like the grid
+    frame, shape = sweep_frame(base_row, sweeps)
+    home_probs, away_probs = predict_home_away(clf, frame)
+    return home_probs.reshape(shape), away_probs.reshape(shape)
+
+
+def summarize(home_probs, away_probs):
+    # Winner side and confidence margin per game, matching the single-game rules:
+    # ties go to the home team, a missing side counts as 0 for the margin.
+    home_filled = np.nan_to_num(home_probs, nan=-1.0)
+    away_filled = np.nan_to_num(away_probs, nan=-1.0)
+    home_wins = home_filled >= away_filled
+    margin = np.abs(np.nan_to_num(home_probs) - np.nan_to_num(away_probs))
+    available = ~(np.isnan(home_probs) & np.isnan(away_probs))
+    return home_wins, margin, available
+
+
+def score_games(clf, games, team_map, team_snapshot=None):
+    # Feature construction + one batched inference call for a frame of games.
+    # Returns one row per game, aligned with games.index.
+    features, known = games_feature_frame(games, team_map, team_snapshot)
+    home_probs = np.full(len(games), np.nan)
+    away_probs = np.full(len(games), np.nan)
+    if known.any():
+        home_probs[known], away_probs[known] = predict_home_away(clf, features[known])
+
+    home_wins, margin, available = summarize(home_probs, away_probs)
+    winner = np.where(home_wins, games["home"].to_numpy(), games["away"].to_numpy())
+    return pd.DataFrame({
+        "home_win_prob": home_probs,
+        "away_win_prob": away_probs,
+        "predicted_winner": np.where(available, winner, "Unavailable"),
+        "confidence": np.where(available, margin, 0.0),
+    }, index=games.index)
@@ -0,0 +1,78 @@
+import argparse
+import datetime
+import logging
+import threading
+import time
+
+import mlb_data
+import model_registry
+import slate
+
+# Keeps today's Daily Matchups slate ready before anyone opens the page:
+#   python prefetch_worker.py              # refresh every 10 minutes, forever
+#   python prefetch_worker.py --once       # one refresh, e.g. from cron
+# Each cycle drops the cached schedule and standings snapshots, syncs new boxscores, scores
+# the day's games in one batch and writes slates/slate-<date>.json.
+
+PREFETCH_INTERVAL = 600  # seconds
+
+log = logging.getLogger("prefetch")
+
+
+def refresh(dates=None, registry=None):
+    registry = registry or model_registry.get_registry()
+    bundle = registry.reload_if_changed()
+    mlb_data.schedule_snapshots.clear()
+    mlb_data.standings_snapshots.clear()
+
+    paths = []
+    for date in dates or [mlb_data.today()]:
+        start = time.perf_counter()
+        built = slate.build_slate(date, bundle)
+        paths.append(slate.write_slate_artifact(built))
+        log.info("slate %s: %d games in %.2fs", date, len(built["matchups"]), time.perf_counter() - start)
+    return paths
+
+
+def run_forever(interval=PREFETCH_INTERVAL, days_ahead=0, stop_event=None):
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        today = mlb_data.today()
+        dates = [today + datetime.timedelta(days=d) for d in range(days_ahead + 1)]
+        try:
+            refresh(dates)
+        except Exception:
+            # A failed cycle leaves the last good artifact in place; try again next cycle
+            log.exception("prefetch cycle failed")
+        stop_event.wait(interval)
+
+
+_thread = None
+
+
+def start_in_process(interval=PREFETCH_INTERVAL):
+    # For single-process deployments: run the same loop on a daemon thread inside the app
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _thread = threading.Thread(target=run_forever, args=(interval,), name="slate-prefetch", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the Daily Matchups slate on a cadence")
+    parser.add_argument("--interval", type=int, default=PREFETCH_INTERVAL, help="seconds between refreshes")
+    parser.add_argument("--days-ahead", type=int, default=0, help="also prepare this many future days")
+    parser.add_argument("--once", action="store_true", help="refresh once and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    if args.once:
+        today = mlb_data.today()
+        refresh([today + datetime.timedelta(days=d) for d in range(args.days_ahead + 1)])
+    else:
+        run_forever(args.interval, args.days_ahead)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Record/replay transport for every request made through mlb_api's shared session
+# (statsapi schedule, boxscore and standings calls, and the RSS feeds).
+#   MLB_HTTP_MODE=record  MLB_FIXTURE_DIR=fixtures  streamlit run mlb_predictor_app.py
+#   MLB_HTTP_MODE=replay  MLB_FIXTURE_DIR=fixtures  MLB_REPLAY_LATENCY=0.05  ...
+# Pin "today" with MLB_TODAY=YYYY-MM-DD when replaying, since schedule URLs carry the date.
+
+HTTP_MODE = os.environ.get("MLB_HTTP_MODE", "live")  # live | record | replay
+FIXTURE_DIR = os.environ.get("MLB_FIXTURE_DIR", "fixtures")
+REPLAY_LATENCY = float(os.environ.get("MLB_REPLAY_LATENCY", "0"))
+
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified"]
+
+
+def fixture_path(url, fixture_dir):
+    key = hashlib.sha1(url.encode()).hexdigest()[:20]
+    host = urlparse(url).netloc.replace(":", "_") or "local"
+    return os.path.join(fixture_dir, host, f"{key}.json")
+
+
+class ReplayAdapter(HTTPAdapter):
+    def __init__(self, mode, fixture_dir, latency=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        if self.mode == "replay":
+            return self._replay(request)
+        response = super().send(request, **kwargs)
+        if self.mode == "record" and response.status_code == 200:
+            self._record(request, response)
+        return response
+
+    def _record(self, request, response):
+        path = fixture_path(request.url, self.fixture_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fixture = {
+            "url": request.url,
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            "body_b64": base64.b64encode(response.content).decode("ascii"),
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(fixture, f)
+        os.replace(tmp_path, path)
+
+    def _replay(self, request):
+        try:
+            with open(fixture_path(request.url, self.fixture_dir)) as f:
+                fixture = json.load(f)
+        except OSError:
+            raise requests.ConnectionError(f"no recorded fixture for {request.url}", request=request)
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.headers = CaseInsensitiveDict(fixture["headers"])
+        response._content = base64.b64decode(fixture["body_b64"])
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def make_adapter(**kwargs):
+    if HTTP_MODE == "live":
+        return HTTPAdapter(**kwargs)
+    return ReplayAdapter(HTTP_MODE, FIXTURE_DIR, REPLAY_LATENCY, **kwargs)
+
+
+def configure(mode=None, fixture_dir=None, latency=None):
+    # Switch transport at runtime (benchmarks, tests); the shared session is rebuilt on next use
+    global HTTP_MODE, FIXTURE_DIR, REPLAY_LATENCY
+    import mlb_api
+
+    if mode is not None:
+        HTTP_MODE = mode
+    if fixture_dir is not None:
+        FIXTURE_DIR = fixture_dir
+    if latency is not None:
+        REPLAY_LATENCY = latency
+    mlb_api.reset_session()
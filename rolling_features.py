@@ -0,0 +1,123 @@
+import numpy as np
+
+# Rolling-window team features shared by training and the live app.
+# Each team has a fixed-size ring buffer of its last `window` games plus running sums, so
+# ingesting a game is O(1): overwrite the oldest slot and adjust the sums. Season-to-date
+# wins/games are tracked alongside, and both reset when a team's season changes.
+# A missing stat (NaN) takes its slot in the window but is left out of that stat's sum and
+# count, so one bad boxscore does not poison the averages for the rest of the season.
+
+STATS = ["total_bases", "walks_issued", "strikeouts_thrown"]
+
+
+class RollingFeatureEngine:
+    def __init__(self, window=10, stats=STATS, reset_each_season=True):
+        self.window = window
+        self.stats = list(stats)
+        self.reset_each_season = reset_each_season
+        self.slots = {}
+        capacity = 32
+        self._buffers = np.zeros((capacity, window, len(self.stats)))
+        self._sums = np.zeros((capacity, len(self.stats)))
+        self._counts = np.zeros((capacity, len(self.stats)), dtype=np.int64)  # non-missing values per stat
+        self._filled = np.zeros(capacity, dtype=np.int64)  # games in the window
+        self._next = np.zeros(capacity, dtype=np.int64)
+        self._wins = np.zeros(capacity, dtype=np.int64)
+        self._games = np.zeros(capacity, dtype=np.int64)
+        self._seasons = [None] * capacity
+
+    def _slot(self, team):
+        slot = self.slots.get(team)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self._filled):
+                self._grow()
+            self.slots[team] = slot
+        return slot
+
+    def _grow(self):
+        capacity = len(self._filled) * 2
+        self._buffers = np.concatenate([self._buffers, np.zeros_like(self._buffers)])
+        self._sums = np.concatenate([self._sums, np.zeros_like(self._sums)])
+        for name in ["_counts", "_filled", "_next", "_wins", "_games"]:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros_like(getattr(self, name))]))
+        self._seasons.extend([None] * (capacity - len(self._seasons)))
+
+    def _start_season(self, slot, season):
+        if self.reset_each_season and season is not None and self._seasons[slot] != season:
+            self._seasons[slot] = season
+            self._sums[slot] = 0
+            self._counts[slot] = 0
+            self._filled[slot] = 0
+            self._next[slot] = 0
+            self._wins[slot] = 0
+            self._games[slot] = 0
+
+    # === Updates ===
+    def ingest(self, team, stats, won=None, season=None):
+        # stats: sequence in self.stats order (or a dict keyed by stat name)
+        slot = self._slot(team)
+        self._start_season(slot, season)
+        values = np.asarray([stats[s] for s in self.stats] if isinstance(stats, dict) else stats, dtype=float)
+
+        present = ~np.isnan(values)
+
+        pos = self._next[slot]
+        if self._filled[slot] == self.window:
+            evicted = self._buffers[slot, pos]
+            evicted_present = ~np.isnan(evicted)
+            self._sums[slot] -= np.where(evicted_present, evicted, 0.0)
+            self._counts[slot] -= evicted_present
+        else:
+            self._filled[slot] += 1
+        self._buffers[slot, pos] = values
+        self._sums[slot] += np.where(present, values, 0.0)
+        self._counts[slot] += present
+        self._next[slot] = (pos + 1) % self.window
+
+        if won is not None:
+            self._wins[slot] += int(won)
+            self._games[slot] += 1
+
+    # === Reads ===
+    def _window_means(self, slot):
+        # NaN for a stat with no values in the window
+        counts = self._counts[slot]
+        return np.divide(self._sums[slot], counts, out=np.full(len(self.stats), np.nan), where=counts > 0)
+
+    def averages(self, team):
+        # None until every stat has at least one value in the window
+        slot = self.slots.get(team)
+        if slot is None or self._filled[slot] == 0 or not self._counts[slot].all():
+            return None
+        return dict(zip(self.stats, self._window_means(slot).tolist()))
+
+    def win_pct(self, team, default=None):
+        slot = self.slots.get(team)
+        if slot is None or self._games[slot] == 0:
+            return default
+        return self._wins[slot] / self._games[slot]
+
+    def point_in_time(self, home, away, home_stats, away_stats, home_won, seasons=None):
+        # One chronological pass over a game log. For every game, emit both teams' features as
+        # they stood before first pitch, then ingest the result. Arrays are aligned with the
+        # inputs; NaN means no earlier game (or no recorded value of that stat) this season.
+        n = len(home)
+        k = len(self.stats)
+        home_stats = np.asarray(home_stats, dtype=float).reshape(n, k)
+        away_stats = np.asarray(away_stats, dtype=float).reshape(n, k)
+        out_win_pct = np.full((n, 2), np.nan)
+        out_avgs = np.full((n, 2, k), np.nan)
+
+        for i in range(n):
+            season = None if seasons is None else seasons[i]
+            for side, team in enumerate((home[i], away[i])):
+                slot = self._slot(team)
+                self._start_season(slot, season)
+                if self._games[slot]:
+                    out_win_pct[i, side] = self._wins[slot] / self._games[slot]
+                out_avgs[i, side] = self._window_means(slot)
+            self.ingest(home[i], home_stats[i], won=home_won[i], season=season)
+            self.ingest(away[i], away_stats[i], won=not home_won[i], season=season)
+
+        return out_win_pct, out_avgs
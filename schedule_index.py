@@ -0,0 +1,38 @@
+# League-wide schedule index built from one sportId=1 schedule payload.
+# Games are ordered by start time (gameDate, then gamePk for doubleheaders), never by gamePk
+# alone: gamePks are assigned when the schedule is published, so postponed and makeup games
+# carry old ids.
+
+class ScheduleIndex:
+    def __init__(self, games):
+        # games: list of dicts with game_pk, game_date, official_date, home_id, away_id, state,
+        # home_score, away_score
+        self.games = sorted(games, key=lambda g: (g["game_date"], g["game_pk"]))
+        self.games_by_pk = {g["game_pk"]: g for g in self.games}
+        self.team_games = {}
+        for game in self.games:
+            for team_id in (game["home_id"], game["away_id"]):
+                self.team_games.setdefault(team_id, []).append(game)
+
+    @classmethod
+    def from_schedule(cls, schedule_data):
+        games = []
+        for date in schedule_data.get("dates", []):
+            for game in date.get("games", []):
+                teams = game.get("teams", {})
+                games.append({
+                    "game_pk": game["gamePk"],
+                    "game_date": game.get("gameDate", date.get("date", "")),
+                    "official_date": game.get("officialDate", date.get("date", "")),
+                    "home_id": teams.get("home", {}).get("team", {}).get("id"),
+                    "away_id": teams.get("away", {}).get("team", {}).get("id"),
+                    "state": game.get("status", {}).get("abstractGameState"),
+                    "home_score": teams.get("home", {}).get("score"),
+                    "away_score": teams.get("away", {}).get("score"),
+                })
+        return cls(games)
+
+    def recent_final_game_pks(self, team_id, limit):
+        # Most recent first
+        finals = [g["game_pk"] for g in self.team_games.get(team_id, []) if g["state"] == "Final"]
+        return finals[::-1][:limit]
@@ -0,0 +1,151 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import matchup_matrix
+import mlb_api
+import mlb_data
+import model_registry
+import predictor
+from schedule_index import ScheduleIndex
+
+# Monte Carlo projection of the rest of the regular season:
+#   python season_sim.py --sims 10000 --workers 4
+# Every remaining game gets a home win probability from the matchup matrix (the model's batch
+# path). Simulations run in blocks: one (sims x games) uniform draw decides every game of every
+# simulated season at once, and a matrix product with the game/team incidence turns the results
+# into win totals. Division winners and wild cards (three per league) are then picked per
+# simulation, with random tiebreaks in place of the real tiebreaker rules.
+
+N_SIMS = 10_000
+BLOCK_SIMS = 2_000  # simulations per draw; bounds memory to BLOCK_SIMS x remaining games
+WILD_CARDS = 3  # per league
+
+TEAMS = list(mlb_data.mlb_team_ids)
+TEAM_INDEX = {abbr: i for i, abbr in enumerate(TEAMS)}
+DIVISION_OF = {abbr: division for division, members in mlb_data.divisions.items() for abbr in members}
+
+
+def remaining_games(season=mlb_data.SEASON):
+    # Regular-season games from today on that are not Final yet, as a frame of abbreviations;
+    # empty without a request once the season is over
+    start_date, end_date = mlb_data.season_dates(season, start_date=mlb_data.today())
+    if start_date > end_date:
+        return pd.DataFrame({"game_pk": [], "home": [], "away": []})
+    url = mlb_data.league_schedule_url(season, end_date=end_date, start_date=start_date)
+    index = ScheduleIndex.from_schedule(mlb_api.get_json(url))
+    games = [
+        g for g in index.games
+        if g["state"] != "Final" and g["home_id"] in mlb_data.id_to_abbr and g["away_id"] in mlb_data.id_to_abbr
+    ]
+    return pd.DataFrame({
+        "game_pk": [g["game_pk"] for g in games],
+        "home": [mlb_data.id_to_abbr[g["home_id"]] for g in games],
+        "away": [mlb_data.id_to_abbr[g["away_id"]] for g in games],
+    })
+
+
+def home_win_probabilities(games, matrix):
+    # Head-to-head share of the two teams' class probabilities; 0.5 where the model has neither
+    scored = matrix.score(games[["home", "away"]].astype(object))
+    return predictor.home_share(scored["home_win_prob"].to_numpy(), scored["away_win_prob"].to_numpy())
+
+
+# === Simulation ===
+def simulate_block(home_idx, away_idx, p_home, base_wins, n_sims, seed):
+    # Returns (wins, division_winner, wild_card) for n_sims seasons, each shaped (n_sims, teams)
+    rng = np.random.default_rng(seed)
+    n_games, n_teams = len(p_home), len(base_wins)
+    home_incidence = np.zeros((n_games, n_teams), dtype=np.float32)
+    away_incidence = np.zeros((n_games, n_teams), dtype=np.float32)
+    home_incidence[np.arange(n_games), home_idx] = 1
+    away_incidence[np.arange(n_games), away_idx] = 1
+
+    home_won = (rng.random((n_sims, n_games), dtype=np.float32) < p_home.astype(np.float32)).astype(np.float32)
+    wins = base_wins + away_incidence.sum(axis=0) + home_won @ (home_incidence - away_incidence)
+    wins = np.rint(wins).astype(np.int16)
+
+    # Fractional noise breaks ties without changing any strict ordering
+    score = wins + rng.random(wins.shape)
+    rows = np.arange(n_sims)
+    division_winner = np.zeros(wins.shape, dtype=bool)
+    for members in mlb_data.divisions.values():
+        members = np.array([TEAM_INDEX[t] for t in members])
+        division_winner[rows, members[np.argmax(score[:, members], axis=1)]] = True
+
+    wild_card = np.zeros(wins.shape, dtype=bool)
+    for league in ("AL", "NL"):
+        members = np.array([TEAM_INDEX[t] for t in TEAMS if DIVISION_OF[t].startswith(league)])
+        league_score = np.where(division_winner[:, members], -np.inf, score[:, members])
+        top = np.argpartition(-league_score, WILD_CARDS - 1, axis=1)[:, :WILD_CARDS]
+        wild_card[rows[:, None], members[top]] = True
+    return wins, division_winner, wild_card
+
+
+@instrumentation.timed("season_simulation")
+def simulate_season(games, p_home, standings, n_sims=N_SIMS, workers=1, seed=None):
+    home_idx = games["home"].map(TEAM_INDEX).to_numpy()
+    away_idx = games["away"].map(TEAM_INDEX).to_numpy()
+    base_wins = np.array([standings.get(mlb_data.mlb_team_ids[t], (0, 0))[0] for t in TEAMS], dtype=np.float32)
+
+    blocks = [min(BLOCK_SIMS, n_sims - start) for start in range(0, n_sims, BLOCK_SIMS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(blocks))
+    args = [(home_idx, away_idx, p_home, base_wins, size, block_seed) for size, block_seed in zip(blocks, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_block, *zip(*args)))
+    else:
+        results = [simulate_block(*a) for a in args]
+    wins, division_winner, wild_card = (np.concatenate(r) for r in zip(*results))
+    return wins, division_winner, wild_card
+
+
+def summarize_simulations(wins, division_winner, wild_card, standings):
+    records = [standings.get(mlb_data.mlb_team_ids[t], (0, 0)) for t in TEAMS]
+    summary = pd.DataFrame({
+        "Team": TEAMS,
+        "Division": [DIVISION_OF[t] for t in TEAMS],
+        "W": [w for w, _ in records],
+        "L": [l for _, l in records],
+        "Proj W": wins.mean(axis=0).round(1),
+        "W 10%": np.percentile(wins, 10, axis=0).astype(int),
+        "W 90%": np.percentile(wins, 90, axis=0).astype(int),
+        "Division %": (division_winner.mean(axis=0) * 100).round(1),
+        "Wild Card %": (wild_card.mean(axis=0) * 100).round(1),
+        "Playoffs %": ((division_winner | wild_card).mean(axis=0) * 100).round(1),
+    })
+    return summary.sort_values(["Division", "Proj W"], ascending=[True, False]).reset_index(drop=True)
+
+
+def project_season(season=mlb_data.SEASON, bundle=None, n_sims=N_SIMS, workers=1, seed=None):
+    bundle = bundle or model_registry.get_registry().current()
+    games = remaining_games(season)
+    standings = mlb_data.get_standings(season)
+    p_home = home_win_probabilities(games, matchup_matrix.get_matrix(bundle, season=season)) if len(games) else np.empty(0)
+    wins, division_winner, wild_card = simulate_season(games, p_home, standings, n_sims, workers, seed)
+    return summarize_simulations(wins, division_winner, wild_card, standings), len(games)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the rest of the MLB regular season")
+    parser.add_argument("--season", type=int, default=mlb_data.SEASON)
+    parser.add_argument("--sims", type=int, default=N_SIMS)
+    parser.add_argument("--workers", type=int, default=1, help=f"processes (this machine has {os.cpu_count()})")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary, n_games = project_season(args.season, n_sims=args.sims, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    with pd.option_context("display.max_rows", None, "display.width", 120):
+        print(summary.to_string(index=False))
+    print(f"{args.sims:,} simulations of {n_games:,} remaining games in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import matchup_matrix
+import mlb_api
+import mlb_data
+
+# A "slate" is one day's matchups with the model's predictions, in the row format the
+# Daily Matchups page renders. The prefetch worker writes it as a JSON artifact so the page
+# can serve it without touching the MLB API.
+
+SLATE_DIR = os.environ.get("MLB_SLATE_DIR", "slates")
+SLATE_MAX_AGE = 1800  # seconds before a prefetched slate is considered stale
+MATCHUP_COLUMNS = ["Away", "Home", "Predicted Winner", "Confidence", "Home Win %", "Away Win %"]
+
+
+def daily_schedule_url(date):
+    return mlb_api.statsapi_url(f"schedule?sportId=1&date={date}")
+
+
+def model_version(bundle):
+    return repr(bundle.mtimes)
+
+
+def slate_version(bundle, team_snapshot):
+    # Changes when the model or any team's stats do; the app memoizes slates on (date, version)
+    return f"{model_version(bundle)}/{matchup_matrix.snapshot_fingerprint(team_snapshot)}"
+
+
+def build_slate(date, bundle, team_snapshot=None):
+    schedule_data = mlb_api.get_json(daily_schedule_url(date))
+    dates = schedule_data.get("dates", [])
+    games = dates[0]["games"] if dates else []
+
+    slate_games = pd.DataFrame({
+        "home": [mlb_data.id_to_abbr.get(g["teams"]["home"]["team"]["id"]) for g in games],
+        "away": [mlb_data.id_to_abbr.get(g["teams"]["away"]["team"]["id"]) for g in games],
+    }, dtype=object)
+
+    matchups = []
+    if len(slate_games):
+        # Read from the all-pairs matrix; it is only rescored when the stats snapshot changes
+        if team_snapshot is None:
+            team_snapshot = mlb_data.get_team_snapshot(mlb_data.season_of(date))
+        matrix = matchup_matrix.get_matrix(bundle, team_snapshot)
+        scored = matrix.score(slate_games)
+        for game, row in zip(slate_games.itertuples(index=False), scored.itertuples(index=False)):
+            matchups.append({
+                "Away": game.away,
+                "Home": game.home,
+                "Predicted Winner": row.predicted_winner,
+                "Confidence": round(float(row.confidence), 3),
+                "Home Win %": round(float(np.nan_to_num(row.home_win_prob)) * 100, 1),
+                "Away Win %": round(float(np.nan_to_num(row.away_win_prob)) * 100, 1)
+            })
+
+    return {
+        "date": str(date),
+        "generated_at": time.time(),
+        "model_version": model_version(bundle),
+        "game_pks": [g["gamePk"] for g in games],
+        "matchups": matchups,
+    }
+
+
+def matchups_frame(slate):
+    return pd.DataFrame(slate["matchups"], columns=MATCHUP_COLUMNS)
+
+
+# === Artifacts ===
+def slate_path(date, slate_dir=None):
+    return os.path.join(slate_dir or SLATE_DIR, f"slate-{date}.json")
+
+
+def write_json_atomic(payload, path):
+    # Write to a temp file and rename, so readers never see a half-written artifact
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_slate_artifact(slate, slate_dir=None):
+    return write_json_atomic(slate, slate_path(slate["date"], slate_dir))
+
+
+def read_slate_artifact(date, bundle=None, max_age=SLATE_MAX_AGE, slate_dir=None):
+    # None when there is no artifact, it is too old, or it was scored by a different model
+    try:
+        with open(slate_path(date, slate_dir)) as f:
+            slate = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - slate.get("generated_at", 0) > max_age:
+        return None
+    if bundle is not None and slate.get("model_version") != model_version(bundle):
+        return None
+    return slate
+
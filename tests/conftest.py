@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# Pin the clock to the stub season before mlb_data builds any schedule url
+os.environ.setdefault("MLB_TODAY", "2025-05-01")
+
+import backtest  # noqa: E402
+import boxscore_store  # noqa: E402
+import game_log  # noqa: E402
+import http_cache  # noqa: E402
+import slate  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def local_state(tmp_path, monkeypatch):
+    # Keep each test's boxscore store, HTTP cache and slate artifacts out of the working tree;
+    # stub games must never reach the stores the app reads
+    state_dir = tmp_path / "state"
+    state_dir.mkdir()
+    monkeypatch.setattr(boxscore_store, "STORE_PATH", str(state_dir / "mlb_store.sqlite"))
+    monkeypatch.setattr(boxscore_store, "_store", None)
+    monkeypatch.setattr(slate, "SLATE_DIR", str(state_dir / "slates"))
+    monkeypatch.setattr(game_log, "LOG_DIR", str(state_dir / "game_log"))
+    monkeypatch.setattr(backtest, "CACHE_DIR", str(state_dir / "backtest_cache"))
+    http_cache.configure(path=str(state_dir / "mlb_http_cache.sqlite"), enabled=True)
+    yield
+    http_cache.configure()
@@ -0,0 +1,69 @@
+import datetime
+import os
+
+import pytest
+
+import backfill
+import boxscore_store
+import game_log
+import http_cache
+import mlb_api
+import mlb_data
+from stub_statsapi import StubStatsApi
+
+SEASON = 2025
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(http_cache, "ENABLED", False)
+    with StubStatsApi(latency=0.0, days=10) as server:
+        monkeypatch.setattr(mlb_api, "STATSAPI_BASE", server.base_url)
+        yield server
+
+
+@pytest.fixture
+def store(tmp_path):
+    return boxscore_store.BoxscoreStore(str(tmp_path / "store.sqlite"))
+
+
+def run(store, tmp_path, **kwargs):
+    return backfill.backfill_season(SEASON, store, mlb_api.RateLimiter(1000), workers=4, batch_size=20,
+                                    log_dir=str(tmp_path / "log"), **kwargs)
+
+
+def test_interrupted_backfill_resumes_without_refetching(stub, store, tmp_path, monkeypatch):
+    sync = mlb_data.sync_boxscores
+    batches = []
+
+    def interrupted(*args, **kwargs):
+        if len(batches) == 2:
+            raise KeyboardInterrupt
+        batches.append(sync(*args, **kwargs))
+
+    monkeypatch.setattr(mlb_data, "sync_boxscores", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(store, tmp_path)
+    progress = store.backfill_progress(SEASON)
+    finals = progress["final_games"]
+    assert progress["stored_games"] == 40 and progress["completed_at"] is None
+
+    monkeypatch.setattr(mlb_data, "sync_boxscores", sync)
+    progress = run(store, tmp_path)
+    assert progress["stored_games"] == finals
+    assert stub.hits["boxscore"] == finals  # every game downloaded exactly once
+    assert os.path.exists(game_log.season_path(SEASON, str(tmp_path / "log")))
+
+
+def test_finished_past_season_is_skipped(stub, store, tmp_path, monkeypatch):
+    monkeypatch.setattr(mlb_data, "today", lambda: datetime.date(SEASON + 1, 1, 15))
+    progress = run(store, tmp_path)
+    assert progress["completed_at"] is not None
+    requests = dict(stub.hits)
+
+    assert run(store, tmp_path) == progress
+    assert stub.hits == requests
+    # --force rechecks the schedule, but the stored boxscores are not fetched again
+    run(store, tmp_path, force=True)
+    assert stub.hits["schedule"] == requests["schedule"] + 1
+    assert stub.hits["boxscore"] == requests["boxscore"]
@@ -0,0 +1,24 @@
+import numpy as np
+
+import backtest
+
+
+def test_folds_split_on_day_boundaries():
+    days = np.repeat(np.arange(10), 10)  # 10 games a day
+    folds = backtest.make_folds(days, fold_days=3, min_train_games=30)
+
+    assert folds == [(30, 60), (60, 90), (90, 100)]
+    for train_end, test_end in folds:
+        # No day is split between training and test rows
+        assert days[train_end - 1] < days[train_end]
+        assert test_end == len(days) or days[test_end - 1] < days[test_end]
+
+
+def test_empty_windows_are_skipped():
+    days = np.array([0] * 5 + [1] * 5 + [5] * 5 + [6] * 5)
+    # Windows [1, 3), [3, 5) (no games) and [5, 7)
+    assert backtest.make_folds(days, fold_days=2, min_train_games=5) == [(5, 10), (10, 20)]
+
+
+def test_too_few_games_for_any_fold():
+    assert backtest.make_folds(np.zeros(10, dtype=int), min_train_games=10) == []
@@ -0,0 +1,53 @@
+import sqlite3
+
+import boxscore_store
+import game_log
+import mlb_data
+from rolling_features import RollingFeatureEngine
+
+BOX = {"teams": {
+    "home": {"team": {"id": 147}, "teamStats": {"batting": {"totalBases": 12}, "pitching": {"baseOnBalls": 3, "strikeOuts": 9}}},
+    "away": {"team": {"id": 111}, "teamStats": {"batting": {}, "pitching": {"baseOnBalls": 2}}},
+}}
+
+
+def test_missing_stats_are_stored_as_null(tmp_path):
+    store = boxscore_store.BoxscoreStore(str(tmp_path / "store.sqlite"))
+    rows = mlb_data.extract_game_stats(BOX)
+    assert rows[1] == (111, {"total_bases": None, "walks_issued": 2, "strikeouts_thrown": None})
+
+    store.save_game_stats((1, team_id, stats) for team_id, stats in rows)
+    assert store.team_game_stats(111, [1]) == [rows[1][1]]
+    assert store.game_stats([1])[(1, 147)] == rows[0][1]
+
+
+def test_missing_stats_stay_null_in_the_game_log(tmp_path):
+    home, away = mlb_data.extract_game_stats(BOX)
+    rows = game_log.team_rows(1, "2025-04-01", 1, 147, 111, 5, 3, home[1], away[1])
+    game_log.write_season(2025, game_log.rows_table(rows), str(tmp_path))
+    table = game_log.open_season(2025, str(tmp_path)).table
+    assert table.column("total_bases").null_count == 1
+    assert table.column("strikeouts_thrown").null_count == 1
+    assert table.column("walks_issued").null_count == 0
+
+
+def test_rolling_averages_skip_missing_stats():
+    engine = RollingFeatureEngine(window=10)
+    for total_bases in (10, None, 14):
+        engine.ingest(111, {"total_bases": total_bases, "walks_issued": 2, "strikeouts_thrown": 8})
+    assert engine.averages(111)["total_bases"] == 12
+
+
+def test_not_null_store_is_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(boxscore_store.SCHEMA.replace("total_bases INTEGER,", "total_bases INTEGER NOT NULL,"))
+        conn.execute("INSERT INTO team_game_stats VALUES (1, 147, 12, 3, 9, 0.0)")
+
+    store = boxscore_store.BoxscoreStore(path)
+    store.save_game_stats([(2, 147, {"total_bases": None, "walks_issued": 1, "strikeouts_thrown": 8})])
+    assert store.game_stats([1, 2]) == {
+        (1, 147): {"total_bases": 12, "walks_issued": 3, "strikeouts_thrown": 9},
+        (2, 147): {"total_bases": None, "walks_issued": 1, "strikeouts_thrown": 8},
+    }
+    boxscore_store.BoxscoreStore(path)  # already migrated: opens without rebuilding
@@ -0,0 +1,37 @@
+import pytest
+
+import feeds
+from stub_statsapi import StubStatsApi
+
+
+@pytest.fixture(scope="module")
+def stub():
+    with StubStatsApi(latency=0.0, days=1) as server:  # RSS only, no games to play out
+        yield server
+
+
+def test_refresh_sends_a_conditional_get(stub):
+    cache = feeds.FeedCache(ttl=0, top_n=5, stale_while_revalidate=False)
+    url = stub.feed_url("mets")
+    first = cache.get(url)
+    assert len(first.entries) == 5 and first.etag
+
+    second = cache.get(url)  # expired at once, so refreshed
+    assert cache.stats() == {"hits": 0, "misses": 2, "not_modified": 1}
+    assert second.entries == first.entries
+    assert second.fetched_at >= first.fetched_at
+    assert stub.url_hits["/rss/mets"] == 2
+
+
+def test_stale_entries_are_served_while_refreshing(stub):
+    cache = feeds.FeedCache(ttl=0)
+    url = stub.feed_url("yankees")
+    first = cache.get(url)
+    assert cache.get(url) is first  # the expired copy, with a refresh in the background
+    cache._pool.shutdown(wait=True)
+    assert cache.stats() == {"hits": 1, "misses": 1, "not_modified": 1}
+
+
+def test_unreachable_feed_is_empty():
+    cache = feeds.FeedCache()
+    assert cache.get("http://127.0.0.1:9/rss/none").entries == []
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import game_log
+import train_model
+from predictor import STAT_FEATURES
+
+TEAMS = ["NYY", "BOS", "TOR", "BAL", "TB", "CLE"]
+FEATURE_COLUMNS = [c for pair in STAT_FEATURES.values() for c in pair]
+
+
+def synthetic_games(with_stats):
+    rng = np.random.default_rng(0)
+    rows = []
+    for day, date in enumerate(pd.date_range("2025-04-01", periods=40)):
+        order = rng.permutation(TEAMS)
+        for home, away in zip(order[0::2], order[1::2]):
+            home_score, away_score = rng.choice(10, 2, replace=False)
+            row = {"date": date.date().isoformat(), "home": home, "away": away,
+                   "home-score": home_score, "away-score": away_score}
+            if with_stats:
+                for side in ("home", "away"):
+                    row[f"{side}-total-bases"] = rng.integers(5, 20)
+                    row[f"{side}-walks-issued"] = rng.integers(0, 7) if rng.random() > 0.1 else np.nan
+                    row[f"{side}-strikeouts-thrown"] = rng.integers(3, 14)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def csv_features(games, tmp_path):
+    path = tmp_path / "games.csv"
+    games.to_csv(path, index=False)
+    df = train_model.label_winners(train_model.load_games(str(path), chunksize=1000))
+    return train_model.add_rolling_features(df, window=10)
+
+
+def game_log_features(games, tmp_path):
+    log_dir = str(tmp_path / "game_log")
+    game_log.import_games(games, log_dir=log_dir)
+    df = train_model.label_winners(game_log.games_frame([2025], window=10, log_dir=log_dir))
+    return train_model.fill_feature_fallbacks(df)
+
+
+@pytest.mark.parametrize("with_stats", [False, True])
+def test_game_log_features_match_csv(tmp_path, with_stats):
+    games = synthetic_games(with_stats)
+    from_csv = csv_features(games, tmp_path)
+    from_log = game_log_features(games, tmp_path)
+
+    key = ["date", "home", "away"]
+    for df in (from_csv, from_log):
+        df["home"] = df["home"].astype(str)
+        df["away"] = df["away"].astype(str)
+    merged = from_csv[key + FEATURE_COLUMNS].merge(from_log[key + FEATURE_COLUMNS], on=key, suffixes=("_csv", "_log"))
+    assert len(merged) == len(from_csv) == len(games)
+    for column in FEATURE_COLUMNS:
+        np.testing.assert_allclose(merged[f"{column}_csv"], merged[f"{column}_log"], rtol=1e-5, err_msg=column)
+
+
+def test_missing_stats_fall_back_like_serving(tmp_path):
+    features = game_log_features(synthetic_games(with_stats=False), tmp_path)
+    assert (features["Walks Issued - Home"] == train_model.FALLBACK_STATS["walks_issued"]).all()
+    assert (features["Total Bases - Away"] == train_model.FALLBACK_STATS["total_bases"]).all()
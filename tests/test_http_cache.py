@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import http_cache
+
+URL = "http://stub/api/v1/standings"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "http_cache.sqlite")
+
+
+def slow_fetch(calls, seconds, value):
+    def fetch():
+        calls.append(threading.current_thread().name)
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def test_slow_leader_keeps_its_lease(cache_path, monkeypatch):
+    # Two caches on one file stand in for two processes; the leader's fetch outlives LEASE_SECONDS
+    monkeypatch.setattr(http_cache, "LEASE_SECONDS", 0.3)
+    leader, follower = http_cache.SharedHttpCache(cache_path), http_cache.SharedHttpCache(cache_path)
+    calls = []
+    results = {}
+
+    thread = threading.Thread(target=lambda: results.setdefault("leader", leader.get_json(URL, 60, slow_fetch(calls, 1.0, {"n": 1}))))
+    thread.start()
+    time.sleep(0.1)
+    results["follower"] = follower.get_json(URL, 60, slow_fetch(calls, 0.0, {"n": 2}))
+    thread.join()
+
+    assert len(calls) == 1
+    assert results == {"leader": {"n": 1}, "follower": {"n": 1}}
+    assert follower.stats()["shared"] == 1
+
+
+def test_abandoned_lease_is_taken_over(cache_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "LEASE_SECONDS", 0.2)
+    cache = http_cache.SharedHttpCache(cache_path)
+    with cache._connect() as conn:
+        conn.execute("INSERT INTO leases (url, owner, started_at) VALUES (?, 'dead-process', ?)", (URL, time.time()))
+    assert cache.get_json(URL, 60, lambda: {"n": 3}) == {"n": 3}
+    assert cache.stats()["misses"] == 1
+
+
+def test_concurrent_misses_make_one_fetch(cache_path):
+    cache = http_cache.SharedHttpCache(cache_path)
+    calls = []
+    fetch = slow_fetch(calls, 0.2, {"n": 4})
+    barrier = threading.Barrier(8)
+    results = []
+
+    def get():
+        barrier.wait()
+        results.append(cache.get_json(URL, 60, fetch))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"n": 4}] * 8
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_failed_fetch_serves_the_expired_copy(cache_path):
+    def unavailable():
+        raise OSError("statsapi down")
+
+    cache = http_cache.SharedHttpCache(cache_path)
+    with pytest.raises(OSError):
+        cache.get_json(URL, 60, unavailable)
+    assert cache.get_json(URL, 0, lambda: {"n": 5}) == {"n": 5}  # expires immediately
+    assert cache.get_json(URL, 60, unavailable) == {"n": 5}
+    assert cache.stats()["stale"] == 1
+    with cache._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM leases").fetchone()[0] == 0
@@ -0,0 +1,132 @@
+import asyncio
+import copy
+import threading
+import types
+
+import pytest
+
+import instrumentation
+import live_games
+import mlb_api
+import mlb_data
+from bench_live_games import bench_bundle, check
+from stub_statsapi import StubStatsApi
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(live_games, "MAX_FAILURES", 3)
+    with StubStatsApi(latency=0.0, live_step=0.01) as server:
+        monkeypatch.setattr(mlb_api, "STATSAPI_BASE", server.base_url)
+        yield server
+
+
+def test_apply_patch_operations():
+    doc = {"a": {"b": [1, 2, 3]}, "c~d/e": 1}
+    doc = live_games.apply_patch(doc, [
+        {"op": "add", "path": "/a/b/1", "value": 9},
+        {"op": "add", "path": "/a/b/-", "value": 4},
+        {"op": "replace", "path": "/c~0d~1e", "value": 2},
+        {"op": "remove", "path": "/a/b/0"},
+        {"op": "copy", "from": "/a/b", "path": "/f"},
+        {"op": "move", "from": "/f/0", "path": "/g"},
+        {"op": "test", "path": "/g", "value": 9},
+    ])
+    assert doc == {"a": {"b": [9, 2, 3, 4]}, "c~d/e": 2, "f": [2, 3, 4], "g": 9}
+    assert live_games.apply_patch(doc, [{"op": "replace", "path": "", "value": {"new": 1}}]) == {"new": 1}
+
+
+@pytest.mark.parametrize("operation, error", [
+    ({"op": "test", "path": "/a", "value": 2}, ValueError),
+    ({"op": "remove", "path": "/missing"}, KeyError),
+    ({"op": "replace", "path": "/b/5", "value": 0}, IndexError),
+    ({"op": "swap", "path": "/a"}, ValueError),
+])
+def test_apply_patch_rejects_bad_operations(operation, error):
+    with pytest.raises(error):
+        live_games.apply_patch({"a": 1, "b": [0]}, [operation])
+
+
+def test_stub_diffs_replay_the_timeline(stub):
+    game_pk = live_games.slate_games(mlb_data.today(), bench_bundle())[0].game_pk
+    timeline = stub.timeline(game_pk)
+    doc = copy.deepcopy(timeline[0])
+    for index in range(len(timeline) - 1):
+        doc = live_games.apply_patch(doc, stub.diff(game_pk, index))
+        assert doc == timeline[index + 1]
+
+
+class BrokenGame(live_games.LiveGame):
+    def update(self, feed):
+        raise RuntimeError("unreadable feed")
+
+
+def test_failing_games_are_dropped_and_the_slate_still_ends(stub):
+    games = live_games.slate_games(mlb_data.today(), bench_bundle())
+    missing = live_games.LiveGame(1, "NYY", "BOS", 0.5)  # 404
+    broken = BrokenGame(games[0].game_pk, games[0].home, games[0].away, games[0].prior)
+    tracker = live_games.LiveTracker(games[1:] + [missing, broken], poll_interval=0.005)
+    asyncio.run(tracker.run())
+
+    assert tracker.done
+    assert missing.dropped and broken.dropped
+    assert missing.row()["Status"] == "Unavailable"
+    assert tracker.stats()["dropped"] == 2
+    assert tracker.stats()["final"] == len(games) - 1
+    check(types.SimpleNamespace(games=games[1:]), stub)  # the other games played on to the end
+
+
+def test_run_forever_waits_for_the_next_date(monkeypatch):
+    calls = []
+    stop = threading.Event()
+
+    def follow(date):
+        calls.append(date)
+        return live_games.LiveTracker([], date=date)
+
+    monkeypatch.setattr(live_games, "follow", follow)
+    monkeypatch.setattr(live_games, "seconds_until_tomorrow", lambda: 0.01)
+    thread = threading.Thread(target=live_games.run_forever, args=(stop,))
+    thread.start()
+    stop.wait(0.2)
+    stop.set()
+    thread.join(5)
+
+    assert calls == [mlb_data.today()]
+
+
+def test_run_forever_retries_a_failed_slate(monkeypatch):
+    calls = []
+    stop = threading.Event()
+
+    def follow(date):
+        calls.append(date)
+        if len(calls) == 1:
+            raise OSError("schedule unavailable")
+        return live_games.LiveTracker([], date=date)
+
+    monkeypatch.setattr(live_games, "follow", follow)
+    monkeypatch.setattr(live_games, "IDLE_SECONDS", 0.01)
+    monkeypatch.setattr(live_games, "seconds_until_tomorrow", lambda: 0.01)
+    thread = threading.Thread(target=live_games.run_forever, args=(stop,))
+    thread.start()
+    stop.wait(0.2)
+    stop.set()
+    thread.join(5)
+
+    assert calls == [mlb_data.today()] * 2
+
+
+def test_seconds_until_tomorrow():
+    now = live_games.datetime.datetime(2025, 5, 1, 23, 59, 30)
+    assert live_games.seconds_until_tomorrow(now) == 30
+
+
+def test_tracker_stats_are_status_not_a_cache(monkeypatch):
+    tracker = live_games.LiveTracker([live_games.LiveGame(1, "NYY", "BOS", 0.5)])
+    tracker.errors = 2
+    monkeypatch.setattr(live_games, "_tracker", tracker)
+    metrics = instrumentation.snapshot()
+    assert "live_games" not in metrics["caches"]
+    assert metrics["status"]["live_games"]["errors"] == 2
+    assert 'mlb_status{component="live_games",stat="errors"} 2.0' in instrumentation.to_prometheus()
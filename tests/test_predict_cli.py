@@ -0,0 +1,45 @@
+import joblib
+import pandas as pd
+import pytest
+
+import mlb_data
+import predict_cli
+import tree_model
+from bench_batch_predict import synthetic_home_win_model
+
+
+@pytest.fixture(scope="module")
+def compiled_model_paths(tmp_path_factory):
+    tmp_dir = tmp_path_factory.mktemp("model")
+    team_map = {abbr: i for i, abbr in enumerate(sorted(mlb_data.mlb_team_ids))}
+    model_path, team_map_path, reverse_map_path = (str(tmp_dir / name) for name in ("m.npz", "team_map.pkl", "reverse_map.pkl"))
+    tree_model.save(tree_model.compile_booster(synthetic_home_win_model(n_estimators=20)), model_path)
+    joblib.dump(team_map, team_map_path)
+    joblib.dump({i: abbr for abbr, i in team_map.items()}, reverse_map_path)
+    with pytest.MonkeyPatch.context() as patch:
+        # Worker processes started with spawn import the store and cache modules afresh, from the
+        # environment; the autouse local_state fixture only covers this process
+        patch.setenv("MLB_STORE_PATH", str(tmp_dir / "mlb_store.sqlite"))
+        patch.setenv("MLB_HTTP_CACHE_PATH", str(tmp_dir / "mlb_http_cache.sqlite"))
+        patch.setenv("MLB_SLATE_DIR", str(tmp_dir / "slates"))
+        yield model_path, team_map_path, reverse_map_path
+
+
+def run_cli(tmp_path, paths, workers):
+    teams = sorted(mlb_data.mlb_team_ids)
+    games = pd.DataFrame({"home": teams[0::2] * 20, "away": teams[1::2] * 20})
+    games.to_csv(tmp_path / "games.csv", index=False)
+    out = tmp_path / f"out-{workers}.csv"
+    model_path, team_map_path, reverse_map_path = paths
+    predict_cli.main([
+        str(tmp_path / "games.csv"), str(out), "--stats", "fallback", "--workers", str(workers),
+        "--chunksize", "50", "--model", model_path, "--team-map", team_map_path, "--reverse-map", reverse_map_path,
+    ])
+    return pd.read_csv(out)
+
+
+def test_compiled_model_with_worker_pool(tmp_path, compiled_model_paths):
+    pooled = run_cli(tmp_path, compiled_model_paths, workers=2)
+    single = run_cli(tmp_path, compiled_model_paths, workers=1)
+    assert len(pooled) == 300
+    pd.testing.assert_frame_equal(pooled, single)
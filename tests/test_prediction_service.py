@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+import joblib
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import mlb_data
+import model_registry
+import prediction_service
+import tree_model
+from bench_batch_predict import synthetic_home_win_model
+
+
+@pytest.fixture
+def registry(tmp_path):
+    team_map = {abbr: i for i, abbr in enumerate(sorted(mlb_data.mlb_team_ids))}
+    paths = [str(tmp_path / name) for name in ("m.npz", "team_map.pkl", "reverse_map.pkl")]
+    tree_model.save(tree_model.compile_booster(synthetic_home_win_model(n_estimators=5)), paths[0])
+    joblib.dump(team_map, paths[1])
+    joblib.dump({i: abbr for abbr, i in team_map.items()}, paths[2])
+    return model_registry.ModelRegistry(*paths, warm=False)
+
+
+def call(registry, requests):
+    # Runs (method, path, json, before) requests against one service; before() runs first if given
+    async def run():
+        service = prediction_service.PredictionService(registry=registry, stats="fallback")
+        async with TestClient(TestServer(service.make_app())) as client:
+            results = []
+            for method, path, body, before in requests:
+                if before:
+                    before()
+                response = await client.request(method, path, json=body)
+                results.append((response.status, await response.text()))
+            return results
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("date", ["foo", "../x", "2025-13-01"])
+def test_bad_slate_date_is_rejected(registry, date):
+    [(status, body)] = call(registry, [("GET", f"/slate?date={date}", None, None)])
+    assert status == 400
+    assert "YYYY-MM-DD" in body
+
+
+def test_published_model_is_picked_up(registry):
+    model_path = registry.paths[0]
+
+    def publish():
+        tree_model.save(tree_model.compile_booster(synthetic_home_win_model(n_estimators=40)), model_path)
+        stat = os.stat(model_path)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    game = {"home": "NYY", "away": "BOS"}
+    first, second = call(registry, [("POST", "/predict", game, None), ("POST", "/predict", game, publish)])
+    assert first[0] == second[0] == 200
+    assert registry.current().clf.n_trees == 40
+    assert first[1] != second[1]
@@ -0,0 +1,16 @@
+import numpy as np
+
+import predictor
+
+
+def test_home_share_handles_missing_and_zero_pairs():
+    home = np.array([0.6, np.nan, 0.0, np.nan])
+    away = np.array([0.2, 0.3, 0.0, np.nan])
+    np.testing.assert_allclose(predictor.home_share(home, away), [0.75, 0.0, 0.5, 0.5])
+
+
+def test_home_share_keeps_grid_shape():
+    grid = np.array([[0.2, 0.0], [0.4, 0.0]])
+    share = predictor.home_share(grid, grid[::-1])
+    assert share.shape == (2, 2)
+    np.testing.assert_allclose(share, [[1 / 3, 0.5], [2 / 3, 0.5]])
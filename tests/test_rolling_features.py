@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+from rolling_features import RollingFeatureEngine
+
+
+def test_window_slides():
+    engine = RollingFeatureEngine(window=3, stats=["runs"])
+    for value in [1, 2, 3, 4]:
+        engine.ingest("NYY", [value])
+    assert engine.averages("NYY") == {"runs": 3.0}
+
+
+def test_missing_value_is_skipped_and_evicted():
+    engine = RollingFeatureEngine(window=3, stats=["runs", "hits"])
+    engine.ingest("NYY", [1, 5])
+    engine.ingest("NYY", [float("nan"), 7])
+    assert engine.averages("NYY") == {"runs": 1.0, "hits": 6.0}
+
+    engine.ingest("NYY", [3, 9])
+    engine.ingest("NYY", [5, 11])  # evicts the first game
+    assert engine.averages("NYY") == {"runs": 4.0, "hits": 9.0}
+    engine.ingest("NYY", [7, 13])  # evicts the NaN
+    assert engine.averages("NYY") == {"runs": 5.0, "hits": 11.0}
+
+
+def test_stat_never_seen_gives_no_averages():
+    engine = RollingFeatureEngine(window=3, stats=["runs", "hits"])
+    engine.ingest("NYY", [float("nan"), 4])
+    assert engine.averages("NYY") is None
+
+
+def test_point_in_time_after_nan():
+    engine = RollingFeatureEngine(window=2, stats=["runs"])
+    home = np.array(["NYY", "NYY", "NYY", "NYY"])
+    away = np.array(["BOS", "BOS", "BOS", "BOS"])
+    home_stats = np.array([[2.0], [np.nan], [4.0], [6.0]])
+    away_stats = np.array([[1.0], [1.0], [1.0], [1.0]])
+    _, averages = engine.point_in_time(home, away, home_stats, away_stats, np.array([True, False, True, True]))
+
+    assert math.isnan(averages[0, 0, 0])
+    assert averages[1, 0, 0] == 2.0
+    assert averages[2, 0, 0] == 2.0  # window holds [2, NaN]
+    assert averages[3, 0, 0] == 4.0  # window holds [NaN, 4]
+    assert averages[3, 1, 0] == 1.0
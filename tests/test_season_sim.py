@@ -0,0 +1,72 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlb_api
+import mlb_data
+import season_sim
+
+
+def test_past_season_has_no_remaining_games(monkeypatch):
+    def no_requests(*args, **kwargs):
+        raise AssertionError("no request expected for a finished season")
+
+    monkeypatch.setattr(mlb_api, "get_json", no_requests)
+    games = season_sim.remaining_games(mlb_data.today().year - 1)
+    assert len(games) == 0
+    assert list(games.columns) == ["game_pk", "home", "away"]
+
+
+def test_schedule_ranges_stay_inside_the_season():
+    today = mlb_data.today()
+    assert mlb_data.season_dates(today.year, start_date=today) == (today, datetime.date(today.year, 12, 31))
+    # A season that has not started: empty range for remaining_games, a valid one-day url for the past
+    assert mlb_data.season_dates(today.year + 1, start_date=today)[0] == datetime.date(today.year + 1, 1, 1)
+    url = mlb_data.league_schedule_url(today.year + 1)
+    assert f"startDate={today.year + 1}-01-01&endDate={today.year + 1}-01-01" in url
+    url = mlb_data.league_schedule_url(today.year - 1)
+    assert f"startDate={today.year - 1}-01-01&endDate={today.year - 1}-12-31" in url
+
+
+def schedule(n_games, seed=0):
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, len(season_sim.TEAMS), n_games)
+    away = (home + rng.integers(1, len(season_sim.TEAMS), n_games)) % len(season_sim.TEAMS)
+    return home, away
+
+
+@pytest.mark.parametrize("p", [0.0, 1.0])
+def test_certain_games_add_up(p):
+    home, away = schedule(300)
+    base_wins = np.arange(len(season_sim.TEAMS), dtype=np.float32)
+    wins, division_winner, wild_card = season_sim.simulate_block(home, away, np.full(300, p), base_wins, 5, seed=1)
+
+    winners = home if p == 1.0 else away
+    expected = base_wins + np.bincount(winners, minlength=len(season_sim.TEAMS))
+    assert (wins == expected).all()
+    assert (division_winner.sum(axis=1) == len(mlb_data.divisions)).all()
+    assert (wild_card.sum(axis=1) == 2 * season_sim.WILD_CARDS).all()
+    assert not (division_winner & wild_card).any()
+
+
+def test_every_game_has_one_winner():
+    home, away = schedule(500, seed=2)
+    base_wins = np.zeros(len(season_sim.TEAMS), dtype=np.float32)
+    wins, _, _ = season_sim.simulate_block(home, away, np.full(500, 0.6), base_wins, 200, seed=3)
+    assert (wins.sum(axis=1) == 500).all()
+
+
+def test_blocks_cover_n_sims_and_repeat_with_a_seed(monkeypatch):
+    monkeypatch.setattr(season_sim, "BLOCK_SIMS", 30)
+    home, away = schedule(100, seed=4)
+    games = pd.DataFrame({"home": [season_sim.TEAMS[i] for i in home], "away": [season_sim.TEAMS[i] for i in away]})
+    standings = {mlb_data.mlb_team_ids[season_sim.TEAMS[0]]: (10, 5)}
+    first = season_sim.simulate_season(games, np.full(100, 0.5), standings, n_sims=100, seed=5)
+    second = season_sim.simulate_season(games, np.full(100, 0.5), standings, n_sims=100, seed=5)
+
+    assert first[0].shape == (100, len(season_sim.TEAMS))
+    assert (first[0].sum(axis=1) == 100 + 10).all()
+    for a, b in zip(first, second):
+        assert (a == b).all()
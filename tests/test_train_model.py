@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model
+
+
+@pytest.fixture
+def games_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    teams = ["NYY", "BOS", "TOR", "BAL"]
+    rows = []
+    for date in pd.date_range("2025-04-01", periods=30):
+        home, away = rng.choice(teams, 2, replace=False)
+        home_score, away_score = rng.choice(10, 2, replace=False)
+        rows.append({"date": date.date().isoformat(), "home": home, "away": away,
+                     "home-score": home_score, "away-score": away_score})
+    pd.DataFrame(rows).to_csv("games.csv", index=False)
+    return "games.csv"
+
+
+def test_training_leaves_the_serving_model_alone(games_csv):
+    train_model.main(["--games", games_csv])
+    assert {"xgb_model.pkl", "xgb_model.npz", "team_map.pkl", "reverse_map.pkl"} <= set(os.listdir("."))
+    assert not any("_updated" in name for name in os.listdir("."))
+
+
+def test_publish_writes_the_serving_artifacts(games_csv):
+    train_model.main(["--games", games_csv, "--publish"])
+    assert set(train_model.SERVING_OUTPUTS) | {"xgb_model_updated.npz"} <= set(os.listdir("."))
+    assert "xgb_model.pkl" not in os.listdir(".")
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import predictor
+import tree_model
+from bench_batch_predict import synthetic_games, synthetic_home_win_model, synthetic_model
+
+TOLERANCE = 1e-5
+
+
+@pytest.mark.parametrize("make_model", [synthetic_home_win_model, synthetic_model])
+def test_compiled_model_matches_xgboost(make_model, tmp_path):
+    clf = make_model(n_estimators=30)
+    X = synthetic_games(2000, seed=7)
+    if make_model is synthetic_home_win_model:
+        X = predictor.home_win_features(X)
+    model = tree_model.compile_booster(clf)
+    assert tree_model.max_difference(clf, model, X) < TOLERANCE
+
+    path = str(tmp_path / "model.npz")
+    tree_model.save(model, path)
+    assert np.array_equal(tree_model.load(path).predict_proba(X), model.predict_proba(X))
+
+
+def test_missing_values_follow_the_default_branch():
+    clf = synthetic_home_win_model(n_estimators=30)
+    X = predictor.home_win_features(synthetic_games(500, seed=8)).astype(float)
+    X.iloc[::3, 1] = np.nan
+    X.iloc[::5, 4] = np.nan
+    assert tree_model.max_difference(clf, tree_model.compile_booster(clf), X) < TOLERANCE
@@ -1,37 +1,227 @@
+import argparse
+import os
+import time
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
 import pandas as pd
 from xgboost import XGBClassifier
-import joblib
 
-df = pd.read_csv("games.csv")
-df = df.dropna(subset=["home", "away", "home-score", "away-score"])
+import game_log
+import tree_model
+from predictor import FALLBACK_STATS, FALLBACK_WIN_PCT, FEATURE_COLUMNS, STAT_FEATURES, home_win_features
+from rolling_features import RollingFeatureEngine
+
+# Retrain the game winner model from a game log:
+#   python train_model.py --games games.csv --parquet-cache games.parquet
+#   python train_model.py --game-log 2023 2024 2025      (seasons from game_log.py)
+# games.csv needs home, away, home-score, away-score and ideally date. Optional per-game stat
+# columns (see GAME_STAT_COLUMNS) feed the rolling averages; without them those features
+# fall back to the same constants the app uses when the API is down.
+# The default objective is a binary home-win model (one tree per boosting round). --objective
+# team-id trains the original multiclass model over team ids, one tree per team per round; the
+# app serves either (predictor.predict_home_away tells them apart). The model is also exported to
+# a compiled .npz (tree_model.py) next to the pickle, which the app prefers.
+# Output goes to xgb_model.pkl / team_map.pkl / reverse_map.pkl; the app, the prefetch worker and
+# the prediction service keep serving their model until a run with --publish writes the
+# *_updated artifacts they load (model_registry.py picks the change up without a restart).
+
+WINDOW = 10
+OBJECTIVES = ["home-win", "team-id"]
+# (model, team map, reverse map)
+TRAIN_OUTPUTS = ("xgb_model.pkl", "team_map.pkl", "reverse_map.pkl")
+SERVING_OUTPUTS = ("xgb_model_updated.pkl", "team_map_updated.pkl", "reverse_map_updated.pkl")
+
+# Per-game stat columns in the game log: stat -> (home column, away column)
+GAME_STAT_COLUMNS = {
+    "total_bases": ("home-total-bases", "away-total-bases"),
+    "walks_issued": ("home-walks-issued", "away-walks-issued"),
+    "strikeouts_thrown": ("home-strikeouts-thrown", "away-strikeouts-thrown"),
+}
+
+timings = {}
+
+
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+    print(f"{name:<10} {timings[name]:8.2f}s")
+
+
+# === Loading ===
+def game_log_dtypes(columns):
+    dtypes = {"home": "category", "away": "category", "home-score": "float32", "away-score": "float32"}
+    for home_column, away_column in GAME_STAT_COLUMNS.values():
+        dtypes[home_column] = "float32"
+        dtypes[away_column] = "float32"
+    return {c: t for c, t in dtypes.items() if c in columns}
+
+
+def load_games_csv(path, chunksize):
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = game_log_dtypes(header)
+    usecols = list(dtypes) + (["date"] if "date" in header else [])
+
+    chunks = []
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        chunks.append(chunk.dropna(subset=["home", "away", "home-score", "away-score"]))
+    # Chunks with different category sets concat to object; re-categorize once at the end
+    df = pd.concat(chunks, ignore_index=True)
+    for column in ["home", "away"]:
+        df[column] = df[column].astype("category")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def load_games(path, chunksize, parquet_cache=None):
+    if parquet_cache and os.path.exists(parquet_cache) and os.path.getmtime(parquet_cache) >= os.path.getmtime(path):
+        return pd.read_parquet(parquet_cache)
+    df = load_games_csv(path, chunksize)
+    if parquet_cache:
+        df.to_parquet(parquet_cache, index=False)
+    return df
+
+
+# === Labels ===
+def label_winners(df):
+    home = df["home"].astype(str).to_numpy()
+    away = df["away"].astype(str).to_numpy()
+    home_score = df["home-score"].to_numpy()
+    away_score = df["away-score"].to_numpy()
+    df["winner"] = np.select([home_score > away_score, home_score < away_score], [home, away], default="TIE")
+    return df[df["winner"] != "TIE"].reset_index(drop=True)
 
-# Create winner column
-def determine_winner(row):
-    if row["home-score"] > row["away-score"]:
-        return row["home"]
-    elif row["home-score"] < row["away-score"]:
-        return row["away"]
+
+def build_team_maps(df):
+    # Ids in order of first appearance, home and away interleaved
+    teams = pd.unique(np.column_stack([df["home"].astype(str), df["away"].astype(str)]).ravel())
+    team_map = {team: i for i, team in enumerate(teams)}
+    reverse_map = {v: k for k, v in team_map.items()}
+    return team_map, reverse_map
+
+
+def add_team_ids(df, team_map):
+    df["home_id"] = df["home"].astype(str).map(team_map)
+    df["away_id"] = df["away"].astype(str).map(team_map)
+    df["winner_id"] = df["winner"].map(team_map)
+    return df
+
+
+# === Features ===
+def add_rolling_features(df, window=WINDOW):
+    # Leak-free inputs per game from the shared RollingFeatureEngine: each team's win % so far
+    # this season and its average stats over the previous `window` games, computed only from
+    # games strictly before this one.
+    if "date" in df.columns:
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+        seasons = df["date"].dt.year.to_numpy()
     else:
-        return "TIE"
+        seasons = None
+
+    stats_present = [
+        stat for stat, (home_column, away_column) in GAME_STAT_COLUMNS.items()
+        if home_column in df.columns and away_column in df.columns
+    ]
+    engine = RollingFeatureEngine(window=window, stats=stats_present)
+    win_pct, averages = engine.point_in_time(
+        df["home"].astype(str).to_numpy(),
+        df["away"].astype(str).to_numpy(),
+        df[[GAME_STAT_COLUMNS[stat][0] for stat in stats_present]].to_numpy(),
+        df[[GAME_STAT_COLUMNS[stat][1] for stat in stats_present]].to_numpy(),
+        (df["home-score"] > df["away-score"]).to_numpy(),
+        seasons,
+    )
+
+    for key, (home_column, away_column) in STAT_FEATURES.items():
+        if key == "win_pct":
+            values = win_pct
+        elif key in stats_present:
+            values = averages[:, :, stats_present.index(key)]
+        else:
+            values = np.full((len(df), 2), np.nan)
+        df[home_column] = values[:, 0]
+        df[away_column] = values[:, 1]
+    return fill_feature_fallbacks(df)
+
+
+def fill_feature_fallbacks(df):
+    # Games before a team has any history get the same constants the app uses when the API is down
+    for key, (home_column, away_column) in STAT_FEATURES.items():
+        fallback = FALLBACK_WIN_PCT if key == "win_pct" else FALLBACK_STATS[key]
+        for column in (home_column, away_column):
+            df[column] = df[column].fillna(fallback).astype(np.float32)
+    return df
+
+
+# === Model ===
+def training_set(df, objective):
+    if objective == "home-win":
+        return home_win_features(df), (df["winner_id"] == df["home_id"]).astype(np.int8)
+    return df[FEATURE_COLUMNS], df["winner_id"]
+
+
+def make_model(objective, n_estimators=200, max_depth=6, learning_rate=0.1, **params):
+    if objective == "home-win":
+        return XGBClassifier(n_estimators=n_estimators, max_depth=max_depth, learning_rate=learning_rate,
+                             objective="binary:logistic", eval_metric="logloss", **params)
+    return XGBClassifier(n_estimators=n_estimators, max_depth=max_depth, learning_rate=learning_rate,
+                         eval_metric="mlogloss", **params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the MLB game winner model")
+    parser.add_argument("--games", default="games.csv")
+    parser.add_argument("--parquet-cache", help="read/write a Parquet copy of the game log here")
+    parser.add_argument("--game-log", type=int, nargs="+", metavar="SEASON",
+                        help="train on these seasons of the columnar game log instead of --games")
+    parser.add_argument("--game-log-dir", default=game_log.LOG_DIR)
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--window", type=int, default=WINDOW)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="home-win")
+    parser.add_argument("--publish", action="store_true",
+                        help="write the serving artifacts (xgb_model_updated.*, *_map_updated.pkl) the app loads")
+    parser.add_argument("--model-out", help=f"default: {TRAIN_OUTPUTS[0]}, or {SERVING_OUTPUTS[0]} with --publish")
+    parser.add_argument("--compiled-out", help="default: --model-out with a .npz suffix")
+    parser.add_argument("--team-map-out", help=f"default: {TRAIN_OUTPUTS[1]}, or {SERVING_OUTPUTS[1]} with --publish")
+    parser.add_argument("--reverse-map-out", help=f"default: {TRAIN_OUTPUTS[2]}, or {SERVING_OUTPUTS[2]} with --publish")
+    args = parser.parse_args(argv)
+    outputs = SERVING_OUTPUTS if args.publish else TRAIN_OUTPUTS
+    args.model_out = args.model_out or outputs[0]
+    args.team_map_out = args.team_map_out or outputs[1]
+    args.reverse_map_out = args.reverse_map_out or outputs[2]
+
+    with stage("load"):
+        if args.game_log:
+            # Point-in-time features come precomputed from the log's per-team slices
+            df = game_log.games_frame(args.game_log, window=args.window, log_dir=args.game_log_dir)
+        else:
+            df = load_games(args.games, args.chunksize, args.parquet_cache)
+
+    with stage("label"):
+        df = label_winners(df)
+        team_map, reverse_map = build_team_maps(df)
+        df = add_team_ids(df, team_map)
 
-df["winner"] = df.apply(determine_winner, axis=1)
-df = df[df["winner"] != "TIE"]
+    with stage("features"):
+        df = fill_feature_fallbacks(df) if args.game_log else add_rolling_features(df, args.window)
+        X, y = training_set(df, args.objective)
 
-teams = pd.unique(df[["home", "away"]].values.ravel())
-team_map = {team: i for i, team in enumerate(teams)}
-reverse_map = {v: k for k, v in team_map.items()}
+    with stage("fit"):
+        model = make_model(args.objective)
+        model.fit(X, y)
 
-df["home_id"] = df["home"].map(team_map)
-df["away_id"] = df["away"].map(team_map)
-df["winner_id"] = df["winner"].map(team_map)
+    with stage("save"):
+        joblib.dump(model, args.model_out)
+        tree_model.save(tree_model.compile_booster(model), args.compiled_out or tree_model.compiled_path(args.model_out))
+        joblib.dump(team_map, args.team_map_out)
+        joblib.dump(reverse_map, args.reverse_map_out)
 
-X = df[["home_id", "away_id"]]
-y = df["winner_id"]
+    print(f"{'total':<10} {sum(timings.values()):8.2f}s  ({len(df):,} games)")
 
-model = XGBClassifier(n_estimators=200, max_depth=6, learning_rate=0.1, use_label_encoder=False, eval_metric='mlogloss')
-model.fit(X, y)
 
-# Save model and mappings
-joblib.dump(model, "xgb_model.pkl")
-joblib.dump(team_map, "team_map.pkl")
-joblib.dump(reverse_map, "reverse_map.pkl")
+if __name__ == "__main__":
+    main()
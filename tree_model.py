@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# A trained XGBClassifier flattened into plain NumPy arrays, and an evaluator that scores with
+# them, so serving needs neither xgboost nor scikit-learn:
+#   python tree_model.py export xgb_model_updated.pkl      (writes xgb_model_updated.npz)
+#   python tree_model.py verify xgb_model_updated.pkl xgb_model_updated.npz
+# Every tree's nodes are concatenated into one set of arrays (feature index, threshold, left and
+# right child, missing-value direction, leaf value), addressed by global node id. Scoring walks
+# all rows through all trees at once, one tree level per step. Exporting imports xgboost;
+# loading and scoring do not. CompiledModel exposes predict_proba / classes_ /
+# feature_names_in_ like the classifier, so predictor.py serves either.
+
+CHUNK_NODES = 1 << 19  # rows x trees per evaluation pass; keeps the node matrix cache-sized
+OBJECTIVES = ("binary:logistic", "multi:softprob", "multi:softmax")
+
+
+class CompiledModel:
+    def __init__(self, feature, threshold, children, default_left, value, roots, tree_class,
+                 base_margin, objective, classes, feature_names, depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.tree_class = tree_class
+        self.base_margin = base_margin
+        self.objective = objective
+        self.classes_ = classes
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.depth = depth
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def leaves(self, X):
+        # Leaf node id per (row, tree). Leaves point back at themselves, so every row can take
+        # `depth` steps without checking where it is; flat np.take gathers keep each step cheap.
+        n_rows, n_features = X.shape
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        flat = X.ravel()
+        children = self.children.ravel()
+        has_missing = np.isnan(flat).any()
+        for _ in range(self.depth):
+            x = np.take(flat, row_offsets + np.take(self.feature, node))
+            go_right = x >= np.take(self.threshold, node)
+            if has_missing:
+                go_right = np.where(np.isnan(x), ~np.take(self.default_left, node), go_right)
+            node = np.take(children, 2 * node + go_right)
+        return node
+
+    def margins(self, X):
+        n_classes = len(self.base_margin)
+        chunk = max(1, CHUNK_NODES // self.n_trees)
+        out = np.empty((len(X), n_classes))
+        for start in range(0, len(X), chunk):
+            leaf_values = np.take(self.value, self.leaves(X[start:start + chunk])).astype(np.float64)
+            if n_classes == 1:
+                out[start:start + chunk, 0] = leaf_values.sum(axis=1)
+            else:
+                # Trees cycle through the classes round by round
+                out[start:start + chunk] = leaf_values.reshape(len(leaf_values), -1, n_classes).sum(axis=1)
+        return out + self.base_margin
+
+    def predict_proba(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)]
+        margins = self.margins(np.asarray(X, dtype=np.float32))
+        if self.objective == "binary:logistic":
+            p = 1.0 / (1.0 + np.exp(-margins[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        margins -= margins.max(axis=1, keepdims=True)
+        expd = np.exp(margins)
+        return expd / expd.sum(axis=1, keepdims=True)
+
+
+# === Export ===
+def base_margin(learner):
+    # XGBoost stores the intercept as a probability for logistic, as raw margins for softmax
+    base_score = np.atleast_1d(np.asarray(json.loads(learner["learner_model_param"]["base_score"]), dtype=np.float64))
+    if learner["objective"]["name"] == "binary:logistic":
+        return np.log(base_score / (1.0 - base_score))
+    n_classes = int(learner["learner_model_param"]["num_class"])
+    return np.broadcast_to(base_score, (n_classes,)).copy()
+
+
+def tree_depth(left, right):
+    depth, frontier = 0, [0]
+    while frontier:
+        frontier = [child for node in frontier for child in (left[node], right[node]) if child >= 0]
+        depth += bool(frontier)
+    return depth
+
+
+def compile_booster(clf):
+    learner = json.loads(clf.get_booster().save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unsupported objective {objective!r}")
+    model = learner["gradient_booster"]["model"]
+    n_classes = max(1, int(learner["learner_model_param"]["num_class"]))
+    if model["tree_info"] != [i % n_classes for i in range(len(model["tree_info"]))]:
+        raise ValueError("expected one tree per class per boosting round")
+
+    arrays = {k: [] for k in ("feature", "threshold", "children", "default_left", "value")}
+    roots, depth, offset = [], 0, 0
+    for tree in model["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("categorical splits are not supported")
+        left = np.asarray(tree["left_children"], dtype=np.int32)
+        right = np.asarray(tree["right_children"], dtype=np.int32)
+        leaf = left < 0
+        node_ids = np.arange(offset, offset + len(left), dtype=np.int32)
+        arrays["feature"].append(np.where(leaf, 0, tree["split_indices"]).astype(np.int32))
+        arrays["threshold"].append(np.where(leaf, 0, tree["split_conditions"]).astype(np.float32))
+        arrays["children"].append(np.column_stack([
+            np.where(leaf, node_ids, left + offset), np.where(leaf, node_ids, right + offset),
+        ]).astype(np.int32))
+        arrays["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+        # A leaf's value sits in split_conditions
+        arrays["value"].append(np.where(leaf, tree["split_conditions"], 0).astype(np.float32))
+        roots.append(offset)
+        depth = max(depth, tree_depth(left, right))
+        offset += len(left)
+
+    return CompiledModel(
+        **{k: np.concatenate(v) for k, v in arrays.items()},
+        roots=np.asarray(roots, dtype=np.int32),
+        tree_class=np.asarray(model["tree_info"], dtype=np.int32),
+        base_margin=base_margin(learner),
+        objective=objective,
+        classes=np.asarray(clf.classes_),
+        feature_names=learner["feature_names"] or [f"f{i}" for i in range(int(learner["learner_model_param"]["num_feature"]))],
+        depth=depth,
+    )
+
+
+def save(model, path):
+    np.savez(
+        path,
+        feature=model.feature, threshold=model.threshold, children=model.children,
+        default_left=model.default_left, value=model.value, roots=model.roots, tree_class=model.tree_class,
+        base_margin=model.base_margin, classes=model.classes_,
+        meta=np.asarray(json.dumps({
+            "objective": model.objective,
+            "feature_names": list(model.feature_names_in_),
+            "depth": model.depth,
+        })),
+    )
+
+
+def load(path):
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        return CompiledModel(
+            data["feature"], data["threshold"], data["children"], data["default_left"],
+            data["value"], data["roots"], data["tree_class"], data["base_margin"],
+            meta["objective"], data["classes"], meta["feature_names"], meta["depth"],
+        )
+
+
+def compiled_path(model_path):
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def export(model_path, out_path=None):
+    import joblib
+    out_path = out_path or compiled_path(model_path)
+    model = compile_booster(joblib.load(model_path))
+    save(model, out_path)
+    return out_path, model
+
+
+def max_difference(clf, model, X):
+    return float(np.max(np.abs(clf.predict_proba(X) - model.predict_proba(X))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an XGBClassifier pickle to NumPy arrays")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export")
+    export_cmd.add_argument("model")
+    export_cmd.add_argument("--out", help="default: the model path with a .npz suffix")
+    verify_cmd = commands.add_parser("verify", help="compare probabilities on random rows")
+    verify_cmd.add_argument("model")
+    verify_cmd.add_argument("compiled")
+    verify_cmd.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        start = time.perf_counter()
+        out_path, model = export(args.model, args.out)
+        print(f"{out_path}: {model.n_trees:,} trees, {len(model.feature):,} nodes, depth {model.depth}, "
+              f"{os.path.getsize(out_path) / 1e6:.2f} MB ({time.perf_counter() - start:.2f}s)")
+    else:
+        import joblib
+        clf = joblib.load(args.model)
+        model = load(args.compiled)
+        rng = np.random.default_rng(0)
+        # Sample each feature around the thresholds the trees actually split on
+        X = np.empty((args.rows, model.n_features_in_), dtype=np.float32)
+        for i in range(model.n_features_in_):
+            cuts = model.threshold[(model.feature == i) & (model.children[:, 0] != np.arange(len(model.feature)))]
+            X[:, i] = rng.choice(cuts, args.rows) + rng.normal(0, 0.01, args.rows) if len(cuts) else 0
+        frame = pd.DataFrame(X, columns=model.feature_names_in_)
+        print(f"max |difference| over {args.rows:,} rows: {max_difference(clf, model, frame):.2e}")
+
+
+if __name__ == "__main__":
+    main()